@@ -1,83 +1,137 @@
 # app/algorithms/aco_algorithm.py
 import os
 import math
+import time
 import random
 import numpy as np
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# average_speed vivía en este módulo: se sigue importando desde aquí
+try:
+    from algorithms.telemetry import Telemetry, PrintObserver
+    from algorithms.local_search import local_search as run_local_search, nearest_neighbors
+    from algorithms.travel_time import TravelTimeModel, average_speed
+    from algorithms.route_solution import RouteSolution
+    from algorithms.termination import Termination
+except ImportError:  # ejecutado como script desde app/algorithms
+    from telemetry import Telemetry, PrintObserver
+    from local_search import local_search as run_local_search, nearest_neighbors
+    from travel_time import TravelTimeModel, average_speed
+    from route_solution import RouteSolution
+    from termination import Termination
 
 
 # ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
 #           1. Inicialización ACO
 # ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
 
-# Velocidades estimadas por cada hora
-def average_speed(hour):
-    if 7 <= hour < 9:
-        return 20
-    elif 9 <= hour < 14:
-        return 30
-    elif 14 <= hour < 19:
-        return 15
-    else:
-        return 40
-
 # Algoritmo
+def heuristic_matrix(distance_matrix, beta):
+    # eta^beta = d^-beta no cambia durante la corrida: se calcula una sola vez
+    with np.errstate(divide = "ignore"):
+        return np.asarray(distance_matrix, dtype = float) ** -beta
+
 def probabs(current, candidates, car_name, distance_matrix, feromone_matrix,
-            alpha, beta, vehicle_experience):
-    n = len(distance_matrix)
-    probs = np.zeros(n, dtype = float)
+            alpha, beta, vehicle_experience, heuristic = None, rng = None):
+    """
+    Probabilidades de transición para todos los candidatos en un solo paso.
+    Regresa un arreglo alineado con `candidates` (no con todas las ciudades).
+    """
+    candidates = np.asarray(candidates, dtype = int)
+    if heuristic is None:
+        heuristic = heuristic_matrix(distance_matrix, beta)
+    if rng is None:
+        rng = np.random
+
     exp_level = vehicle_experience[car_name]
+    noise = rng.normal(loc = 0, scale = (1 - exp_level) * 0.15,
+                             size = len(candidates))
 
-    for j in candidates:
-        noise = np.random.normal(loc = 0, scale = (1 - exp_level) * 0.15)
-        adjusted_dist = distance_matrix[current, j] * (1 + noise)
-        
-        tau = feromone_matrix[current, j] ** alpha
-        eta = (1 / adjusted_dist) ** beta
+    # (1 / (d * (1 + noise)))^beta = d^-beta * (1 + noise)^-beta
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        tau = feromone_matrix[current, candidates] ** alpha
+        eta = heuristic[current, candidates] * (1 + noise) ** -beta
+        probs = tau * eta
+    probs[np.isnan(probs) | (probs < 0)] = 0
 
-        probs[j] = tau * eta
+    inf_mask = np.isinf(probs)
+    if inf_mask.any():
+        probs = inf_mask.astype(float)
 
     s = probs.sum()
     if s <= 0:
-        for j in candidates:
-            probs[j] = 1.0
+        probs = np.ones(len(candidates), dtype = float)
         s = probs.sum()
 
     return probs / s
 
-def select_next_city(current, candidates, car_name, **kwargs):
-    candidates = list(candidates)
-    probs = probabs(current, candidates, car_name, **kwargs)
-    sub = np.array([probs[j] for j in candidates], dtype = float)
-    sub = sub / sub.sum()
-    return np.random.choice(candidates, p = sub)
+def select_next_city(current, candidates, car_name, rng = None, q0 = 0.0, **kwargs):
+    """
+    Ruleta sobre `probabs`. Con `q0` > 0 (regla pseudoaleatoria de ACS) se
+    toma el mejor candidato con probabilidad q0 y la ruleta sólo en el resto.
+    """
+    candidates = np.asarray(candidates, dtype = int)
+    if rng is None:
+        rng = np.random
+    probs = probabs(current, candidates, car_name, rng = rng, **kwargs)
+    if q0 and rng.random() < q0:
+        return int(candidates[np.argmax(probs)])
+    return int(candidates[rng.choice(len(candidates), p = probs)])
+
+def _feasible(cands, current_city, current_time, current_capacity, capacity,
+              demands, close_time, travel):
+    ok = current_capacity + demands[cands] <= capacity
+    arrival = travel.arrivals(current_city, cands, current_time)
+    return cands[ok & (arrival <= close_time[cands])]
 
 def build_route_for_vehicles(vehicles, demands, distance_matrix, feromone_matrix,
                              alpha, beta, rho, vehicle_experience,
-                             open_time, close_time, service_time):
+                             open_time, close_time, service_time,
+                             heuristic = None, rng = None, neighbors = None,
+                             travel = None, q0 = 0.0):
+    """
+    Construye la solución de una hormiga. Con `neighbors` (ver
+    `nearest_neighbors`) primero se elige entre los vecinos no visitados del
+    nodo actual y sólo si ninguno es factible se revisan todos los nodos.
+    `travel` es el `TravelTimeModel` compartido por todas las hormigas.
+    Regresa un `RouteSolution`.
+    """
     n = len(distance_matrix)
-    unvisited = set(range(n))
-    unvisited.remove(0)
-
-    routes = {v : [] for v in vehicles.keys()}
-
-    for car_name, car in vehicles.items():
+    if heuristic is None:
+        heuristic = heuristic_matrix(distance_matrix, beta)
+    if travel is None:
+        travel = TravelTimeModel(distance_matrix)
+    demands = np.asarray(demands, dtype = float)
+    open_time = np.asarray(open_time, dtype = float)
+    close_time = np.asarray(close_time, dtype = float)
+    service_time = np.asarray(service_time, dtype = float)
+
+    unvisited = np.ones(n, dtype = bool)
+    unvisited[0] = False
+    remaining = n - 1
+
+    tour = np.empty(n - 1, dtype = np.int32)
+    offsets = np.zeros(len(vehicles) + 1, dtype = np.int32)
+    size = 0
+
+    for k, (car_name, car) in enumerate(vehicles.items()):
         current_capacity = 0
         current_city = 0
         current_time = 8.0
 
-        while unvisited:
-            feasible = []
-            for j in unvisited:
-                if current_capacity + demands[j] <= car['capacity']:
-                    v = average_speed(current_time)
-                    travel_time = distance_matrix[current_city, j] / max(v, 1e-6)
-                    arrival_time = current_time + travel_time
+        while remaining:
+            args = (current_city, current_time, current_capacity, car['capacity'],
+                    demands, close_time, travel)
 
-                    if arrival_time <= close_time[j]:
-                        feasible.append(j)
+            feasible = ()
+            if neighbors is not None:
+                cands = neighbors[current_city]
+                feasible = _feasible(cands[unvisited[cands]], *args)
+            if not len(feasible):
+                feasible = _feasible(np.flatnonzero(unvisited), *args)
 
-            if not feasible:
+            if not len(feasible):
                 break
 
             next_city = select_next_city(
@@ -85,64 +139,364 @@ def build_route_for_vehicles(vehicles, demands, distance_matrix, feromone_matrix
                 distance_matrix = distance_matrix,
                 feromone_matrix = feromone_matrix,
                 alpha = alpha, beta = beta,
-                vehicle_experience = vehicle_experience
+                vehicle_experience = vehicle_experience,
+                heuristic = heuristic,
+                rng = rng,
+                q0 = q0
             )
 
-            v = average_speed(current_time)
-            travel_time = distance_matrix[current_city, next_city] / max(v, 1e-6)
-            arrival_time = current_time + travel_time
+            arrival_time = travel.arrival(current_city, next_city, current_time)
 
             current_time = max(arrival_time, open_time[next_city])
             current_time += service_time[next_city]
 
-            routes[car_name].append(next_city)
+            tour[size] = next_city
+            size += 1
             current_capacity += demands[next_city]
-            unvisited.remove(next_city)
+            unvisited[next_city] = False
+            remaining -= 1
             current_city = next_city
 
             if current_time > 15:
                 break
 
-    return routes
-
-def total_distance(vehicle_routes, distance_matrix, include_depot = False, depot = 0):
-    total = 0
-    for route in vehicle_routes.values():
-        if not route:
-            continue
+        offsets[k + 1] = size
 
-        if include_depot:
-            total += distance_matrix[depot, route[0]]
+    return RouteSolution(tour[:size], offsets, vehicles.keys())
 
-        for i in range(len(route) - 1):
-            total += distance_matrix[route[i], route[i +1 ]]
-        
-        if include_depot:
-            total += distance_matrix[route[-1], depot]
-    return total
+def total_distance(vehicle_routes, distance_matrix, include_depot = False, depot = 0):
+    """
+    Distancia de la solución sobre `distance_matrix`. Siempre se calcula:
+    `cost` puede venir de otro solver (otra métrica u otra matriz).
+    """
+    routes = RouteSolution.from_routes(vehicle_routes)
+    return routes.distance(distance_matrix, include_depot = include_depot, depot = depot)
+
+def route_is_feasible(route, distance_matrix, open_time, close_time, service_time,
+                      start_time = 8.0, travel = None):
+    """Revisa las ventanas de cierre de una ruta con las mismas reglas de la construcción."""
+    if travel is None:
+        travel = TravelTimeModel(distance_matrix)
+    current_time = start_time
+    current_city = 0
+    for city in route:
+        arrival_time = travel.arrival(current_city, city, current_time)
+        if arrival_time > close_time[city]:
+            return False
+        current_time = max(arrival_time, open_time[city]) + service_time[city]
+        current_city = city
+    return True
+
+def improve_ant(routes, distance_matrix, ls_matrix, vehicles, demands,
+                open_time, close_time, service_time, neighbors, travel = None):
+    """
+    Acción "daemon": búsqueda local sobre una hormiga. `ls_matrix` tiene en
+    cero las aristas del depósito para optimizar la misma distancia que
+    `total_distance` (sin depósito).
+    """
+    capacities = {v: car['capacity'] for v, car in vehicles.items()}
+    if travel is None:
+        travel = TravelTimeModel(distance_matrix)
+
+    def feasible(_, route):
+        return route_is_feasible(route, distance_matrix, open_time, close_time,
+                                 service_time, travel = travel)
+
+    improved, gain = run_local_search(routes, ls_matrix, demands, capacities,
+                                      neighbors = neighbors, feasible = feasible)
+    if gain <= 0:
+        return routes, 0.0
+    return RouteSolution.from_routes(improved, list(routes)), gain
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Feromonas: AS, MMAS y ACS ✦ ୨୧‿︵‿︵‿︵ ˚₊
+VARIANTS = ("as", "mmas", "acs")
+ELITIST = ("iteration", "global")
+
+class PheromoneTrail:
+    """
+    Matriz de feromonas con evaporación perezosa: el valor real es
+    `values * scale`, así que evaporar sólo multiplica `scale` en lugar de
+    las n² celdas. Al leer (`trail[i, j]`) se aplica el rango
+    [tau_min, tau_max] de MMAS, de modo que las celdas que no se refuerzan
+    nunca se tocan. Cuando `scale` se vuelve muy pequeño se reescala la
+    matriz una vez para no perder precisión.
+    """
+
+    RESCALE_BELOW = 1e-100
+
+    def __init__(self, initial, tau_min = 0.0, tau_max = np.inf):
+        self.values = np.array(initial, dtype = float)
+        self.scale = 1.0
+        self.tau_min = tau_min
+        self.tau_max = tau_max
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def bounded(self):
+        return self.tau_min > 0 or np.isfinite(self.tau_max)
+
+    def __getitem__(self, key):
+        tau = self.values[key] * self.scale
+        if self.bounded:
+            tau = np.clip(tau, self.tau_min, self.tau_max)
+        return tau
+
+    def set_bounds(self, tau_min, tau_max):
+        self.tau_min = tau_min
+        self.tau_max = tau_max
+
+    def fill(self, value):
+        self.values.fill(value)
+        self.scale = 1.0
+
+    def evaporate(self, rho):
+        self.scale *= (1 - rho)
+        if self.scale < self.RESCALE_BELOW:
+            self.values *= self.scale
+            self.scale = 1.0
+
+    def deposit(self, a, b, amount):
+        """Suma `amount` en los arcos (a, b); los repetidos se acumulan."""
+        if self.tau_min > 0:
+            self.values[a, b] = np.maximum(self.values[a, b], self.tau_min / self.scale)
+        np.add.at(self.values, (a, b), amount / self.scale)
+        if np.isfinite(self.tau_max):
+            self.values[a, b] = np.minimum(self.values[a, b], self.tau_max / self.scale)
+
+    def blend(self, a, b, weight, target):
+        """tau ← (1 - weight)·tau + weight·target en los arcos (a, b), como en ACS."""
+        self.values[a, b] = ((1 - weight) * self[a, b] + weight * target) / self.scale
+
+    def dense(self):
+        """Matriz n × n con los valores reales."""
+        return self[:, :]
+
+def _symmetric_edges(routes, n):
+    """Arcos de la solución con el depósito, en ambos sentidos y sin repetir."""
+    a, b = RouteSolution.from_routes(routes).edges(include_depot = True)
+    cells = np.unique(np.concatenate((a, b)).astype(int) * n + np.concatenate((b, a)))
+    return cells // n, cells % n
 
 def update_pheromones(vehicle_routes, feromone_matrix, rho, distance_matrix):
-    # Evaporación
-    feromone_matrix *= (1 - rho)
-    
+    """Ant System: evaporan todas las aristas y todas las hormigas depositan."""
+    feromone_matrix.evaporate(rho)
+
     for routes in vehicle_routes:
-        print(routes)
+        routes = RouteSolution.from_routes(routes)
         L = total_distance(routes, distance_matrix)
         if L <= 1e-9:
             continue
-        for car, route in routes.items():
-            for i in range(len(route) - 1):
-                a, b = route[i], route[i + 1]
-                feromone_matrix[a, b] += 1 / L
-                feromone_matrix[b, a] += 1 / L
+        # add.at acumula los arcos repetidos igual que el recorrido arco por arco
+        a, b = routes.edges()
+        feromone_matrix.deposit(a, b, 1 / L)
+        feromone_matrix.deposit(b, a, 1 / L)
+
+def update_pheromones_mmas(routes, distance, feromone_matrix, rho, best_distance,
+                           p_best = 0.05):
+    """
+    Max-Min: evaporación global, sólo `routes` deposita (incluidas las
+    aristas del depósito) y los límites se recalculan con la mejor global:
+    tau_max = 1 / (rho·L*), tau_min según la probabilidad `p_best` de
+    reconstruir la mejor solución al converger (Stützle y Hoos).
+    `distance` y `best_distance` incluyen las aristas del depósito, las
+    mismas que se refuerzan.
+    """
+    feromone_matrix.evaporate(rho)
+    if not (1e-9 < distance < np.inf):
+        return
+    n = len(feromone_matrix)
+    tau_max = 1 / (rho * best_distance)
+    root = p_best ** (1 / n)
+    tau_min = tau_max * (1 - root) / (max(n / 2 - 1, 1) * root)
+    feromone_matrix.set_bounds(tau_min, tau_max)
+    a, b = _symmetric_edges(routes, n)
+    feromone_matrix.deposit(a, b, 1 / distance)
+
+def update_pheromones_acs(routes, distance, feromone_matrix, rho):
+    """
+    Ant Colony System, regla global: sólo se evaporan y refuerzan las
+    aristas de `routes`; `distance` incluye las aristas del depósito.
+    """
+    if not (1e-9 < distance < np.inf):
+        return
+    a, b = _symmetric_edges(routes, len(feromone_matrix))
+    feromone_matrix.blend(a, b, rho, 1 / distance)
+
+def local_update_acs(vehicle_routes, feromone_matrix, xi, tau0):
+    """
+    Regla local de ACS: cada arista usada se acerca a `tau0`. Las hormigas
+    de una iteración pueden construirse en paralelo, así que se aplica al
+    terminar la construcción, en orden de hormiga; así el resultado no
+    depende del modo de ejecución.
+    """
+    for routes in vehicle_routes:
+        a, b = _symmetric_edges(routes, len(feromone_matrix))
+        feromone_matrix.blend(a, b, xi, tau0)
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Construcción paralela de hormigas ✦ ୨୧‿︵‿︵‿︵ ˚₊
+EXECUTORS = ("serial", "threads", "processes")
+
+class _SharedMatrices:
+    """
+    Copia arreglos a bloques de memoria compartida para que los procesos
+    trabajadores los lean sin recibir una copia por tarea.
+    """
+    def __init__(self, **arrays):
+        self.blocks = {}
+        self.views = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr, dtype = float)
+            shm = shared_memory.SharedMemory(create = True, size = max(arr.nbytes, 1))
+            view = np.ndarray(arr.shape, dtype = arr.dtype, buffer = shm.buf)
+            view[...] = arr
+            self.blocks[name] = shm
+            self.views[name] = view
+
+    def spec(self):
+        return {name: (shm.name, self.views[name].shape)
+                for name, shm in self.blocks.items()}
+
+    def close(self):
+        self.views.clear()
+        for shm in self.blocks.values():
+            shm.close()
+            shm.unlink()
+        self.blocks.clear()
+
+_WORKER_STATE = {}
+
+def _init_ant_worker(spec, params):
+    blocks = {}
+    arrays = {}
+    for name, (shm_name, shape) in spec.items():
+        shm = shared_memory.SharedMemory(name = shm_name)
+        blocks[name] = shm
+        arrays[name] = np.ndarray(shape, dtype = float, buffer = shm.buf)
+    _WORKER_STATE["blocks"] = blocks
+    _WORKER_STATE["arrays"] = arrays
+    # Las matrices de tiempos se recalculan aquí en vez de viajar en `params`
+    _WORKER_STATE["params"] = dict(params, travel = TravelTimeModel(arrays["distance"]))
+
+def _build_ant_in_worker(seed_seq):
+    arrays = _WORKER_STATE["arrays"]
+    params = _WORKER_STATE["params"]
+    return build_route_for_vehicles(
+        distance_matrix = arrays["distance"],
+        feromone_matrix = arrays["feromone"],
+        heuristic = arrays["heuristic"],
+        rng = np.random.default_rng(seed_seq),
+        **params
+    )
+
+class _ColonyBuilder:
+    """
+    Construye las hormigas de una iteración en serie, con hilos o con
+    procesos. Cada hormiga recibe su propio generador derivado de la
+    semilla, así que el resultado no depende del modo ni de los workers.
+    """
+    def __init__(self, executor, workers, distance_matrix, feromone_matrix,
+                 heuristic, params):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor debe ser uno de {EXECUTORS}, no {executor!r}")
+        self.executor = executor
+        self.distance_matrix = distance_matrix
+        self.feromone_matrix = feromone_matrix
+        self.heuristic = heuristic
+        self.params = params
+        self.shared = None
+        self.pool = None
+
+        if executor == "threads":
+            self.pool = ThreadPoolExecutor(max_workers = workers)
+        elif executor == "processes":
+            self.shared = _SharedMatrices(distance = distance_matrix,
+                                          feromone = feromone_matrix.dense(),
+                                          heuristic = heuristic)
+            self.pool = ProcessPoolExecutor(max_workers = workers,
+                                            initializer = _init_ant_worker,
+                                            initargs = (self.shared.spec(),
+                                                        {k: v for k, v in params.items()
+                                                         if k != "travel"}))
+
+    def _build_local(self, seed_seq):
+        return build_route_for_vehicles(
+            distance_matrix = self.distance_matrix,
+            feromone_matrix = self.feromone_matrix,
+            heuristic = self.heuristic,
+            rng = np.random.default_rng(seed_seq),
+            **self.params
+        )
+
+    def build(self, seed_seqs):
+        if self.executor == "serial":
+            return [self._build_local(s) for s in seed_seqs]
+        if self.executor == "threads":
+            return list(self.pool.map(self._build_local, seed_seqs))
+
+        # Las feromonas cambian entre iteraciones: se sincroniza la copia compartida
+        self.shared.views["feromone"][...] = self.feromone_matrix.dense()
+        return list(self.pool.map(_build_ant_in_worker, seed_seqs))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+        if self.shared is not None:
+            self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 def aco_algorithm(distance_matrix, vehicles, demands,
                   vehicle_experience = None, open_time = None,
                   close_time = None, service_time = None,
                   alpha = 1, beta = 2, rho = 0.5,
-                  iterations = 10, num_ants = 3):
+                  iterations = 10, num_ants = 3,
+                  executor = "serial", workers = None, seed = None,
+                  candidate_k = None, local_search = False,
+                  variant = "as", elitist = None, q0 = 0.9, xi = 0.1, p_best = 0.05,
+                  initial_pheromone = None, initial_routes = None, observers = None,
+                  termination = None):
+    """
+    Colonia de hormigas para varios vehículos. Para reoptimizar tras un
+    cambio pequeño, `initial_pheromone` (n × n) reemplaza la matriz uniforme
+    y `initial_routes` ({vehículo: [nodos]}) arranca como mejor solución.
+
+    `variant` elige la actualización de feromonas: "as" (todas las hormigas
+    depositan), "mmas" (Max-Min, límites [tau_min, tau_max]) o "acs" (Ant
+    Colony System, regla local con `xi` y elección pseudoaleatoria con `q0`).
+    En MMAS y ACS sólo deposita la mejor hormiga de la iteración o la mejor
+    global según `elitist` (por defecto "iteration" en MMAS, "global" en ACS).
+
+    `termination` (una `Termination` o un dict con sus argumentos) agrega
+    límite de tiempo, paro por estancamiento y costo objetivo; `iterations`
+    sigue siendo el máximo.
+
+    Regresa {"Distance", "Route", "Pheromone"}; "Route" es un `RouteSolution`.
+    Con `termination` también "Termination": motivo del paro, iteraciones
+    corridas y segundos.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"variant debe ser uno de {VARIANTS}, no {variant!r}")
+    if elitist is None:
+        elitist = "global" if variant == "acs" else "iteration"
+    if elitist not in ELITIST:
+        raise ValueError(f"elitist debe ser uno de {ELITIST}, no {elitist!r}")
+
     n = len(distance_matrix)
-    feromone_matrix = np.ones((n, n))
+    if initial_pheromone is None:
+        feromone_matrix = PheromoneTrail(np.ones((n, n)))
+    else:
+        feromone_matrix = PheromoneTrail(initial_pheromone)
+        if feromone_matrix.values.shape != (n, n):
+            raise ValueError(f"initial_pheromone debe ser {n}×{n}, "
+                             f"no {feromone_matrix.values.shape}")
+    tau0 = None
+    heuristic = heuristic_matrix(distance_matrix, beta)
 
     if vehicle_experience is None:
         vehicle_experience = {k: 0.8 for k in vehicles.keys()}
@@ -153,42 +507,115 @@ def aco_algorithm(distance_matrix, vehicles, demands,
     if service_time is None:
         service_time = [0.15] * n
 
-    best_solution = {"Distance": float("inf"), "Route": {}}
-
-    for iteration in range(1, iterations + 1):
-        print(f"\n===== ITERATION {iteration} =====")
-        ants = [
-            build_route_for_vehicles(
-                vehicles, demands, distance_matrix, feromone_matrix,
-                alpha, beta, rho, vehicle_experience,
-                open_time, close_time, service_time
+    best_solution = {"Distance": float("inf"),
+                     "Route": RouteSolution.from_routes({}, vehicles)}
+    if initial_routes:
+        best_solution["Route"] = RouteSolution.from_routes(initial_routes, vehicles)
+        best_solution["Distance"] = total_distance(best_solution["Route"], distance_matrix)
+
+    params = dict(vehicles = vehicles, demands = demands, alpha = alpha,
+                  beta = beta, rho = rho, vehicle_experience = vehicle_experience,
+                  open_time = open_time, close_time = close_time,
+                  service_time = service_time,
+                  travel = TravelTimeModel(distance_matrix),
+                  q0 = q0 if variant == "acs" else 0.0)
+    if candidate_k:
+        params["neighbors"] = nearest_neighbors(distance_matrix, candidate_k)
+    if local_search:
+        ls_neighbors = params.get("neighbors")
+        if ls_neighbors is None:
+            ls_neighbors = nearest_neighbors(distance_matrix, 10)
+        ls_matrix = np.array(distance_matrix, dtype = float)
+        ls_matrix[0, :] = 0
+        ls_matrix[:, 0] = 0
+    seed_root = np.random.SeedSequence(seed)
+
+    termination = Termination.coerce(termination)
+    telemetry = Telemetry("ACO", observers)
+    telemetry.start(nodes = n, iterations = iterations, num_ants = num_ants,
+                    executor = executor, variant = variant)
+    if termination is not None:
+        termination.start(iterations)
+
+    with _ColonyBuilder(executor, workers, distance_matrix, feromone_matrix,
+                        heuristic, params) as colony:
+        for iteration in range(1, iterations + 1):
+            t0 = time.perf_counter()
+            ants = colony.build(seed_root.spawn(num_ants))
+            t1 = time.perf_counter()
+
+            distances = [total_distance(routes, distance_matrix) for routes in ants]
+            if local_search:
+                k = int(np.argmin(distances))
+                ants[k], _ = improve_ant(ants[k], distance_matrix, ls_matrix,
+                                         vehicles, demands, open_time,
+                                         close_time, service_time, ls_neighbors,
+                                         travel = params["travel"])
+                distances[k] = total_distance(ants[k], distance_matrix)
+            for routes, distance in zip(ants, distances):
+                if distance < best_solution["Distance"]:
+                    best_solution["Distance"] = distance
+                    best_solution["Route"] = routes
+            t2 = time.perf_counter()
+
+            if variant == "as":
+                update_pheromones(ants, feromone_matrix, rho, distance_matrix)
+            else:
+                k = int(np.argmin(distances))
+                elite = ants[k] if elitist == "iteration" else best_solution["Route"]
+                # MMAS y ACS refuerzan también las aristas del depósito: el
+                # depósito y los límites se calculan con la longitud que las incluye
+                elite_distance = total_distance(elite, distance_matrix, include_depot = True)
+
+                if variant == "mmas":
+                    best_distance = total_distance(best_solution["Route"], distance_matrix,
+                                                   include_depot = True)
+                    update_pheromones_mmas(elite, elite_distance, feromone_matrix, rho,
+                                           best_distance, p_best)
+                else:
+                    # tau0 = 1 / (n·L) con la mejor hormiga de la primera iteración
+                    if tau0 is None:
+                        first = total_distance(ants[k], distance_matrix, include_depot = True)
+                        if 1e-9 < first < np.inf:
+                            tau0 = 1 / (n * first)
+                            if initial_pheromone is None:
+                                feromone_matrix.fill(tau0)
+                    if tau0 is not None:
+                        local_update_acs(ants, feromone_matrix, xi, tau0)
+                    update_pheromones_acs(elite, elite_distance, feromone_matrix, rho)
+            t3 = time.perf_counter()
+
+            telemetry.add_phase("construction", t1 - t0)
+            telemetry.add_phase("evaluation", t2 - t1)
+            telemetry.add_phase("pheromone_update", t3 - t2)
+            if telemetry.active:
+                unique = {routes.key() for routes in ants}
+                telemetry.iteration(
+                    iteration = iteration, iterations = iterations,
+                    best_cost = best_solution["Distance"],
+                    iteration_best = min(distances),
+                    mean_cost = float(np.mean(distances)),
+                    diversity = len(unique) / len(ants),
+                    solutions = ants,
+                    best_solution = best_solution["Route"]
                 )
-                for _ in range(num_ants)
-        ]
-
-        for idx, routes in enumerate(ants, 1):
-            distance = total_distance(routes, distance_matrix)
-            print(f"Ant {idx}, Total Distance = {distance:2f}")
-            for car_name, route in routes.items():
-                print(f"          {car_name}: {route}")
-
-            if distance < best_solution["Distance"]:
-                best_solution["Distance"] = distance
-                best_solution["Route"] = routes
-
-        update_pheromones(ants, feromone_matrix, rho, distance_matrix)
-
-        print(f"Best distance so far: {best_solution['Distance']:.2f}")
+            if termination is not None and termination.should_stop(best_solution["Distance"]):
+                break
 
-    print("\nFinal pheromone matrix:\n", np.round(feromone_matrix, 3))
-    print(f"\nBest route found: \n{best_solution['Route']}")
-    print(f"Total distance = {best_solution['Distance']:.2f} km")
+    telemetry.finish(best_cost = best_solution["Distance"],
+                     best_solution = best_solution["Route"])
 
+    best_solution["Route"].evaluate(distance_matrix)
+    best_solution["Pheromone"] = feromone_matrix.dense()
+    if termination is not None:
+        best_solution["Termination"] = termination.summary()
     return best_solution
 
 
 # ₊˚ ‿︵‿︵‿︵୨୧ ✦ MAIN TEST ✦ ୨୧‿︵‿︵‿︵ ˚₊
 if __name__ == "__main__":
+    import pandas as pd
+
     dist_df = pd.read_csv("app/data/distances.csv", index_col=0)
     distance_matrix = dist_df.to_numpy(dtype=float)
     np.fill_diagonal(distance_matrix, np.inf)
@@ -206,8 +633,9 @@ if __name__ == "__main__":
         demands=demands,
         vehicle_experience=vehicle_experience,
         iterations=5,
-        num_ants=3
+        num_ants=3,
+        observers=[PrintObserver(verbose=True)]
     )
 
     print("\nTEST COMPLETED")
-    print(best_solution)
\ No newline at end of file
+    print({k: best_solution[k] for k in ("Distance", "Route")})
\ No newline at end of file
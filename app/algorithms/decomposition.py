@@ -0,0 +1,324 @@
+# app/algorithms/decomposition.py
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+try:
+    from algorithms.telemetry import Telemetry
+    from algorithms.aco_algorithm import aco_algorithm
+    from algorithms.genetic_algorithm import GA_multi_vehicle
+    from algorithms.local_search import local_search, nearest_neighbors
+    from algorithms.warm_start import cheapest_insertion
+    from algorithms.travel_time import arrival_time
+    from algorithms.route_solution import RouteSolution
+except ImportError:  # ejecutado como script desde app/algorithms
+    from telemetry import Telemetry
+    from aco_algorithm import aco_algorithm
+    from genetic_algorithm import GA_multi_vehicle
+    from local_search import local_search, nearest_neighbors
+    from warm_start import cheapest_insertion
+    from travel_time import arrival_time
+    from route_solution import RouteSolution
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#   Descomposición: primero agrupar, después rutear
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#
+# Los clientes (todo menos el depósito, nodo 0) se parten en grupos, cada
+# grupo recibe uno o más vehículos y se resuelve como un problema chico e
+# independiente. Después se juntan las rutas, se insertan los clientes que
+# quedaron fuera y una búsqueda local sólo entre grupos vecinos corrige la
+# frontera.
+
+METHODS = ("zone", "kmeans", "sweep")
+CLUSTER_SOLVERS = ("ga", "aco")
+EXECUTORS = ("serial", "processes")
+REPAIR_MOVES = ("relocate", "exchange", "oropt")
+
+
+def planar(coords, depot = 0):
+    """[lat, lon] → coordenadas planas (x, y) con el depósito en el origen."""
+    coords = np.asarray(coords, dtype = float)
+    lat0, lon0 = coords[depot]
+    return np.column_stack(((coords[:, 1] - lon0) * np.cos(np.radians(lat0)),
+                            coords[:, 0] - lat0))
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Partición ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def sweep_partition(points, demands, capacities):
+    """
+    Barrido angular alrededor del origen: los puntos se ordenan por ángulo
+    (empezando después del hueco más grande, para no partir un grupo) y se
+    cortan en len(capacities) tramos con demanda proporcional a cada
+    capacidad. Regresa la etiqueta de grupo de cada punto.
+    """
+    points = np.asarray(points, dtype = float)
+    demands = np.asarray(demands, dtype = float)
+    capacities = np.asarray(capacities, dtype = float)
+    k = len(capacities)
+    labels = np.zeros(len(points), dtype = int)
+    if k <= 1 or len(points) == 0:
+        return labels
+
+    if demands.sum() <= 0:
+        demands = np.ones(len(points))
+
+    angle = np.arctan2(points[:, 1], points[:, 0])
+    order = np.argsort(angle, kind = "stable")
+    gaps = np.diff(np.concatenate((angle[order], [angle[order[0]] + 2 * np.pi])))
+    order = np.roll(order, -((int(np.argmax(gaps)) + 1) % len(order)))
+
+    bounds = np.cumsum(capacities / capacities.sum()) * demands.sum()
+    # Cada punto cae en el tramo que contiene la mitad de su demanda
+    middle = np.cumsum(demands[order]) - demands[order] / 2
+    labels[order] = np.minimum(np.searchsorted(bounds, middle, side = "right"), k - 1)
+    return labels
+
+def _capacitated_assign(points, demands, centers, capacities):
+    """
+    Asigna cada punto al centro más cercano con capacidad libre; primero los
+    de mayor arrepentimiento (distancia al segundo centro menos al primero).
+    Los que no caben en ninguno van al más cercano.
+    """
+    dist = np.linalg.norm(points[:, None, :] - centers[None, :, :], axis = 2)
+    order = np.argsort(dist, axis = 1)
+    ranked = np.take_along_axis(dist, order, axis = 1)
+    regret = ranked[:, 1] - ranked[:, 0] if len(centers) > 1 else np.zeros(len(points))
+
+    left = np.asarray(capacities, dtype = float).copy()
+    labels = np.empty(len(points), dtype = int)
+    for i in np.argsort(-regret, kind = "stable"):
+        target = order[i, 0]
+        for c in order[i]:
+            if demands[i] <= left[c] + 1e-9:
+                target = c
+                break
+        labels[i] = target
+        left[target] -= demands[i]
+    return labels
+
+def kmeans_partition(points, demands, capacities, iterations = 25):
+    """
+    k-means con capacidad: k = len(capacities) centros, inicializados con
+    los centroides del barrido (así el resultado es determinista) y con la
+    asignación limitada por la capacidad de cada grupo.
+    """
+    points = np.asarray(points, dtype = float)
+    demands = np.asarray(demands, dtype = float)
+    k = len(capacities)
+    if k <= 1 or len(points) == 0:
+        return np.zeros(len(points), dtype = int)
+
+    labels = sweep_partition(points, demands, capacities)
+    centers = np.array([points[labels == c].mean(axis = 0) if (labels == c).any()
+                        else np.zeros(2) for c in range(k)])
+    for _ in range(iterations):
+        labels = _capacitated_assign(points, demands, centers, capacities)
+        moved = np.array([points[labels == c].mean(axis = 0) if (labels == c).any()
+                          else centers[c] for c in range(k)])
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+    return labels
+
+def zone_partition(points, demands, zones, capacities):
+    """
+    Un grupo por zona. Si hay más zonas que grupos posibles (vehículos),
+    las zonas se juntan barriendo sus centroides, así que sólo se unen
+    zonas contiguas.
+    """
+    zones = np.asarray(zones)
+    names, labels = np.unique(zones, return_inverse = True)
+    if len(names) <= len(capacities):
+        return labels
+    centroids = np.array([points[labels == z].mean(axis = 0) for z in range(len(names))])
+    zone_demand = np.bincount(labels, weights = demands, minlength = len(names))
+    return sweep_partition(centroids, zone_demand, capacities)[labels]
+
+
+def allocate_vehicles(vehicles, cluster_demands):
+    """
+    Reparte los vehículos entre los grupos: uno a cada grupo (el más grande
+    al de mayor demanda) y los que sobren al grupo con más demanda por
+    unidad de capacidad. Regresa una lista de nombres por grupo.
+    """
+    cluster_demands = np.asarray(cluster_demands, dtype = float)
+    names = sorted(vehicles, key = lambda v: -vehicles[v]['capacity'])
+    k = len(cluster_demands)
+    if len(names) < k:
+        raise ValueError(f"Se necesitan al menos {k} vehículos para {k} grupos, "
+                         f"hay {len(names)}.")
+    allocation = [[] for _ in range(k)]
+    capacity = np.zeros(k)
+    for name, c in zip(names, np.argsort(-cluster_demands, kind = "stable")):
+        allocation[c].append(name)
+        capacity[c] += vehicles[name]['capacity']
+    for name in names[k:]:
+        c = int(np.argmax(cluster_demands / capacity))
+        allocation[c].append(name)
+        capacity[c] += vehicles[name]['capacity']
+    return allocation
+
+def partition(method, coords, demands, vehicles, zones = None, clusters = None):
+    """
+    Etiqueta de grupo de cada cliente (nodos 1..n-1) y los vehículos de
+    cada grupo. `clusters` (por defecto, uno por vehículo) sólo aplica a
+    "kmeans" y "sweep".
+    """
+    if method not in METHODS:
+        raise ValueError(f"method debe ser uno de {METHODS}, no {method!r}")
+    points = planar(coords)[1:]
+    demands = np.asarray(demands, dtype = float)[1:]
+
+    if method == "zone":
+        if zones is None:
+            raise ValueError("method='zone' necesita la zona de cada nodo.")
+        all_caps = [vehicles[v]['capacity'] for v in vehicles]
+        labels = zone_partition(points, demands, np.asarray(zones)[1:], all_caps)
+        _, labels = np.unique(labels, return_inverse = True)
+        cluster_demands = np.bincount(labels, weights = demands)
+        return labels, allocate_vehicles(vehicles, cluster_demands)
+
+    k = max(1, min(int(clusters or len(vehicles)), len(vehicles), max(len(points), 1)))
+    allocation = allocate_vehicles(vehicles, np.ones(k))
+    capacities = [sum(vehicles[v]['capacity'] for v in group) for group in allocation]
+    split = kmeans_partition if method == "kmeans" else sweep_partition
+    return split(points, demands, capacities), allocation
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Solución por grupo ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def _solve_cluster(solver, distance_matrix, demands, vehicles, vehicle_experience, params):
+    """
+    Corre en un worker: regresa ({vehículo: [nodos locales del grupo]},
+    distancia del grupo con las vueltas al depósito).
+    """
+    if solver == "ga":
+        routes = GA_multi_vehicle(distance_matrix, demands, vehicles, **params)["Routes"]
+    else:
+        routes = aco_algorithm(distance_matrix, vehicles, demands,
+                               vehicle_experience = vehicle_experience, **params)["Route"]
+    routes = RouteSolution.from_routes(routes, vehicles)
+    return routes.to_dict(), routes.distance(distance_matrix, include_depot = True)
+
+def routes_time(routes, distance_matrix, start_hour = 8, service_time = 0.15, depot = 0):
+    """Horas en ruta de todos los vehículos, con la misma cuenta que `fitness_multi_vehicle`."""
+    total = 0.0
+    for route in routes.values():
+        if not len(route):
+            continue
+        prev, clock = depot, start_hour
+        for client in route:
+            clock = float(arrival_time(distance_matrix[prev, client], clock)) + service_time
+            prev = client
+        total += float(arrival_time(distance_matrix[prev, depot], clock)) - start_hour
+    return total
+
+def boundary_neighbors(distance_matrix, labels, k = 10):
+    """
+    Lista de candidatos para la reparación: los `k` vecinos más cercanos de
+    cada nodo que están en otro grupo. Así la búsqueda local sólo prueba
+    movimientos que cruzan la frontera entre grupos vecinos.
+    """
+    knn = nearest_neighbors(distance_matrix, k)
+    cluster_of = np.concatenate(([-1], labels))
+    return [knn[u][cluster_of[knn[u]] != cluster_of[u]] if u else knn[u][:0]
+            for u in range(len(knn))]
+
+
+def decompose_and_solve(distance_matrix, demands, vehicles, coords,
+                        method = "sweep", solver = "ga", zones = None, clusters = None,
+                        vehicle_experience = None, solver_params = None,
+                        executor = "processes", workers = None, seed = None,
+                        repair = True, repair_k = 10, observers = None):
+    """
+    Primero agrupa, después rutea. `coords` son [lat, lon] por nodo (el
+    depósito en el 0) y `zones` la zona de cada nodo para method="zone".
+    Cada grupo se resuelve con `solver` ("ga" → GA_multi_vehicle, "aco" →
+    aco_algorithm) usando `solver_params`; con executor="processes" los
+    grupos se resuelven en paralelo.
+
+    La reparación inserta los clientes que quedaron fuera (inserción más
+    barata) y aplica relocate / exchange / Or-opt sólo entre nodos de grupos
+    distintos. Sólo se cuidan distancia y capacidad, no las ventanas de
+    tiempo de ACO.
+
+    Regresa {"Distance", "Time", "Routes" (RouteSolution), "Clusters",
+    "Unserved", "Repair"}.
+    """
+    if solver not in CLUSTER_SOLVERS:
+        raise ValueError(f"solver debe ser uno de {CLUSTER_SOLVERS}, no {solver!r}")
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor debe ser uno de {EXECUTORS}, no {executor!r}")
+    d = np.asarray(distance_matrix, dtype = float)
+    demands = np.asarray(demands, dtype = float)
+    n = len(d)
+    capacities = {v: float(vehicles[v]['capacity']) for v in vehicles}
+    if vehicle_experience is None:
+        vehicle_experience = {v: 0.8 for v in vehicles}
+
+    telemetry = Telemetry("decomposition", observers)
+    telemetry.start(nodes = n, vehicles = len(vehicles), method = method, solver = solver,
+                    executor = executor)
+
+    labels, allocation = partition(method, coords, demands, vehicles, zones, clusters)
+    cluster_seeds = np.random.SeedSequence(seed).spawn(len(allocation))
+    tasks = []
+    for c, group in enumerate(allocation):
+        members = np.flatnonzero(labels == c) + 1
+        if not len(members):
+            continue
+        nodes = np.concatenate(([0], members))
+        params = dict(solver_params or {})
+        if seed is not None:
+            params["seed"] = int(cluster_seeds[c].generate_state(1)[0])
+        tasks.append((c, nodes, (solver, d[np.ix_(nodes, nodes)], demands[nodes],
+                                 {v: vehicles[v] for v in group},
+                                 {v: vehicle_experience[v] for v in group}, params)))
+
+    routes = {v: [] for v in vehicles}
+    costs = []
+    def collect(c, nodes, reply):
+        local_routes, cost = reply
+        for v, r in local_routes.items():
+            routes[v] = nodes[np.asarray(r, dtype = int)].tolist()
+        costs.append(cost)
+        if telemetry.active:
+            # Una "iteración" por grupo resuelto; best_cost es la suma hasta ahora
+            telemetry.iteration(iteration = len(costs), iterations = len(tasks), cluster = c,
+                                best_cost = float(sum(costs)), iteration_best = cost,
+                                mean_cost = float(np.mean(costs)), diversity = 0.0)
+
+    if executor == "serial" or len(tasks) <= 1:
+        for c, nodes, args in tasks:
+            collect(c, nodes, _solve_cluster(*args))
+    else:
+        with ProcessPoolExecutor(max_workers = workers or len(tasks)) as pool:
+            futures = {pool.submit(_solve_cluster, *args): (c, nodes) for c, nodes, args in tasks}
+            for future in as_completed(futures):
+                collect(*futures[future], future.result())
+
+    served = {u for r in routes.values() for u in r}
+    unserved = [u for u in range(1, n) if u not in served]
+    improvement = 0.0
+    if repair:
+        routes, unserved = cheapest_insertion(routes, unserved, d, demands, capacities)
+        if n > 2:
+            routes, improvement = local_search(
+                routes, d, demands, capacities,
+                neighbors = boundary_neighbors(d, labels, repair_k), moves = REPAIR_MOVES)
+
+    solution = RouteSolution.from_routes(routes, vehicles)
+    solution.evaluate(d)
+    clusters_info = [
+        {"cluster": c, "nodes": len(nodes) - 1, "vehicles": allocation[c],
+         "demand": float(demands[nodes[1:]].sum())}
+        for c, nodes, _ in tasks
+    ]
+    best_time = routes_time(solution, d)
+
+    telemetry.finish(best_cost = solution.cost, best_time = best_time,
+                     best_solution = solution, clusters = len(tasks))
+    return {"Distance": solution.cost, "Time": best_time, "Routes": solution,
+            "Clusters": clusters_info, "Unserved": [int(u) for u in unserved],
+            "Repair": improvement}
@@ -1,4 +1,8 @@
 import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import openrouteservice
@@ -7,41 +11,332 @@ from tqdm import tqdm
 from haversine import haversine
 from geopy.distance import geodesic
 
-USE_ORS = True
-
 try:
-    client = openrouteservice.Client(key='eyJvcmciOiI1YjNjZTM1OTc4NTExMTAwMDFjZjYyNDgiLCJpZCI6ImUwNWU4Mjc2ZGUwMjQ2MWVhMDk4YzBkNTJmZWY3YjQ1IiwiaCI6Im11cm11cjY0In0=')
-except Exception as e:
-    print("⚠️ No se pudo inicializar OpenRouteService:", e)
-    
-USE_ORS = False
+    from algorithms.road_providers import ORSMatrixProvider
+    from algorithms.store_data import DATA_XLSX
+except ImportError:  # ejecutado como script desde app/algorithms
+    from road_providers import ORSMatrixProvider
+    from store_data import DATA_XLSX
 
-def get_distance(coords_i, coords_j, method="auto"):
+# La llave se lee de ORS_API_KEY; ORS sólo se usa si además USE_ORS=1
+ORS_API_KEY = os.environ.get("ORS_API_KEY")
+USE_ORS = bool(ORS_API_KEY) and os.environ.get("USE_ORS") == "1"
+client = None
+
+if USE_ORS:
+    try:
+        client = openrouteservice.Client(key=ORS_API_KEY)
+    except Exception as e:
+        print("⚠️ No se pudo inicializar OpenRouteService:", e)
+        USE_ORS = False
+
+def measure_distance(coords_i, coords_j, method="auto"):
     """
-    Calcula distancia entre coords_i y coords_j.
-    Si falla ORS o no hay conexión, usa geodesic o haversine.
+    (distancia, método que la produjo) entre coords_i y coords_j. Si falla
+    ORS o no hay conexión, usa geodesic o haversine y lo dice en el método,
+    para que una distancia en línea recta no se confunda con una por calle.
     """
-    
     if USE_ORS and method in ["auto", "ors"]:
         try:
             route = client.directions([coords_i, coords_j],
                                       profile="driving-car",
                                       format="geojson")
-            return route["features"][0]["properties"]["segments"][0]["distance"] / 1000
+            return route["features"][0]["properties"]["segments"][0]["distance"] / 1000, "ors"
         except Exception:
             pass
-        
+
     try:
         if method == "haversine":
-            return haversine(coords_i[::-1], coords_j[::-1])  # (lat, lon)
+            return haversine(coords_i[::-1], coords_j[::-1]), "haversine"  # (lat, lon)
         else:
-            return geodesic(coords_i[::-1], coords_j[::-1]).km
+            return geodesic(coords_i[::-1], coords_j[::-1]).km, "geodesic"
     except Exception:
-        return np.nan
+        return np.nan, None
+
+def get_distance(coords_i, coords_j, method="auto"):
+    """
+    Calcula distancia entre coords_i y coords_j.
+    Si falla ORS o no hay conexión, usa geodesic o haversine.
+    """
+    return measure_distance(coords_i, coords_j, method)[0]
+
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Matriz vectorizada y caché por pares ✦ ୨୧‿︵‿︵‿︵ ˚₊
+EARTH_RADIUS_KM = 6371.0088  # el mismo radio medio que usa `haversine`
+SYMMETRIC_METHODS = ("haversine", "geodesic")
+PAIR_CACHE_PATH = os.path.join("app", "data", "pair_distances.json")
+
+
+def haversine_matrix(lat, lon):
+    """Matriz haversine (km) completa en NumPy; sólo se calcula el triángulo superior."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    n = len(lat)
+    i, j = np.triu_indices(n, k=1)
+
+    a = (np.sin((lat[j] - lat[i]) / 2) ** 2
+         + np.cos(lat[i]) * np.cos(lat[j]) * np.sin((lon[j] - lon[i]) / 2) ** 2)
+    upper = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    matrix = np.zeros((n, n))
+    matrix[i, j] = upper
+    matrix[j, i] = upper
+    return matrix
+
+
+# Elipsoide WGS-84 (el mismo que usa geopy.distance.geodesic)
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+
+def geodesic_matrix(lat, lon, max_iter=200, tol=1e-12):
+    """
+    Matriz geodésica (km) sobre WGS-84 con la fórmula inversa de Vincenty,
+    vectorizada sobre el triángulo superior. Coincide con geopy a menos de
+    un milímetro; los pares casi antípodas, donde Vincenty no converge, se
+    calculan con geopy.
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    n = len(lat)
+    i, j = np.triu_indices(n, k=1)
+
+    a, f = WGS84_A, WGS84_F
+    b = (1 - f) * a
+    U1, U2 = np.arctan((1 - f) * np.tan(lat[i])), np.arctan((1 - f) * np.tan(lat[j]))
+    sinU1, cosU1, sinU2, cosU2 = np.sin(U1), np.cos(U1), np.sin(U2), np.cos(U2)
+    L = lon[j] - lon[i]
+
+    lam = L.copy()
+    converged = np.zeros(len(L), dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            # Puntos repetidos: sin_sigma = 0 y la distancia es 0
+            sin_alpha = np.where(sin_sigma > 0, cosU1 * cosU2 * sin_lam / sin_sigma, 0.0)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Sobre el ecuador cos2_alpha = 0 y cos(2σm) no se usa
+            cos_2sm = np.where(cos2_alpha > 0,
+                               cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha, 0.0)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            previous = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+            converged = np.abs(lam - previous) <= tol
+            if converged.all():
+                break
+
+        u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sm ** 2)
+            - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+        upper = b * A * (sigma - delta_sigma) / 1000
+
+    for k in np.flatnonzero(~converged | ~np.isfinite(upper)):
+        p, q = i[k], j[k]
+        upper[k] = geodesic(np.degrees((lat[p], lon[p])), np.degrees((lat[q], lon[q]))).km
+
+    matrix = np.zeros((n, n))
+    matrix[i, j] = upper
+    matrix[j, i] = upper
+    return matrix
+
+
+class PairDistanceCache:
+    """
+    Caché en disco de distancias por par de coordenadas, para no volver a
+    pedir rutas ya calculadas cuando se agregan tiendas.
+    """
+
+    def __init__(self, path=PAIR_CACHE_PATH):
+        self.path = path
+        self.data = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
 
+    @staticmethod
+    def key(coords_i, coords_j, method):
+        a = f"{coords_i[0]:.6f},{coords_i[1]:.6f}"
+        b = f"{coords_j[0]:.6f},{coords_j[1]:.6f}"
+        if method in SYMMETRIC_METHODS and b < a:
+            a, b = b, a
+        return f"{method}|{a}|{b}"
 
+    def get(self, coords_i, coords_j, method):
+        return self.data.get(self.key(coords_i, coords_j, method))
 
-def build_distance_matrix(ruta_excel, method="auto"):
+    def put(self, coords_i, coords_j, method, value):
+        with self._lock:
+            self.data[self.key(coords_i, coords_j, method)] = value
+            self.dirty = True
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _fetch_missing_bulk(coords, missing, provider):
+    """
+    Pide en bloque (matrices orígenes × destinos) los pares faltantes. Las
+    filas y columnas que faltan completas (tiendas nuevas) se piden aparte
+    para no volver a consultar todo el resto de la matriz.
+    """
+    n = len(coords)
+    out_count, in_count = {}, {}
+    for i, j in missing:
+        out_count[i] = out_count.get(i, 0) + 1
+        in_count[j] = in_count.get(j, 0) + 1
+    full_rows = sorted(i for i, c in out_count.items() if c == n - 1)
+    full_cols = sorted(j for j, c in in_count.items() if c == n - 1)
+    rows_set, cols_set = set(full_rows), set(full_cols)
+    rest = [(i, j) for i, j in missing if i not in rows_set and j not in cols_set]
+
+    requests = []
+    if full_rows:
+        requests.append((full_rows, list(range(n))))
+    other_rows = [i for i in range(n) if i not in rows_set]
+    if full_cols and other_rows:
+        requests.append((other_rows, full_cols))
+    if rest:
+        requests.append((sorted({i for i, _ in rest}), sorted({j for _, j in rest})))
+
+    values = {}
+    for sources, destinations in requests:
+        dist, _ = provider.matrix(coords, sources, destinations)
+        for a, i in enumerate(sources):
+            for b, j in enumerate(destinations):
+                values.setdefault((i, j), dist[a, b])
+    return [((i, j), values[(i, j)]) for i, j in missing]
+
+
+def compute_distance_matrix(coords, method="auto", cache=None, workers=8,
+                            provider=None, known=None):
+    """
+    Matriz de distancias para `coords` = [(lon, lat), ...].
+
+    - "haversine" y "geodesic": vectorizadas en NumPy, sin llamadas por par.
+    - "ors"/"auto": sólo se consultan los pares que no están en `cache`
+      (PairDistanceCache). Con `provider` (ver road_providers) se piden como
+      matrices en bloque; sin él, par por par en hilos (la espera es de red).
+      Si ORS falla en un par se usa la distancia geodésica, pero ésa no se
+      guarda en la caché: el par se vuelve a pedir la próxima vez.
+
+    `known` es una matriz m × m con las distancias de los primeros m puntos,
+    que se copia tal cual sin pedirse ni pasar por la caché.
+    """
+    coords = [(float(lon), float(lat)) for lon, lat in coords]
+    n = len(coords)
+    m = 0 if known is None else len(known)
+
+    if method == "auto":
+        method = "ors" if (USE_ORS or provider is not None) else "geodesic"
+
+    if method in SYMMETRIC_METHODS:
+        lon, lat = zip(*coords) if coords else ((), ())
+        matrix = haversine_matrix(lat, lon) if method == "haversine" else geodesic_matrix(lat, lon)
+        if m:
+            matrix[:m, :m] = known
+        return matrix
+
+    cache = cache if cache is not None else PairDistanceCache(path=None)
+    pairs = [(i, j) for i in range(n) for j in range(n)
+             if i != j and not (i < m and j < m)]
+
+    matrix = np.zeros((n, n))
+    if m:
+        matrix[:m, :m] = known
+    missing = []
+    for i, j in pairs:
+        value = cache.get(coords[i], coords[j], method)
+        if value is None:
+            missing.append((i, j))
+        else:
+            matrix[i, j] = value
+
+    print(f"Calculando {len(missing)} de {len(pairs)} pares ({method})...")
+
+    def compute(pair):
+        i, j = pair
+        return pair, measure_distance(coords[i], coords[j], method)
+
+    if missing and provider is not None:
+        results = [(pair, (value, method))
+                   for pair, value in _fetch_missing_bulk(coords, missing, provider)]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(tqdm(pool.map(compute, missing), total=len(missing)))
+
+    fallback = 0
+    for (i, j), (value, used) in results:
+        matrix[i, j] = value
+        if used == method and not np.isnan(value):
+            cache.put(coords[i], coords[j], method, float(value))
+        else:
+            fallback += 1
+    if fallback:
+        print(f"⚠️ {fallback} pares sin {method}: se usó la distancia geodésica y no se guardan")
+
+    cache.save()
+    return matrix
+
+
+def _coords_by_name(stores, names):
+    """(lon, lat) de cada nombre, tomados de un DataFrame con Nombre/Latitud/Longitud."""
+    lookup = stores.drop_duplicates("Nombre", keep="last").set_index("Nombre")
+    missing = [n for n in names if n not in lookup.index]
+    if missing:
+        raise ValueError(f"Sin coordenadas para {len(missing)} tiendas de la matriz: {missing[:5]}")
+    rows = lookup.loc[names]
+    return list(zip(rows["Longitud"].astype(float), rows["Latitud"].astype(float)))
+
+
+def extend_distance_matrix(dist_df, new_df, method="auto", cache=None, workers=8,
+                           provider=None, stores=None):
+    """
+    Agrega tiendas nuevas a una matriz existente sin recalcularla: sólo se
+    piden los pares que involucran a las tiendas nuevas.
+
+    Las coordenadas de las tiendas que ya están en la matriz se buscan por
+    nombre en `stores` (DataFrame con Nombre, Latitud y Longitud; por
+    defecto data.xlsx), así que `dist_df` puede venir de un CSV.
+    """
+    # Los nombres se toman de las columnas: el índice puede ser numérico en los CSV
+    old_names = list(dist_df.columns)
+    new_df = new_df[~new_df["Nombre"].isin(old_names)]
+    if new_df.empty:
+        return dist_df
+
+    if stores is None:
+        stores = pd.read_excel(DATA_XLSX)
+    old_coords = _coords_by_name(stores, old_names)
+    all_coords = old_coords + list(zip(new_df["Longitud"], new_df["Latitud"]))
+    names = old_names + list(new_df["Nombre"])
+
+    # El bloque viejo se copia de la matriz: no se vuelve a pedir ni se
+    # escribe en la caché (sus valores pueden venir de otro método)
+    cache = cache if cache is not None else PairDistanceCache()
+    old = dist_df.to_numpy(dtype=float)
+    matrix = compute_distance_matrix(all_coords, method, cache=cache, workers=workers,
+                                     provider=provider, known=old)
+    return pd.DataFrame(matrix, columns=names, index=names)
+
+
+def build_distance_matrix(ruta_excel, method="auto", out_path="distances.csv",
+                          cache_path=PAIR_CACHE_PATH, workers=8, provider=None):
     df = pd.read_excel(ruta_excel)
 
     origin = df[df["Zona"] == "Blanca"]
@@ -51,19 +346,17 @@ def build_distance_matrix(ruta_excel, method="auto"):
 
     coords = list(zip(df["Longitud"], df["Latitud"]))
     n = len(coords)
-    matrix = np.zeros((n, n))
 
     print(f"Calculando distancias ({'ORS' if USE_ORS else 'local'}) para {n} puntos...\n")
 
-    for i in tqdm(range(n)):
-        for j in range(n):
-            if i == j:
-                matrix[i, j] = 0
-            else:
-                matrix[i, j] = get_distance(coords[i], coords[j], method)
+    cache = PairDistanceCache(cache_path) if method not in SYMMETRIC_METHODS else None
+    if provider is None and USE_ORS and method in ("auto", "ors"):
+        provider = ORSMatrixProvider(api_key=ORS_API_KEY, workers=workers)
+    matrix = compute_distance_matrix(coords, method, cache=cache, workers=workers,
+                                     provider=provider)
 
     dist_df = pd.DataFrame(matrix, columns=df["Nombre"], index=df["Nombre"])
-    dist_df.to_csv("distances.csv", index=True)
-    print("Matriz guardada: distancias_viales.csv")
+    dist_df.to_csv(out_path, index=True)
+    print(f"Matriz guardada: {out_path}")
 
-    return dist_df
\ No newline at end of file
+    return dist_df
@@ -0,0 +1,152 @@
+# app/algorithms/distance_store.py
+import os
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#        Matriz de distancias en binario
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+DATA_DIR = os.path.join("app", "data")
+SOURCE_CSV = os.path.join(DATA_DIR, "total_distances.csv")
+LEGACY_SELECTION_CSV = os.path.join(DATA_DIR, "distances.csv")
+
+
+class DistanceStore:
+    """
+    Convierte `total_distances.csv` una sola vez a un `.npy` con un archivo
+    auxiliar de nombres, y lo abre con memmap para que todos los workers
+    compartan las mismas páginas del sistema operativo.
+
+    Las submatrices de una selección se guardan en un caché LRU de sólo
+    lectura; los solvers no modifican la matriz de distancias.
+    """
+
+    def __init__(self, csv_path = SOURCE_CSV, dtype = np.float64, cache_size = 32):
+        self.csv_path = csv_path
+        base, _ = os.path.splitext(csv_path)
+        self.npy_path = base + ".npy"
+        self.names_path = base + ".names.json"
+        self.dtype = np.dtype(dtype)
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._names = None
+        self._index = None
+        self._cache = OrderedDict()
+
+    def _is_stale(self):
+        if not (os.path.exists(self.npy_path) and os.path.exists(self.names_path)):
+            return True
+        if not os.path.exists(self.csv_path):
+            return False
+        with open(self.names_path, encoding = "utf-8") as f:
+            meta = json.load(f)
+        return (meta.get("source_mtime") != os.path.getmtime(self.csv_path)
+                or meta.get("dtype") != self.dtype.str)
+
+    def build(self):
+        """Lee el CSV y escribe el `.npy` y el archivo de nombres."""
+        import pandas as pd  # sólo hace falta al convertir el CSV
+
+        dist_df = pd.read_csv(self.csv_path, index_col = 0)
+        matrix = dist_df.to_numpy(dtype = self.dtype)
+        names = [str(name) for name in dist_df.index]
+
+        tmp_path = self.npy_path + ".tmp.npy"
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, self.npy_path)
+
+        meta = {
+            "names": names,
+            "dtype": self.dtype.str,
+            "source_mtime": os.path.getmtime(self.csv_path),
+        }
+        tmp_path = self.names_path + ".tmp"
+        with open(tmp_path, "w", encoding = "utf-8") as f:
+            json.dump(meta, f, ensure_ascii = False)
+        os.replace(tmp_path, self.names_path)
+
+    def load(self):
+        with self._lock:
+            if self._matrix is None:
+                if self._is_stale():
+                    self.build()
+                with open(self.names_path, encoding = "utf-8") as f:
+                    names = json.load(f)["names"]
+                self._matrix = np.load(self.npy_path, mmap_mode = "r")
+                self._names = names
+                self._index = {name: i for i, name in enumerate(names)}
+                self._cache.clear()
+        return self
+
+    @property
+    def matrix(self):
+        return self.load()._matrix
+
+    @property
+    def names(self):
+        return self.load()._names
+
+    def __len__(self):
+        return len(self.names)
+
+    def index_of(self, name):
+        return self.load()._index[name]
+
+    def submatrix(self, indices, diagonal = None):
+        """
+        Submatriz para los índices (globales) dados, en ese orden. Si se da
+        `diagonal` se escribe en la diagonal, como hacen los solvers con inf.
+        """
+        indices = tuple(int(i) for i in indices)
+        key = (indices, diagonal)
+        matrix = self.matrix
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        idx = np.asarray(indices, dtype = int)
+        sub = np.array(matrix[np.ix_(idx, idx)], dtype = float)
+        if diagonal is not None:
+            np.fill_diagonal(sub, diagonal)
+        sub.setflags(write = False)
+
+        with self._lock:
+            self._cache[key] = sub
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last = False)
+        return sub
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def get_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = DistanceStore()
+    return _default_store
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Selección por defecto ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def load_selection(path = LEGACY_SELECTION_CSV, store = None):
+    """
+    Índices globales de la selección por defecto: las columnas de
+    distances.csv. Las selecciones de los usuarios viven en memoria
+    (ver selections.py), nunca en archivos.
+    """
+    import pandas as pd
+
+    store = store or get_store()
+    names = pd.read_csv(path, index_col = 0, nrows = 0).columns
+    return [store.index_of(str(name)) for name in names]
@@ -0,0 +1,217 @@
+# app/algorithms/ga_operators.py
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Operadores del GA (cruce, mutación, selección)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#
+# Los cromosomas son permutaciones de los clientes (1..n-1). Las versiones
+# por lotes reciben matrices (hijos × genes) y un `np.random.Generator`; la
+# pertenencia se revisa con máscaras booleanas indexadas por gen, así que
+# cada hijo cuesta O(n).
+
+CROSSOVERS = ("ox", "pmx", "erx")
+MUTATIONS = ("swap", "inversion", "scramble")
+SELECTIONS = ("elite", "tournament")
+
+
+def _cut_points(rng, count, n):
+    """Cortes a < b (segmento [a, b)) por hijo, como sorted(sample(range(n), 2))."""
+    a = rng.integers(0, n, size = count)
+    b = rng.integers(0, n - 1, size = count)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+def _segment_mask(a, b, n):
+    positions = np.arange(n)
+    return (positions >= a[:, None]) & (positions < b[:, None])
+
+def _gene_mask(parents, mask):
+    """in_seg[r, g] es True si el gen g está en las posiciones marcadas del padre r."""
+    rows = np.arange(len(parents))[:, None]
+    in_seg = np.zeros((len(parents), int(parents.max()) + 1), dtype = bool)
+    in_seg[rows, parents] = mask
+    return in_seg
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Cruces ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def order_crossover(p1, p2, rng, cuts = None):
+    """
+    OX por lotes: el hijo copia p1[a:b] y llena desde la posición b (dando
+    la vuelta) con los genes de p2 que faltan, en el orden en que aparecen
+    en p2 — la misma regla que `crossover`.
+    """
+    p1, p2 = np.asarray(p1), np.asarray(p2)
+    count, n = p1.shape
+    a, b = cuts if cuts is not None else _cut_points(rng, count, n)
+    seg = _segment_mask(a, b, n)
+    rows = np.arange(count)[:, None]
+
+    keep = ~_gene_mask(p1, seg)[rows, p2]
+    rank = np.cumsum(keep, axis = 1) - 1
+    fill_pos = (b[:, None] + np.arange(n)) % n  # b, b+1, ..., a-1
+
+    child = np.where(seg, p1, 0)
+    r, c = np.nonzero(keep)
+    child[r, fill_pos[r, rank[r, c]]] = p2[r, c]
+    return child
+
+def pmx_crossover(p1, p2, rng, cuts = None):
+    """
+    PMX por lotes: el hijo copia p1[a:b] y el resto de p2; los genes de p2
+    que chocan con el segmento se sustituyen siguiendo el mapeo p1 ↔ p2.
+    """
+    p1, p2 = np.asarray(p1), np.asarray(p2)
+    count, n = p1.shape
+    a, b = cuts if cuts is not None else _cut_points(rng, count, n)
+    seg = _segment_mask(a, b, n)
+    rows = np.arange(count)[:, None]
+
+    in_seg = _gene_mask(p1, seg)
+    pos1 = np.zeros_like(in_seg, dtype = int)
+    pos1[rows, p1] = np.arange(n)
+
+    child = np.where(seg, p1, p2)
+    conflict = ~seg & in_seg[rows, child]
+    while conflict.any():
+        r, c = np.nonzero(conflict)
+        child[r, c] = p2[r, pos1[r, child[r, c]]]
+        conflict[r, c] = in_seg[r, child[r, c]]
+    return child
+
+def _edge_recombination_one(p1, p2, rng):
+    n = len(p1)
+    size = int(max(p1.max(), p2.max())) + 1
+    # Hasta 4 vecinos por gen (2 en cada padre), -1 = hueco
+    adjacency = np.full((size, 4), -1, dtype = int)
+    for k, parent in enumerate((p1, p2)):
+        adjacency[parent, 2 * k] = np.roll(parent, 1)
+        adjacency[parent, 2 * k + 1] = np.roll(parent, -1)
+    adjacency = [list(dict.fromkeys(int(x) for x in row if x >= 0)) for row in adjacency]
+    degree = np.array([len(row) for row in adjacency])
+
+    used = np.zeros(size, dtype = bool)
+    order = rng.permutation(p1)  # respaldo cuando no quedan vecinos
+    cursor = 0
+    child = np.empty(n, dtype = p1.dtype)
+    current = int(p1[0])
+    for k in range(n):
+        child[k] = current
+        used[current] = True
+        for nb in adjacency[current]:
+            degree[nb] -= 1
+        options = [nb for nb in adjacency[current] if not used[nb]]
+        if options:
+            fewest = min(degree[nb] for nb in options)
+            ties = [nb for nb in options if degree[nb] == fewest]
+            current = ties[int(rng.integers(len(ties)))]
+        elif k + 1 < n:
+            while used[order[cursor]]:
+                cursor += 1
+            current = int(order[cursor])
+    return child
+
+def edge_recombination(p1, p2, rng, cuts = None):
+    """
+    ERX: el hijo se arma con las aristas de ambos padres, prefiriendo el
+    vecino con menos vecinos libres. Cada hijo es O(n); no se vectoriza
+    entre hijos porque cada paso depende del anterior.
+    """
+    p1, p2 = np.asarray(p1), np.asarray(p2)
+    return np.stack([_edge_recombination_one(x, y, rng) for x, y in zip(p1, p2)])
+
+
+CROSSOVER_OPS = {"ox": order_crossover, "pmx": pmx_crossover, "erx": edge_recombination}
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Mutaciones ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def swap_mutation(children, prob, rng):
+    """Intercambia dos genes en cada hijo con probabilidad `prob` (en su lugar)."""
+    count, n = children.shape
+    rows = np.flatnonzero(rng.random(count) < prob)
+    if len(rows) and n > 1:
+        i, j = _cut_points(rng, len(rows), n)
+        children[rows, i], children[rows, j] = children[rows, j], children[rows, i].copy()
+    return children
+
+def inversion_mutation(children, prob, rng):
+    """Invierte un segmento [a, b] en cada hijo con probabilidad `prob`."""
+    count, n = children.shape
+    rows = np.flatnonzero(rng.random(count) < prob)
+    if len(rows) and n > 1:
+        a, b = _cut_points(rng, len(rows), n)
+        positions = np.broadcast_to(np.arange(n), (len(rows), n))
+        inside = (positions >= a[:, None]) & (positions <= b[:, None])
+        source = np.where(inside, a[:, None] + b[:, None] - positions, positions)
+        children[rows] = np.take_along_axis(children[rows], source, axis = 1)
+    return children
+
+def scramble_mutation(children, prob, rng):
+    """Revuelve un segmento [a, b] en cada hijo con probabilidad `prob`."""
+    count, n = children.shape
+    rows = np.flatnonzero(rng.random(count) < prob)
+    if len(rows) and n > 1:
+        a, b = _cut_points(rng, len(rows), n)
+        positions = np.broadcast_to(np.arange(n), (len(rows), n)).astype(float)
+        inside = (positions >= a[:, None]) & (positions <= b[:, None])
+        # Llaves al azar dentro de [a, b]: al ordenar sólo se mueve el segmento
+        keys = np.where(inside, a[:, None] + rng.random((len(rows), n)) * (b - a)[:, None],
+                        positions)
+        children[rows] = np.take_along_axis(children[rows], np.argsort(keys, axis = 1),
+                                            axis = 1)
+    return children
+
+
+MUTATION_OPS = {"swap": swap_mutation, "inversion": inversion_mutation,
+                "scramble": scramble_mutation}
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Selección y generación completa ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def tournament_selection(costs, count, rng, size = 2):
+    """Índices de `count` ganadores de torneos de `size` (menor costo gana)."""
+    costs = np.asarray(costs, dtype = float)
+    entrants = rng.integers(0, len(costs), size = (count, size))
+    return entrants[np.arange(count), np.argmin(costs[entrants], axis = 1)]
+
+def _distinct_pairs(rng, count, pool):
+    """Pares de índices distintos en [0, pool), como random.sample(élite, 2)."""
+    i = rng.integers(0, pool, size = count)
+    j = rng.integers(0, pool - 1, size = count)
+    j += j >= i
+    return i, j
+
+def breed(population, costs, count, rng, num_elite,
+          prob_crossover = 0.9, prob_mutation = 0.2,
+          crossover = "ox", mutation = "swap",
+          selection = "elite", tournament_size = 2):
+    """
+    Genera `count` hijos de una sola vez. `population` debe venir ordenada
+    por costo. Con selection="elite" los padres son dos élites distintas al
+    azar (como antes); con "tournament" se eligen por torneo en toda la
+    población. Los hijos que no se cruzan copian al primer padre.
+    """
+    if crossover not in CROSSOVER_OPS:
+        raise ValueError(f"crossover debe ser uno de {CROSSOVERS}, no {crossover!r}")
+    if mutation not in MUTATION_OPS:
+        raise ValueError(f"mutation debe ser uno de {MUTATIONS}, no {mutation!r}")
+    if selection not in SELECTIONS:
+        raise ValueError(f"selection debe ser uno de {SELECTIONS}, no {selection!r}")
+
+    population = np.asarray(population)
+    if count <= 0:
+        return population[:0].copy()
+
+    if selection == "elite":
+        i, j = _distinct_pairs(rng, count, num_elite)
+    else:
+        i = tournament_selection(costs, count, rng, tournament_size)
+        j = tournament_selection(costs, count, rng, tournament_size)
+    children = population[i].copy()
+
+    cross = np.flatnonzero(rng.random(count) < prob_crossover)
+    if len(cross) and population.shape[1] > 1:
+        children[cross] = CROSSOVER_OPS[crossover](population[i[cross]],
+                                                   population[j[cross]], rng)
+
+    return MUTATION_OPS[mutation](children, prob_mutation, rng)
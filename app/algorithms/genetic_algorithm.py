@@ -1,25 +1,30 @@
 # app/algorithms/genetic_algorithm.py
 import os
+import time
 import random
 import numpy as np
-import pandas as pd
+
+# average_speed vivía en este módulo: se sigue importando desde aquí
+try:
+    from algorithms.telemetry import Telemetry, PrintObserver
+    from algorithms.local_search import local_search as run_local_search, nearest_neighbors
+    from algorithms.travel_time import TravelTimeModel, arrival_time, average_speed
+    from algorithms.route_solution import RouteSolution
+    from algorithms.ga_operators import breed
+    from algorithms.termination import Termination
+except ImportError:  # ejecutado como script desde app/algorithms
+    from telemetry import Telemetry, PrintObserver
+    from local_search import local_search as run_local_search, nearest_neighbors
+    from travel_time import TravelTimeModel, arrival_time, average_speed
+    from route_solution import RouteSolution
+    from ga_operators import breed
+    from termination import Termination
 
 
 # ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
 #           1. Inicialización GA
 # ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
 
-# Peso del time
-def average_speed(hour):
-    if 7 <= hour < 9:
-        return 20
-    elif 9 <= hour < 14:
-        return 30
-    elif 14 <= hour < 19:
-        return 15
-    else:
-        return 40
-
 # Fitness
 def fitness(individuo, distance_matrix, demands, capacity, penalty, start_hour=8, service_time=0.15):
     routes = []
@@ -39,7 +44,6 @@ def fitness(individuo, distance_matrix, demands, capacity, penalty, start_hour=8
 
     total = 0
     total_time = 0
-    vel = average_speed(start_hour)
 
     for route in routes:
         load = sum(demands[i] for i in route)
@@ -47,180 +51,530 @@ def fitness(individuo, distance_matrix, demands, capacity, penalty, start_hour=8
             total += penalty * (load - capacity)
 
         prev_node = 0  # depósito
+        clock = start_hour
         for client in route:
             d = distance_matrix[prev_node, client]
             total += d
-            total_time += d / vel + service_time
+            clock = float(arrival_time(d, clock)) + service_time
             prev_node = client
         d = distance_matrix[prev_node, 0]
         total += d
-        total_time += d / vel
+        total_time += float(arrival_time(d, clock)) - start_hour
 
     return total, total_time
 
-def mutation(individuo, prob):
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Evaluación de la población completa ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def split_routes(population, demands, capacities, max_routes = None):
+    """
+    Asigna cada posición del cromosoma a una ruta (o vehículo) usando la suma
+    acumulada de la demanda, igual que el corte voraz de `fitness`.
+    Regresa una matriz (pop_size × n) con el índice de ruta; -1 marca los
+    clientes que ya no caben cuando se acaban los vehículos.
+    """
+    population = np.asarray(population, dtype = int)
+    pop_size, n = population.shape
+    demands = np.asarray(demands, dtype = float)
+    cum = np.cumsum(demands[population], axis = 1)
+    positions = np.arange(n)
+
+    labels = np.zeros((pop_size, n), dtype = int)
+    start = np.zeros(pop_size, dtype = int)
+    base = np.zeros(pop_size, dtype = float)
+    active = np.ones(pop_size, dtype = bool)
+    rows = np.arange(pop_size)
+    r = 0
+
+    while active.any():
+        cap = capacities[min(r, len(capacities) - 1)]
+        # Como en `fitness_multi_vehicle`: el primer cliente de la primera ruta
+        # también se revisa (si no cabe, esa ruta queda vacía), pero el que
+        # abre una ruta después de un corte se acepta sin revisar
+        overflow = (cum - base[:, None]) > cap
+        if r > 0:
+            overflow &= positions > start[:, None]
+        overflow &= active[:, None]
+        has_overflow = overflow.any(axis = 1)
+        if not has_overflow.any():
+            break
+
+        first = np.argmax(overflow, axis = 1)
+        rows_o = rows[has_overflow]
+        first_o = first[has_overflow]
+        tail = positions >= first_o[:, None]
+
+        if max_routes is not None and r + 1 >= max_routes:
+            labels[rows_o] = np.where(tail, -1, labels[rows_o])
+            active[rows_o] = False
+        else:
+            labels[rows_o] = np.where(tail, r + 1, labels[rows_o])
+            start[rows_o] = first_o
+            base[rows_o] = np.where(first_o > 0, cum[rows_o, first_o - 1], 0.0)
+
+        active &= has_overflow
+        r += 1
+
+    return labels
+
+def _route_times(population, labels, travel, start_hour, service_time):
+    """
+    Duración total de las rutas de cada individuo. Cada ruta sale del
+    depósito a `start_hour` y el reloj avanza posición por posición (para
+    toda la población a la vez), así que la velocidad cambia con la hora.
+    """
+    pop_size, n = population.shape
+    clock = np.full(pop_size, float(start_hour))
+    prev = np.zeros(pop_size, dtype = int)
+    total = np.zeros(pop_size)
+
+    for k in range(n + 1):
+        if k > 0:
+            # Cierra la ruta que termina en la posición k-1 (regreso al depósito)
+            ending = labels[:, k - 1] >= 0
+            if k < n:
+                ending &= labels[:, k] != labels[:, k - 1]
+            if ending.any():
+                back = travel.arrivals(prev[ending], 0, clock[ending])
+                total[ending] += back - start_hour
+                clock[ending] = start_hour
+                prev[ending] = 0
+        if k == n:
+            break
+        kept = labels[:, k] >= 0
+        if kept.any():
+            nodes = population[kept, k]
+            clock[kept] = travel.arrivals(prev[kept], nodes, clock[kept]) + service_time
+            prev[kept] = nodes
+
+    return total
+
+def _route_legs(population, labels, distance_matrix, travel, start_hour, service_time):
+    """Distancia y tiempo de cada individuo, con salida y regreso al depósito."""
+    population = np.asarray(population, dtype = int)
+    kept = labels >= 0
+
+    prev_labels = np.empty_like(labels)
+    prev_labels[:, 0] = -2
+    prev_labels[:, 1:] = labels[:, :-1]
+    next_labels = np.empty_like(labels)
+    next_labels[:, -1] = -2
+    next_labels[:, :-1] = labels[:, 1:]
+
+    prev_nodes = np.zeros_like(population)
+    prev_nodes[:, 1:] = population[:, :-1]
+    prev_nodes[prev_labels != labels] = 0  # la ruta arranca en el depósito
+
+    out_legs = np.where(kept, distance_matrix[prev_nodes, population], 0.0)
+    back_legs = np.where(kept & (next_labels != labels),
+                         distance_matrix[population, 0], 0.0)
+
+    distance = out_legs.sum(axis = 1) + back_legs.sum(axis = 1)
+    time = _route_times(population, labels, travel, start_hour, service_time)
+    return distance, time
+
+def fitness_population(population, distance_matrix, demands, capacity, penalty,
+                       start_hour = 8, service_time = 0.15, travel = None):
+    """Versión por lotes de `fitness`: regresa arreglos de costo y tiempo."""
+    population = np.asarray(population, dtype = int)
+    if travel is None:
+        travel = TravelTimeModel(distance_matrix)
+    labels = split_routes(population, demands, [capacity])
+    total, total_time = _route_legs(population, labels, distance_matrix,
+                                    travel, start_hour, service_time)
+
+    # Sólo una ruta de un cliente puede exceder la capacidad
+    pop_size = len(population)
+    num_routes = labels.max() + 1
+    flat = labels + num_routes * np.arange(pop_size)[:, None]
+    loads = np.bincount(flat.ravel(),
+                        weights = np.asarray(demands, dtype = float)[population].ravel(),
+                        minlength = pop_size * num_routes).reshape(pop_size, num_routes)
+    total += penalty * np.clip(loads - capacity, 0, None).sum(axis = 1)
+
+    return total, total_time
+
+def fitness_population_multi_vehicle(population, distance_matrix, demands, vehicles,
+                                     penalty, start_hour = 8, service_time = 0.15,
+                                     travel = None):
+    """
+    Versión por lotes de `fitness_multi_vehicle`. En lugar de construir los
+    diccionarios de rutas regresa las etiquetas de vehículo por posición;
+    `routes_from_labels` arma las rutas sólo del individuo que interese.
+    """
+    population = np.asarray(population, dtype = int)
+    if travel is None:
+        travel = TravelTimeModel(distance_matrix)
+    capacities = [v['capacity'] for v in vehicles.values()]
+    labels = split_routes(population, demands, capacities,
+                          max_routes = len(capacities))
+    total, total_time = _route_legs(population, labels, distance_matrix,
+                                    travel, start_hour, service_time)
+    total += penalty * 100 * (labels < 0).any(axis = 1)
+    return total, total_time, labels
+
+def routes_from_labels(individuo, labels, vehicles):
+    return RouteSolution.from_labels(individuo, labels, vehicles)
+
+def memetic_step(individuo, labels, distance_matrix, demands, capacities, neighbors):
+    """
+    Paso memético: búsqueda local sobre las rutas del individuo y de regreso
+    a cromosoma (rutas concatenadas; los clientes que no cupieron al final).
+    """
+    individuo = np.asarray(individuo, dtype = int)
+    routes = RouteSolution.from_labels(individuo, labels, range(len(capacities)))
+    improved, gain = run_local_search(routes, distance_matrix, demands,
+                                      dict(enumerate(capacities)),
+                                      neighbors = neighbors)
+    if gain <= 0:
+        return None
+    chromosome = [c for k in range(len(capacities)) for c in improved[k]]
+    chromosome += individuo[labels < 0].tolist()
+    return chromosome
+
+def population_diversity(population):
+    """Fracción de individuos distintos en la población."""
+    return len(np.unique(np.asarray(population), axis = 0)) / len(population)
+
+# Versiones de un solo individuo; el GA genera cada generación con `breed`
+def mutation(individuo, prob, rng=random):
+    """Intercambia dos genes; si no hay mutación regresa el mismo objeto, sin copiarlo."""
+    if rng.random() >= prob:
+        return individuo
     mutated = individuo.copy()
-    if random.random() < prob:
-        i, j = random.sample(range(len(mutated)), 2)
-        mutated[i], mutated[j] = mutated[j], mutated[i]
+    i, j = rng.sample(range(len(mutated)), 2)
+    mutated[i], mutated[j] = mutated[j], mutated[i]
     return mutated
 
-def crossover(ind1, ind2):
+def crossover(ind1, ind2, rng=random):
     n = len(ind1)
-    p1, p2 = sorted(random.sample(range(n), 2))
+    p1, p2 = sorted(rng.sample(range(n), 2))
     child = [None] * n
     child[p1:p2] = ind1[p1:p2]
+    taken = set(child[p1:p2])
 
     pos = p2
     for c in ind2:
-        if c not in child:
+        if c not in taken:
             if pos == n:
                 pos = 0
             child[pos] = c
             pos += 1
     return child
 
+def initial_population(clients, pop_size, seeds=None, rng=random):
+    """
+    Población inicial. Con `seeds` (cromosomas de una solución previa) se
+    incluyen tal cual, hasta la mitad de la población son variaciones de
+    ellos (1 a 3 intercambios) y el resto es aleatorio.
+    """
+    population = [list(s) for s in (seeds or [])][:pop_size]
+    base = list(population)
+    while base and len(population) < max(len(base), pop_size // 2):
+        child = list(rng.choice(base))
+        for _ in range(rng.randint(1, 3)):
+            child = mutation(child, 1.0, rng)
+        population.append(child)
+    while len(population) < pop_size:
+        population.append(rng.sample(clients, len(clients)))
+    return population
+
 def GA(distance_matrix, demands, capacity=500,
                  pop_size=80, generations=300,
-                 prob_crossover=0.9, prob_mutation=0.2, penalty=10000):
-
+                 prob_crossover=0.9, prob_mutation=0.2, penalty=10000,
+                 local_search=False, seeds=None, observers=None,
+                 crossover_op="ox", mutation_op="swap", selection="elite",
+                 termination=None):
+    """
+    GA de un vehículo (el cromosoma se parte por capacidad). `termination`
+    funciona igual que en GA_multi_vehicle y el resultado incluye
+    "Termination".
+    """
+    termination = Termination.coerce(termination)
+    if termination is not None:
+        termination.start(generations)
     clients = list(range(1, len(demands)))
-    population = [random.sample(clients, len(clients)) for _ in range(pop_size)]
+    travel = TravelTimeModel(distance_matrix)
+    if local_search:
+        neighbors = nearest_neighbors(distance_matrix, 10)
+    # El generador de NumPy sale del `random` global para que random.seed() siga bastando
+    rng = np.random.default_rng(random.getrandbits(64))
+    population = np.array(initial_population(clients, pop_size, seeds), dtype=int)
     num_elite = int(0.2 * pop_size)
     best_solution = {"Cost": float("inf"), "Route": [], "Time": 0}
 
-    for gen in range(generations):
-        costs = []
-        for ind in population:
-            cost, time = fitness(ind, distance_matrix, demands, capacity, penalty)
-            costs.append((cost, time, ind))
+    telemetry = Telemetry("GA", observers)
+    telemetry.start(nodes=len(demands), iterations=generations, pop_size=pop_size)
 
-        costs.sort(key=lambda x: x[0])
-        best_cost, best_time, best_ind = costs[0]
+    for gen in range(generations):
+        t0 = time.perf_counter()
+        pop_costs, pop_times = fitness_population(population, distance_matrix,
+                                                  demands, capacity, penalty,
+                                                  travel=travel)
+        order = np.argsort(pop_costs, kind="stable")
+        best_i = order[0]
+        best_cost, best_time = float(pop_costs[best_i]), float(pop_times[best_i])
+
+        if local_search:
+            labels = split_routes([population[best_i]], demands, [capacity])[0]
+            child = memetic_step(population[best_i], labels, distance_matrix, demands,
+                                 [capacity] * (labels.max() + 1), neighbors)
+            if child is not None:
+                c, t = fitness_population([child], distance_matrix, demands, capacity,
+                                          penalty, travel=travel)
+                if c[0] < best_cost:
+                    population[best_i] = child
+                    best_cost, best_time = float(c[0]), float(t[0])
 
         if best_cost < best_solution["Cost"]:
             best_solution["Cost"] = best_cost
-            best_solution["Route"] = best_ind
+            best_solution["Route"] = population[best_i].tolist()
             best_solution["Time"] = best_time
-
-        # --- Nueva generación (elitismo + cruce + mutación) ---
-        new_population = [ind for (_, _, ind) in costs[:num_elite]]
-
-        while len(new_population) < pop_size:
-            p1, p2 = random.sample(costs[:num_elite], 2)
-            if random.random() < prob_crossover:
-                child = crossover(p1[2], p2[2])
-            else:
-                child = p1[2].copy()
-            child = mutation(child, prob_mutation)
-            new_population.append(child)
-
+        t1 = time.perf_counter()
+
+        # --- Nueva generación (elitismo + cruce + mutación, en lote) ---
+        ranked = population[order]
+        children = breed(ranked, pop_costs[order], pop_size - num_elite, rng, num_elite,
+                         prob_crossover, prob_mutation, crossover_op, mutation_op, selection)
+        new_population = np.vstack((ranked[:num_elite], children))
+
+        t2 = time.perf_counter()
+
+        telemetry.add_phase("evaluation", t1 - t0)
+        telemetry.add_phase("breeding", t2 - t1)
+        if telemetry.active:
+            telemetry.iteration(
+                iteration=gen + 1, iterations=generations,
+                best_cost=best_solution["Cost"], iteration_best=best_cost,
+                mean_cost=float(pop_costs.mean()),
+                diversity=population_diversity(population),
+                best_solution=best_solution["Route"]
+            )
         population = new_population
-        print(f"Gen {gen} → Mejor costo: {best_cost:.2f}")
+        if termination is not None and termination.should_stop(best_solution["Cost"]):
+            break
 
-    print("\n=== RESULTADOS FINALES GA ===")
-    print(f"Mejor costo total: {best_solution['Cost']:.2f}")
-    print(f"Tiempo estimado: {best_solution['Time']:.2f} horas")
-    print(f"Ruta óptima: {best_solution['Route']}\n")
+    telemetry.finish(best_cost=best_solution["Cost"],
+                     best_time=best_solution["Time"],
+                     best_solution=best_solution["Route"])
 
+    # Élite de la última generación, para arrancar en caliente después
+    best_solution["Elite"] = population[:num_elite].tolist()
+    if termination is not None:
+        best_solution["Termination"] = termination.summary()
     return best_solution
 
 # ₊˚ ‿︵‿︵‿︵୨୧ ✦ FITNESS con más de 1 vehículo ✦ ୨୧‿︵‿︵‿︵ ˚₊
 def fitness_multi_vehicle(individuo, distance_matrix, demands, vehicles, penalty, start_hour=8, service_time=0.15):
     vehicle_names = list(vehicles.keys())
-    routes = {v: [] for v in vehicle_names}
-    current_vehicle = 0
+    individuo = np.asarray(individuo, dtype=np.int32)
+    # Las rutas son cortes del cromosoma: sólo se guardan las posiciones de corte
+    cuts = [0]
+    served = len(individuo)
     current_capacity = 0
-    current_route = []
-    vel = average_speed(start_hour)
     total_cost = 0
     total_time = 0
 
-    for client in individuo:
+    for pos, client in enumerate(individuo.tolist()):
         demand = demands[client]
-        veh_name = vehicle_names[current_vehicle]
-        capacity = vehicles[veh_name]['capacity']
+        capacity = vehicles[vehicle_names[len(cuts) - 1]]['capacity']
 
         if current_capacity + demand <= capacity:
-            current_route.append(client)
             current_capacity += demand
         else:
-            routes[veh_name] = current_route.copy()
-            current_vehicle += 1
+            cuts.append(pos)
             current_capacity = demand
-            current_route = [client]
 
-            if current_vehicle >= len(vehicle_names):
+            if len(cuts) > len(vehicle_names):
                 total_cost += penalty * 100
+                served = pos
                 break
 
-    if current_vehicle < len(vehicle_names):
-        routes[vehicle_names[current_vehicle]] = current_route
+    offsets = cuts + [served] * (len(vehicle_names) + 1 - len(cuts))
+    routes = RouteSolution(individuo[:served], offsets, vehicle_names)
 
-    for veh_name, route in routes.items():
+    for k in range(len(routes)):
+        route = routes.route(k).tolist()
         if not route:
             continue
         prev_node = 0
+        clock = start_hour
         for client in route:
             d = distance_matrix[prev_node, client]
             total_cost += d
-            total_time += d / vel + service_time
+            clock = float(arrival_time(d, clock)) + service_time
             prev_node = client
         d = distance_matrix[prev_node, 0]
         total_cost += d
-        total_time += d / vel
+        total_time += float(arrival_time(d, clock)) - start_hour
 
+    routes.evaluate(distance_matrix)
     return total_cost, total_time, routes
 
 
 # ₊˚ ‿︵‿︵‿︵୨୧ ✦ GA con más de un vehículo ✦ ୨୧‿︵‿︵‿︵ ˚₊
-def GA_multi_vehicle(distance_matrix, demands, vehicles,
-                     pop_size=80, generations=300,
-                     prob_crossover=0.9, prob_mutation=0.2, penalty=10000):
-
-    clients = list(range(1, len(demands)))
-    population = [random.sample(clients, len(clients)) for _ in range(pop_size)]
-    num_elite = int(0.2 * pop_size)
-    best_solution = {"Cost": float("inf"), "Routes": {}, "Time": 0}
-
-    for gen in range(generations):
-        costs = []
-        for ind in population:
-            cost, time, routes = fitness_multi_vehicle(ind, distance_matrix, demands, vehicles, penalty)
-            costs.append((cost, time, routes, ind))
-
-        costs.sort(key=lambda x: x[0])
-        best_cost, best_time, best_routes, best_ind = costs[0]
-
-        if best_cost < best_solution["Cost"]:
-            best_solution["Cost"] = best_cost
-            best_solution["Routes"] = best_routes
-            best_solution["Time"] = best_time
-
-        new_population = [ind for (_, _, _, ind) in costs[:num_elite]]
+class GAIsland:
+    """
+    Una población del GA multi-vehículo que avanza por bloques de
+    generaciones. `GA_multi_vehicle` es una sola isla; `GA_islands` corre
+    varias y les intercambia individuos entre bloques.
+
+    Con `seed` la isla usa su propio `random.Random`, así que su resultado
+    no depende de otras islas ni del proceso donde corra; sin `seed` usa el
+    `random` global como antes.
+    """
+
+    def __init__(self, distance_matrix, demands, vehicles, pop_size=80,
+                 prob_crossover=0.9, prob_mutation=0.2, penalty=10000,
+                 local_search=False, seeds=None, seed=None,
+                 crossover_op="ox", mutation_op="swap", selection="elite"):
+        self.distance_matrix = distance_matrix
+        self.demands = demands
+        self.vehicles = vehicles
+        self.pop_size = pop_size
+        self.prob_crossover = prob_crossover
+        self.prob_mutation = prob_mutation
+        self.penalty = penalty
+        self.operators = dict(crossover=crossover_op, mutation=mutation_op,
+                              selection=selection)
+        self.rng = random.Random(seed) if seed is not None else random
+
+        self.capacities = [v['capacity'] for v in vehicles.values()]
+        self.travel = TravelTimeModel(distance_matrix)
+        self.neighbors = nearest_neighbors(distance_matrix, 10) if local_search else None
+        self.num_elite = int(0.2 * pop_size)
+        self.population = np.array(initial_population(list(range(1, len(demands))),
+                                                      pop_size, seeds, self.rng), dtype=int)
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.best = {"Cost": float("inf"), "Routes": RouteSolution.from_routes({}, vehicles),
+                     "Time": 0}
+        self.generation = 0
+        self.last = {}
+        self.last_duration = 0.0
+
+    def evolve(self, generations, telemetry=None, total=None, termination=None,
+               time_left=None):
+        """
+        Corre hasta `generations` generaciones; `total` es el total para la
+        telemetría. Con `termination` puede parar antes; regresa True si fue así.
+        Con `time_left` (segundos) no empieza una generación que, al ritmo de
+        la anterior, ya no terminaría a tiempo.
+        """
+        deadline = None if time_left is None else time.perf_counter() + time_left
+        for _ in range(generations):
+            if deadline is not None and time.perf_counter() + self.last_duration > deadline:
+                return True
+            self.generation += 1
+            t0 = time.perf_counter()
+            pop_costs, pop_times, labels = fitness_population_multi_vehicle(
+                self.population, self.distance_matrix, self.demands, self.vehicles,
+                self.penalty, travel=self.travel)
+            order = np.argsort(pop_costs, kind="stable")
+            best_i = order[0]
+            best_cost, best_time = float(pop_costs[best_i]), float(pop_times[best_i])
+            best_labels = labels[best_i]
+
+            if self.neighbors is not None:
+                child = memetic_step(self.population[best_i], best_labels, self.distance_matrix,
+                                     self.demands, self.capacities, self.neighbors)
+                if child is not None:
+                    c, t, lab = fitness_population_multi_vehicle(
+                        [child], self.distance_matrix, self.demands, self.vehicles,
+                        self.penalty, travel=self.travel)
+                    if c[0] < best_cost:
+                        self.population[best_i] = child
+                        best_cost, best_time, best_labels = float(c[0]), float(t[0]), lab[0]
+
+            if best_cost < self.best["Cost"]:
+                self.best["Cost"] = best_cost
+                self.best["Routes"] = routes_from_labels(self.population[best_i], best_labels,
+                                                         self.vehicles)
+                self.best["Routes"].evaluate(self.distance_matrix)
+                self.best["Time"] = best_time
+            t1 = time.perf_counter()
+
+            ranked = self.population[order]
+            children = breed(ranked, pop_costs[order], self.pop_size - self.num_elite,
+                             self.np_rng, self.num_elite, self.prob_crossover,
+                             self.prob_mutation, **self.operators)
+            new_population = np.vstack((ranked[:self.num_elite], children))
+
+            t2 = time.perf_counter()
+
+            self.last = {"iteration_best": best_cost, "mean_cost": float(pop_costs.mean())}
+            if telemetry is not None:
+                telemetry.add_phase("evaluation", t1 - t0)
+                telemetry.add_phase("breeding", t2 - t1)
+                if telemetry.active:
+                    telemetry.iteration(iteration=self.generation, iterations=total,
+                                        best_cost=self.best["Cost"],
+                                        diversity=population_diversity(self.population),
+                                        best_solution=self.best["Routes"],
+                                        **self.last)
+            self.population = new_population
+            self.last_duration = time.perf_counter() - t0
+            if termination is not None and termination.should_stop(self.best["Cost"]):
+                return True
+        return False
+
+    def emigrants(self, count):
+        """Los `count` mejores de la última generación (la élite va al inicio)."""
+        return self.population[:count].tolist()
+
+    def receive(self, migrants):
+        """Los inmigrantes reemplazan a los últimos hijos, nunca a la élite."""
+        migrants = list(migrants)[:self.pop_size - self.num_elite]
+        if migrants:
+            self.population[-len(migrants):] = np.asarray(migrants, dtype=int)
+
+    def stats(self):
+        return dict(self.last, generation=self.generation, best_cost=self.best["Cost"],
+                    best_time=self.best["Time"], best_routes=self.best["Routes"],
+                    diversity=population_diversity(self.population))
+
+    def result(self):
+        # Élite de la última generación, para arrancar en caliente después
+        return dict(self.best, Elite=self.population[:self.num_elite].tolist())
 
-        while len(new_population) < pop_size:
-            p1, p2 = random.sample(costs[:num_elite], 2)
-            if random.random() < prob_crossover:
-                child = crossover(p1[3], p2[3])
-            else:
-                child = p1[3].copy()
-            child = mutation(child, prob_mutation)
-            new_population.append(child)
-
-        population = new_population
-        print(f"Gen {gen+1} → Mejor costo: {best_cost:.2f}")
-
-    print("\n=== RESULTADOS GA MULTIVEHÍCULO ===")
-    print(f"Mejor costo total: {best_solution['Cost']:.2f}")
-    print(f"Tiempo estimado: {best_solution['Time']:.2f} horas")
-    print(f"Rutas óptimas: {best_solution['Routes']}")
 
+def GA_multi_vehicle(distance_matrix, demands, vehicles,
+                     pop_size=80, generations=300,
+                     prob_crossover=0.9, prob_mutation=0.2, penalty=10000,
+                     local_search=False, seeds=None, seed=None, observers=None,
+                     crossover_op="ox", mutation_op="swap", selection="elite",
+                     termination=None):
+    """
+    GA con varios vehículos (una sola isla). `termination` (una
+    `Termination` o un dict con sus argumentos) agrega límite de tiempo,
+    paro por estancamiento y costo objetivo; `generations` sigue siendo el
+    máximo y el resultado incluye "Termination".
+    """
+    termination = Termination.coerce(termination)
+    if termination is not None:
+        termination.start(generations)
+    island = GAIsland(distance_matrix, demands, vehicles, pop_size=pop_size,
+                      prob_crossover=prob_crossover, prob_mutation=prob_mutation,
+                      penalty=penalty, local_search=local_search, seeds=seeds, seed=seed,
+                      crossover_op=crossover_op, mutation_op=mutation_op,
+                      selection=selection)
+
+    telemetry = Telemetry("GA_multi_vehicle", observers)
+    telemetry.start(nodes=len(demands), iterations=generations, pop_size=pop_size,
+                    vehicles=len(vehicles))
+
+    island.evolve(generations, telemetry, total=generations, termination=termination)
+
+    best_solution = island.result()
+    if termination is not None:
+        best_solution["Termination"] = termination.summary()
+    telemetry.finish(best_cost=best_solution["Cost"],
+                     best_time=best_solution["Time"],
+                     best_solution=best_solution["Routes"])
     return best_solution
 
 
 # ₊˚ ‿︵‿︵‿︵୨୧ ✦ MAIN TEST ✦ ୨୧‿︵‿︵‿︵ ˚₊
 if __name__ == "__main__":
+    import pandas as pd
+
     dist_path = os.path.join("app", "data", "distances.csv")
     dist_df = pd.read_csv(dist_path, index_col = 0)
     distance_matrix = dist_df.to_numpy(dtype=float)
@@ -233,6 +587,7 @@ if __name__ == "__main__":
     df = df_all.loc[selected_idx].reset_index(drop=True)
 
     demands = df["Demanda"].to_numpy()
-    best = GA(distance_matrix, demands, capacity = 500)
+    best = GA(distance_matrix, demands, capacity = 500,
+              observers = [PrintObserver(every = 10)])
 
-    print(best)
\ No newline at end of file
+    print({k: v for k, v in best.items() if k != "Elite"})
\ No newline at end of file
@@ -0,0 +1,288 @@
+# app/algorithms/island_ga.py
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+try:
+    from algorithms.telemetry import Telemetry
+    from algorithms.genetic_algorithm import GAIsland
+    from algorithms.termination import Termination
+except ImportError:  # ejecutado como script desde app/algorithms
+    from telemetry import Telemetry
+    from genetic_algorithm import GAIsland
+    from termination import Termination
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      GA por islas con migración
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+EXECUTORS = ("serial", "processes")
+TOPOLOGIES = ("ring", "all")
+# Lo único que `island_params` puede variar por isla
+ISLAND_PARAMS = ("prob_crossover", "prob_mutation", "crossover_op", "mutation_op",
+                 "selection", "seed")
+
+
+def check_island_params(island_params):
+    """
+    Valida `island_params`: una lista de dicts con llaves de ISLAND_PARAMS.
+    Lanza ValueError con la primera entrada inválida; regresa la lista.
+    """
+    if island_params is None:
+        return []
+    if not isinstance(island_params, (list, tuple)):
+        raise ValueError("island_params debe ser una lista de objetos.")
+    for i, params in enumerate(island_params):
+        if not isinstance(params, dict):
+            raise ValueError(f"island_params[{i}] no es un objeto.")
+        unknown = sorted(set(params) - set(ISLAND_PARAMS))
+        if unknown:
+            raise ValueError(f"island_params[{i}]: llaves no permitidas {unknown}; "
+                             f"sólo {list(ISLAND_PARAMS)}.")
+    return list(island_params)
+
+
+def route_migrants(emigrants, topology):
+    """
+    Reparte los emigrantes de cada isla. "ring": la isla i recibe de la
+    i - 1; "all": cada isla recibe de todas las demás.
+    """
+    n = len(emigrants)
+    if n < 2:
+        return [[] for _ in range(n)]
+    if topology == "ring":
+        return [list(emigrants[i - 1]) for i in range(n)]
+    return [[ind for j in range(n) if j != i for ind in emigrants[j]] for i in range(n)]
+
+
+def _island_worker(conn, config):
+    """
+    Proceso de una isla: la población vive aquí toda la corrida y por el
+    pipe sólo viajan los migrantes, las estadísticas y el resultado final.
+    """
+    try:
+        island = GAIsland(**config)
+    except Exception as e:
+        conn.send(("error", repr(e)))
+        return
+    conn.send(("ready", None))
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        try:
+            if msg[0] == "evolve":
+                _, generations, migrants, count, time_left = msg
+                island.receive(migrants)
+                island.evolve(generations, time_left = time_left)
+                reply = (island.emigrants(count), island.stats())
+            else:
+                reply = island.result()
+        except Exception as e:
+            conn.send(("error", repr(e)))
+            break
+        conn.send(("ok", reply))
+    conn.close()
+
+
+class _Archipelago:
+    """
+    Las islas de una corrida: en serie dentro de este proceso o una por
+    proceso, conectadas por pipes. Cada isla tiene su propia semilla, así
+    que el resultado es el mismo con ambos modos.
+    """
+
+    def __init__(self, executor, configs):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor debe ser uno de {EXECUTORS}, no {executor!r}")
+        self.executor = executor
+        self.islands = []
+        self.conns = []
+        self.procs = []
+
+        if executor == "serial":
+            self.islands = [GAIsland(**config) for config in configs]
+            return
+
+        ctx = mp.get_context()
+        for config in configs:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target = _island_worker, args = (child, config), daemon = True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+        try:
+            self._gather()
+        except Exception:
+            self.close()
+            raise
+
+    def _gather(self):
+        replies = []
+        for i, conn in enumerate(self.conns):
+            try:
+                status, payload = conn.recv()
+            except EOFError:
+                raise RuntimeError(f"La isla {i} terminó inesperadamente") from None
+            if status == "error":
+                raise RuntimeError(f"Error en la isla {i}: {payload}")
+            replies.append(payload)
+        return replies
+
+    def evolve(self, generations, inbox, count, time_left = None):
+        """
+        Avanza todas las islas; regresa [(emigrantes, estadísticas), ...].
+        Con `time_left` (segundos) cada isla para antes si se le acaba el
+        tiempo; en serie las islas se reparten lo que queda.
+        """
+        if self.executor == "serial":
+            replies = []
+            deadline = None if time_left is None else time.perf_counter() + time_left
+            for k, (island, migrants) in enumerate(zip(self.islands, inbox)):
+                share = None
+                if deadline is not None:
+                    share = max(0.0, deadline - time.perf_counter()) / (len(self.islands) - k)
+                island.receive(migrants)
+                island.evolve(generations, time_left = share)
+                replies.append((island.emigrants(count), island.stats()))
+            return replies
+        for conn, migrants in zip(self.conns, inbox):
+            conn.send(("evolve", generations, migrants, count, time_left))
+        return self._gather()
+
+    def results(self):
+        if self.executor == "serial":
+            return [island.result() for island in self.islands]
+        for conn in self.conns:
+            conn.send(("result",))
+        return self._gather()
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        for proc in self.procs:
+            proc.join(timeout = 1)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self.conns:
+            conn.close()
+        self.conns, self.procs = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def GA_islands(distance_matrix, demands, vehicles, islands = 4,
+               pop_size = 80, generations = 300,
+               prob_crossover = 0.9, prob_mutation = 0.2, penalty = 10000,
+               migration_interval = 20, migrants = 2, topology = "ring",
+               island_params = None, executor = "processes", seed = None,
+               local_search = False, seeds = None, observers = None,
+               crossover_op = "ox", mutation_op = "swap", selection = "elite",
+               termination = None):
+    """
+    Modelo de islas del GA multi-vehículo: `islands` poblaciones
+    independientes (una por proceso con executor="processes") que cada
+    `migration_interval` generaciones mandan sus `migrants` mejores
+    individuos a sus vecinas según `topology` ("ring" o "all").
+
+    `island_params` es una lista opcional de dicts por isla que sólo puede
+    variar las llaves de ISLAND_PARAMS (p. ej. `prob_crossover` o
+    `prob_mutation`). Cada isla recibe una semilla derivada de `seed`
+    salvo que su dict la fije.
+
+    `termination` se revisa después de cada bloque de migración con el
+    mejor costo de todas las islas (el bloque cuenta como sus generaciones).
+    Su `time_limit` además llega a las islas, que lo revisan generación por
+    generación, así que un bloque no se pasa del presupuesto.
+
+    Regresa la mejor solución global con la forma de `GA_multi_vehicle` más
+    "Islands": estadísticas finales de cada isla (y "Termination" si se dio).
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"topology debe ser uno de {TOPOLOGIES}, no {topology!r}")
+    islands = max(1, int(islands))
+    migration_interval = max(1, int(migration_interval))
+    island_params = check_island_params(island_params)
+
+    island_seeds = np.random.SeedSequence(seed).spawn(islands)
+    configs = []
+    for i in range(islands):
+        config = dict(distance_matrix = distance_matrix, demands = demands,
+                      vehicles = vehicles, pop_size = pop_size,
+                      prob_crossover = prob_crossover, prob_mutation = prob_mutation,
+                      penalty = penalty, local_search = local_search, seeds = seeds,
+                      crossover_op = crossover_op, mutation_op = mutation_op,
+                      selection = selection,
+                      seed = int(island_seeds[i].generate_state(1)[0]))
+        if i < len(island_params):
+            config.update(island_params[i])
+        configs.append(config)
+
+    termination = Termination.coerce(termination)
+    if termination is not None:
+        termination.start(generations)
+    telemetry = Telemetry("GA_islands", observers)
+    telemetry.start(nodes = len(demands), iterations = generations, pop_size = pop_size,
+                    vehicles = len(vehicles), islands = islands, topology = topology,
+                    executor = executor)
+
+    with _Archipelago(executor, configs) as archipelago:
+        done = 0
+        inbox = [[] for _ in range(islands)]
+        while done < generations:
+            step = min(migration_interval, generations - done)
+            time_left = termination.remaining() if termination is not None else None
+            replies = archipelago.evolve(step, inbox, migrants, time_left)
+            # Una isla que se quedó sin tiempo corre menos generaciones del bloque
+            ran = max(s["generation"] for _, s in replies) - done
+            done += ran
+            inbox = route_migrants([emigrants for emigrants, _ in replies], topology)
+
+            stats = [s for _, s in replies]
+            leader = min(stats, key = lambda s: s["best_cost"])
+            if telemetry.active:
+                telemetry.iteration(
+                    iteration = done, iterations = generations,
+                    best_cost = leader["best_cost"],
+                    iteration_best = min(s["iteration_best"] for s in stats),
+                    mean_cost = float(np.mean([s["mean_cost"] for s in stats])),
+                    diversity = float(np.mean([s["diversity"] for s in stats])),
+                    islands = [{k: v for k, v in s.items() if k != "best_routes"}
+                               for s in stats],
+                    best_solution = leader["best_routes"]
+                )
+            if termination is not None:
+                stop = termination.should_stop(leader["best_cost"], ran)
+                if ran < step:
+                    termination.reason = termination.reason or "time_limit"
+                if stop or ran < step:
+                    break
+
+        results = archipelago.results()
+
+    best = min(range(islands), key = lambda i: results[i]["Cost"])
+    best_solution = dict(results[best])
+    best_solution["Islands"] = [
+        {"island": i, "seed": configs[i]["seed"],
+         "prob_crossover": configs[i]["prob_crossover"],
+         "prob_mutation": configs[i]["prob_mutation"],
+         "best_cost": r["Cost"], "best_time": r["Time"]}
+        for i, r in enumerate(results)
+    ]
+
+    if termination is not None:
+        best_solution["Termination"] = termination.summary()
+
+    telemetry.finish(best_cost = best_solution["Cost"], best_time = best_solution["Time"],
+                     best_solution = best_solution["Routes"], best_island = best)
+    return best_solution
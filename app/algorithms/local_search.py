@@ -0,0 +1,242 @@
+# app/algorithms/local_search.py
+from collections import deque
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Búsqueda local (2-opt / Or-opt / relocate)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+MOVES = ("2opt", "oropt", "relocate", "exchange")
+
+
+def nearest_neighbors(distance_matrix, k, depot = 0):
+    """
+    Lista de candidatos: los `k` vecinos más cercanos de cada nodo, ordenados
+    por distancia. El depósito y el propio nodo nunca son candidatos.
+    """
+    d = np.array(distance_matrix, dtype = float)
+    n = len(d)
+    np.fill_diagonal(d, np.inf)
+    d[:, depot] = np.inf
+    k = max(1, min(int(k), n - 2))
+
+    nearest = np.argpartition(d, k - 1, axis = 1)[:, :k]
+    order = np.argsort(np.take_along_axis(d, nearest, axis = 1), axis = 1)
+    return np.take_along_axis(nearest, order, axis = 1)
+
+def route_cost(route, distance_matrix, depot = 0):
+    """Costo de una ruta cerrada: depósito → clientes → depósito."""
+    if len(route) == 0:
+        return 0.0
+    nodes = np.concatenate(([depot], np.asarray(route, dtype = int), [depot]))
+    return float(distance_matrix[nodes[:-1], nodes[1:]].sum())
+
+def solution_cost(routes, distance_matrix, depot = 0):
+    return sum(route_cost(r, distance_matrix, depot) for r in routes.values())
+
+
+class _Routes:
+    """
+    Rutas con el depósito en ambos extremos, posición de cada nodo, carga por
+    ruta y sumas prefijo de costo en ambos sentidos (para evaluar en O(1) la
+    inversión de un segmento aunque la matriz no sea simétrica).
+    """
+
+    def __init__(self, routes, d, demands, capacities, depot):
+        self.names = list(routes)
+        self.d = d
+        self.depot = depot
+        self.demands = demands
+        self.r = [[depot] + [int(x) for x in routes[v]] + [depot] for v in self.names]
+        self.cap = [float("inf") if capacities is None else float(capacities[v])
+                    for v in self.names]
+        self.load = [0.0] * len(self.r)
+        self.fwd = [None] * len(self.r)
+        self.bwd = [None] * len(self.r)
+        self.where = {}
+        for ri in range(len(self.r)):
+            self.reindex(ri)
+
+    def reindex(self, ri):
+        route = self.r[ri]
+        for p in range(1, len(route) - 1):
+            self.where[route[p]] = (ri, p)
+        nodes = np.asarray(route, dtype = int)
+        if self.demands is not None:
+            self.load[ri] = float(self.demands[nodes[1:-1]].sum())
+        self.fwd[ri] = np.concatenate(([0.0], np.cumsum(self.d[nodes[:-1], nodes[1:]])))
+        self.bwd[ri] = np.concatenate(([0.0], np.cumsum(self.d[nodes[1:], nodes[:-1]])))
+
+    def seg_cost(self, ri, p, q):
+        """Costo interno del segmento r[p..q] hacia adelante y en reversa."""
+        return (self.fwd[ri][q] - self.fwd[ri][p],
+                self.bwd[ri][q] - self.bwd[ri][p])
+
+    def fits(self, ri, extra):
+        return self.demands is None or self.load[ri] + extra <= self.cap[ri] + 1e-9
+
+    def to_dict(self):
+        return {v: self.r[ri][1:-1] for ri, v in enumerate(self.names)}
+
+
+def _try_two_opt(st, ri, p, q):
+    """Invierte r[p+1..q]. Regresa (delta, aplicar)."""
+    A = st.r[ri]
+    if q <= p + 1 or q >= len(A) - 1:
+        return None
+    d = st.d
+    fwd, bwd = st.seg_cost(ri, p + 1, q)
+    delta = (d[A[p], A[q]] + d[A[p + 1], A[q + 1]]
+             - d[A[p], A[p + 1]] - d[A[q], A[q + 1]] + bwd - fwd)
+
+    def apply():
+        A[p + 1:q + 1] = A[p + 1:q + 1][::-1]
+        return [ri], [A[p], A[p + 1], A[q], A[q + 1]]
+    return delta, apply
+
+def _try_move_segment(st, ri, i, length, rj, j, after, reverse):
+    """Mueve r_i[i..i+length-1] junto a r_j[j] (antes o después)."""
+    A, B = st.r[ri], st.r[rj]
+    last = i + length - 1
+    if last >= len(A) - 1:
+        return None
+    if ri == rj and i <= j <= last:
+        return None
+    # arista (x, y) de B donde se inserta el segmento
+    x, y = (B[j], B[j + 1]) if after else (B[j - 1], B[j])
+    if ri == rj and (x == A[last] or y == A[i]):
+        return None
+
+    seg_demand = 0.0
+    if ri != rj and st.demands is not None:
+        seg_demand = float(st.demands[A[i:last + 1]].sum())
+        if not st.fits(rj, seg_demand):
+            return None
+
+    d = st.d
+    s0, s1 = A[i], A[last]
+    fwd, bwd = st.seg_cost(ri, i, last)
+    prev, nxt = A[i - 1], A[last + 1]
+    # Si la ruta se queda vacía no hay arista depósito → depósito
+    closing = 0.0 if prev == nxt == st.depot else d[prev, nxt]
+    removed = d[prev, s0] + d[s1, nxt] - closing
+    if reverse:
+        added = d[x, s1] + d[s0, y] - d[x, y] + bwd - fwd
+    else:
+        added = d[x, s0] + d[s1, y] - d[x, y]
+    delta = added - removed
+
+    def apply():
+        seg = A[i:last + 1]
+        if reverse:
+            seg = seg[::-1]
+        del A[i:last + 1]
+        k = B.index(x) + 1 if ri == rj else (j + 1 if after else j)
+        B[k:k] = seg
+        touched = [ri] if ri == rj else [ri, rj]
+        return touched, [A[i - 1], A[i] if i < len(A) else st.depot, x, y, s0, s1]
+    return delta, apply
+
+def _try_exchange(st, ri, i, rj, j):
+    A, B = st.r[ri], st.r[rj]
+    if ri == rj:
+        return None
+    u, v = A[i], B[j]
+    if st.demands is not None:
+        du, dv = st.demands[u], st.demands[v]
+        if not (st.fits(ri, dv - du) and st.fits(rj, du - dv)):
+            return None
+    d = st.d
+    delta = (d[A[i - 1], v] + d[v, A[i + 1]] - d[A[i - 1], u] - d[u, A[i + 1]]
+             + d[B[j - 1], u] + d[u, B[j + 1]] - d[B[j - 1], v] - d[v, B[j + 1]])
+
+    def apply():
+        A[i], B[j] = v, u
+        return [ri, rj], [A[i - 1], A[i + 1], B[j - 1], B[j + 1], u, v]
+    return delta, apply
+
+def _candidate_moves(st, u, v, moves):
+    ri, i = st.where[u]
+    rj, j = st.where[v]
+
+    if "2opt" in moves and ri == rj:
+        yield _try_two_opt(st, ri, i, j) if i < j else _try_two_opt(st, ri, j, i)
+    if "relocate" in moves:
+        yield _try_move_segment(st, ri, i, 1, rj, j, True, False)
+        yield _try_move_segment(st, ri, i, 1, rj, j, False, False)
+    if "oropt" in moves:
+        for length in (2, 3):
+            for reverse in (False, True):
+                yield _try_move_segment(st, ri, i, length, rj, j, True, reverse)
+    if "exchange" in moves:
+        yield _try_exchange(st, ri, i, rj, j)
+
+def local_search(routes, distance_matrix, demands = None, capacities = None,
+                 depot = 0, neighbors = None, k = 10, moves = MOVES,
+                 feasible = None, max_moves = 10000, eps = 1e-9):
+    """
+    Mejora un dict {vehículo: [clientes]} con 2-opt, Or-opt (segmentos de 2
+    y 3, también invertidos), relocate y exchange entre rutas.
+
+    Cada movimiento se evalúa en O(1) con costos delta. Sólo se prueban los
+    movimientos que acercan un nodo a uno de sus `k` vecinos más cercanos, y
+    los bits "don't look" evitan revisar nodos cuyo entorno no ha cambiado.
+    `feasible(vehiculo, ruta)` puede rechazar movimientos que mejoran la
+    distancia pero violan otras restricciones (p. ej. ventanas de tiempo).
+
+    Regresa (rutas_nuevas, mejora_total).
+    """
+    d = np.asarray(distance_matrix, dtype = float)
+    if demands is not None:
+        demands = np.asarray(demands, dtype = float)
+    if neighbors is None:
+        neighbors = nearest_neighbors(d, k, depot)
+
+    st = _Routes(routes, d, demands, capacities, depot)
+    queue = deque(st.where)
+    queued = set(queue)
+    improvement = 0.0
+    applied = 0
+
+    while queue and applied < max_moves:
+        u = queue.popleft()
+        queued.discard(u)
+        if u not in st.where:
+            continue
+
+        improved = False
+        for v in neighbors[u]:
+            v = int(v)
+            if v not in st.where or v == u:
+                continue
+            for move in _candidate_moves(st, u, v, moves):
+                if move is None or move[0] >= -eps:
+                    continue
+                delta, apply = move
+                # Todo movimiento toca sólo las rutas de u y v: se respaldan
+                # ésas, y sólo si `feasible` puede pedir deshacerlo
+                backup = None
+                if feasible is not None:
+                    backup = {t: list(st.r[t]) for t in (st.where[u][0], st.where[v][0])}
+                touched, endpoints = apply()
+                if backup is not None and not all(
+                        feasible(st.names[t], st.r[t][1:-1]) for t in touched):
+                    for t, route in backup.items():
+                        st.r[t][:] = route
+                    continue
+                for t in touched:
+                    st.reindex(t)
+                improvement -= delta
+                applied += 1
+                for w in endpoints + [u, v]:
+                    if w != depot and w not in queued:
+                        queue.append(w)
+                        queued.add(w)
+                improved = True
+                break
+            if improved:
+                break
+
+    return st.to_dict(), improvement
@@ -0,0 +1,238 @@
+# app/algorithms/road_providers.py
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Proveedores de distancias por carretera
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+ORS_BASE_URL = "https://api.openrouteservice.org"
+
+
+class RoadProvider:
+    """
+    Interfaz común: `matrix(coords, sources, destinations)` regresa dos
+    arreglos (len(sources) × len(destinations)) con distancia en km y
+    duración en horas. `coords` es una lista de (lon, lat).
+    """
+
+    def matrix(self, coords, sources = None, destinations = None):
+        raise NotImplementedError
+
+
+def _haversine_km(lon_a, lat_a, lon_b, lat_b):
+    lat_a, lat_b = np.radians(lat_a), np.radians(lat_b)
+    dlat = lat_b - lat_a
+    dlon = np.radians(lon_b) - np.radians(lon_a)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin(dlon / 2) ** 2
+    return 2 * 6371.0088 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class HaversineProvider(RoadProvider):
+    """Aproximación local: haversine por un factor de rodeo y velocidad fija."""
+
+    def __init__(self, detour_factor = 1.3, speed_kmh = 30.0):
+        self.detour_factor = detour_factor
+        self.speed_kmh = speed_kmh
+
+    def matrix(self, coords, sources = None, destinations = None):
+        coords = np.asarray(coords, dtype = float).reshape(-1, 2)
+        sources = np.arange(len(coords)) if sources is None else np.asarray(sources, dtype = int)
+        destinations = (np.arange(len(coords)) if destinations is None
+                        else np.asarray(destinations, dtype = int))
+        src, dst = coords[sources], coords[destinations]
+        dist = self.detour_factor * _haversine_km(src[:, None, 0], src[:, None, 1],
+                                                  dst[None, :, 0], dst[None, :, 1])
+        return dist, dist / self.speed_kmh
+
+
+class ORSMatrixProvider(RoadProvider):
+    """
+    Cliente del endpoint de matrices de OpenRouteService.
+
+    Parte la matriz en bloques que respetan `max_elements` (orígenes ×
+    destinos por petición), los pide en paralelo con una sola sesión HTTP
+    (conexiones reutilizadas) y reintenta con espera exponencial ante 429 y
+    errores 5xx. La llave se toma de `ORS_API_KEY` si no se pasa.
+    """
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_key = None, base_url = ORS_BASE_URL, profile = "driving-car",
+                 max_elements = 3500, max_locations = None, workers = 4,
+                 retries = 5, backoff = 0.5, timeout = 30, session = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.api_key = api_key or os.environ.get("ORS_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.profile = profile
+        self.max_elements = max_elements
+        self.max_locations = max_locations
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.requests_made = 0
+        self._count_lock = threading.Lock()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections = workers, pool_maxsize = workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        if self.api_key:
+            self.session.headers["Authorization"] = self.api_key
+
+    def _blocks(self, sources, destinations):
+        n_src, n_dst = len(sources), len(destinations)
+        side = max(1, int(np.sqrt(self.max_elements)))
+        if n_src * n_dst <= self.max_elements:
+            src_size, dst_size = n_src, n_dst
+        elif n_src <= side:
+            src_size, dst_size = n_src, self.max_elements // n_src
+        elif n_dst <= side:
+            src_size, dst_size = self.max_elements // n_dst, n_dst
+        else:
+            src_size = dst_size = side
+        if self.max_locations:
+            src_size = min(src_size, self.max_locations)
+            dst_size = min(dst_size, self.max_locations)
+
+        for a in range(0, n_src, max(1, src_size)):
+            for b in range(0, n_dst, max(1, dst_size)):
+                yield sources[a:a + src_size], destinations[b:b + dst_size]
+
+    def _post(self, payload):
+        url = f"{self.base_url}/v2/matrix/{self.profile}"
+        for attempt in range(self.retries + 1):
+            with self._count_lock:
+                self.requests_made += 1
+            try:
+                resp = self.session.post(url, json = payload, timeout = self.timeout)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if resp.status_code in self.RETRY_STATUS and attempt < self.retries:
+                wait = resp.headers.get("Retry-After")
+                time.sleep(float(wait) if wait else self.backoff * 2 ** attempt)
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    def _fetch_block(self, coords, src, dst):
+        # Sólo se mandan las ubicaciones del bloque
+        locations = list(dict.fromkeys(list(src) + list(dst)))
+        local = {node: k for k, node in enumerate(locations)}
+        data = self._post({
+            "locations": [list(coords[i]) for i in locations],
+            "sources": [local[i] for i in src],
+            "destinations": [local[i] for i in dst],
+            "metrics": ["distance", "duration"],
+            "units": "km",
+        })
+        dist = np.array(data["distances"], dtype = float)
+        dur = np.array(data["durations"], dtype = float) / 3600
+        return dist, dur
+
+    def matrix(self, coords, sources = None, destinations = None):
+        coords = [(float(lon), float(lat)) for lon, lat in coords]
+        sources = list(range(len(coords))) if sources is None else [int(i) for i in sources]
+        destinations = (list(range(len(coords))) if destinations is None
+                        else [int(i) for i in destinations])
+        row = {node: k for k, node in enumerate(sources)}
+        col = {node: k for k, node in enumerate(destinations)}
+
+        dist = np.full((len(sources), len(destinations)), np.nan)
+        dur = np.full_like(dist, np.nan)
+        blocks = list(self._blocks(sources, destinations))
+
+        with ThreadPoolExecutor(max_workers = self.workers) as pool:
+            futures = [(src, dst, pool.submit(self._fetch_block, coords, src, dst))
+                       for src, dst in blocks]
+            for src, dst, future in futures:
+                block_dist, block_dur = future.result()
+                rows = [row[i] for i in src]
+                cols = [col[j] for j in dst]
+                dist[np.ix_(rows, cols)] = block_dist
+                dur[np.ix_(rows, cols)] = block_dur
+
+        return dist, dur
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Servidor local de prueba ✦ ୨୧‿︵‿︵‿︵ ˚₊
+class LocalMatrixServer:
+    """
+    Servidor HTTP mínimo con la misma forma que `/v2/matrix/<perfil>` de
+    ORS, que responde con haversine escalado. Sirve para probar y medir el
+    pipeline sin red:
+
+        with LocalMatrixServer() as server:
+            provider = ORSMatrixProvider(base_url = server.url)
+    """
+
+    def __init__(self, host = "127.0.0.1", port = 0, detour_factor = 1.3,
+                 speed_kmh = 30.0, max_elements = 3500, latency = 0.0):
+        stand_in = HaversineProvider(detour_factor, speed_kmh)
+        self.requests_served = 0
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                locations = body["locations"]
+                sources = body.get("sources", list(range(len(locations))))
+                destinations = body.get("destinations", list(range(len(locations))))
+                if len(sources) * len(destinations) > max_elements:
+                    self._reply(413, {"error": "too many elements"})
+                    return
+                if latency:
+                    time.sleep(latency)
+                dist, dur = stand_in.matrix(locations, sources, destinations)
+                owner.requests_served += 1
+                self._reply(200, {"distances": dist.tolist(),
+                                  "durations": (dur * 3600).tolist()})
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target = self.httpd.serve_forever, daemon = True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,177 @@
+# app/algorithms/route_solution.py
+import weakref
+from collections.abc import Mapping
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#   Solución compacta: tour gigante + cortes por vehículo
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+class RouteSolution(Mapping):
+    """
+    Rutas de todos los vehículos en un solo arreglo int32 (`nodes`, las
+    rutas concatenadas en orden de vehículo) más `offsets` (V + 1 cortes):
+    la ruta del vehículo k es nodes[offsets[k]:offsets[k + 1]].
+
+    Se comporta como un dict de sólo lectura {vehículo: arreglo de nodos},
+    así que el código que recorre `routes.items()` sigue funcionando. La
+    solución no se modifica después de construirse.
+
+    `cost` es la distancia con depósito sobre la matriz del solver que la
+    produjo (None si no se evaluó); todos los solvers la fijan con
+    `evaluate()`, sin penalizaciones. `distance()` guarda cada resultado
+    junto con la matriz usada, así que pedirla otra vez con la misma
+    matriz es O(1); por eso la matriz no debe modificarse en el sitio.
+    """
+
+    __slots__ = ("nodes", "offsets", "names", "cost", "_distances")
+
+    def __init__(self, nodes, offsets, names, cost = None):
+        self.nodes = np.asarray(nodes, dtype = np.int32)
+        self.offsets = np.asarray(offsets, dtype = np.int32)
+        self.names = tuple(names)
+        self.cost = cost
+        self._distances = {}
+        if len(self.offsets) != len(self.names) + 1:
+            raise ValueError(f"offsets debe tener {len(self.names) + 1} cortes, "
+                             f"no {len(self.offsets)}")
+
+    @classmethod
+    def from_routes(cls, routes, names = None):
+        """Desde {vehículo: [nodos]}; con `names` los vehículos que falten quedan vacíos."""
+        if isinstance(routes, cls) and (names is None or tuple(names) == routes.names):
+            return routes
+        names = list(routes) if names is None else list(names)
+        parts = [np.asarray(routes.get(v, ()), dtype = np.int32).ravel() for v in names]
+        offsets = np.zeros(len(names) + 1, dtype = np.int32)
+        np.cumsum([len(p) for p in parts], out = offsets[1:])
+        nodes = np.concatenate(parts) if parts else np.empty(0, dtype = np.int32)
+        return cls(nodes, offsets, names)
+
+    @classmethod
+    def from_labels(cls, individuo, labels, names):
+        """
+        Desde un cromosoma y la etiqueta de vehículo de cada posición (ver
+        `split_routes`); las posiciones con -1 no se incluyen.
+        """
+        names = tuple(names)
+        individuo = np.asarray(individuo)
+        labels = np.asarray(labels)
+        kept = labels >= 0
+        kept_labels = labels[kept]
+        order = np.argsort(kept_labels, kind = "stable")
+        offsets = np.zeros(len(names) + 1, dtype = np.int32)
+        np.cumsum(np.bincount(kept_labels, minlength = len(names))[:len(names)],
+                  out = offsets[1:])
+        return cls(individuo[kept][order], offsets, names)
+
+    # --- Interfaz de dict ---
+    def __getitem__(self, name):
+        try:
+            k = self.names.index(name)
+        except ValueError:
+            raise KeyError(name) from None
+        return self.route(k)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __eq__(self, other):
+        if not isinstance(other, RouteSolution):
+            return NotImplemented
+        return (self.names == other.names
+                and np.array_equal(self.offsets, other.offsets)
+                and np.array_equal(self.nodes, other.nodes))
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # El caché de distancias guarda referencias débiles: no viaja entre procesos
+        return (RouteSolution, (self.nodes, self.offsets, self.names, self.cost))
+
+    def __setstate__(self, state):
+        # Pickles guardados antes del caché (p. ej. en solution_cache): sólo traen los slots
+        _, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self._distances = {}
+
+    def __repr__(self):
+        return f"RouteSolution({self.to_dict()})"
+
+    # --- Acceso ---
+    def route(self, k):
+        """Ruta del k-ésimo vehículo (vista, sin copia)."""
+        return self.nodes[self.offsets[k]:self.offsets[k + 1]]
+
+    @property
+    def size(self):
+        """Clientes atendidos."""
+        return len(self.nodes)
+
+    def key(self):
+        """Bytes que identifican la solución (para contar soluciones distintas)."""
+        return self.offsets.tobytes() + self.nodes.tobytes()
+
+    def copy(self):
+        solution = RouteSolution(self.nodes.copy(), self.offsets.copy(), self.names, self.cost)
+        solution._distances = dict(self._distances)
+        return solution
+
+    def to_dict(self):
+        """{vehículo: [nodos]} con enteros de Python, listo para JSON."""
+        flat = self.nodes.tolist()
+        cuts = self.offsets.tolist()
+        return {v: flat[cuts[k]:cuts[k + 1]] for k, v in enumerate(self.names)}
+
+    # --- Costos ---
+    def edges(self, include_depot = False, depot = 0):
+        """Arreglos (origen, destino) de todos los arcos de las rutas."""
+        n = len(self.nodes)
+        inner = np.ones(max(n - 1, 0), dtype = bool)
+        starts = self.offsets[1:-1]
+        inner[starts[(starts > 0) & (starts < n)] - 1] = False
+        a, b = self.nodes[:-1][inner], self.nodes[1:][inner]
+        if not include_depot:
+            return a, b
+
+        nonempty = self.offsets[1:] > self.offsets[:-1]
+        firsts = self.nodes[self.offsets[:-1][nonempty]]
+        lasts = self.nodes[self.offsets[1:][nonempty] - 1]
+        depots = np.full(len(firsts), depot, dtype = np.int32)
+        return np.concatenate((depots, a, lasts)), np.concatenate((firsts, b, depots))
+
+    def distance(self, distance_matrix, include_depot = False, depot = 0):
+        """Distancia total de las rutas; con la misma matriz se reutiliza el resultado."""
+        key = (bool(include_depot), depot)
+        cached = self._distances.get(key)
+        if cached is not None and cached[0]() is distance_matrix:
+            return cached[1]
+        a, b = self.edges(include_depot, depot)
+        value = float(np.asarray(distance_matrix)[a, b].sum())
+        try:
+            self._distances[key] = (weakref.ref(distance_matrix), value)
+        except TypeError:  # listas anidadas: no admiten weakref y no se guardan
+            pass
+        return value
+
+    def evaluate(self, distance_matrix, depot = 0):
+        """Fija `cost` con la distancia con depósito sobre `distance_matrix`."""
+        self.cost = self.distance(distance_matrix, include_depot = True, depot = depot)
+        return self.cost
+
+
+def json_default(obj):
+    """`default` para json.dumps: soluciones y tipos de NumPy sin recorrerlos a mano."""
+    if isinstance(obj, RouteSolution):
+        return obj.to_dict()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
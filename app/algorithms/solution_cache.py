@@ -0,0 +1,119 @@
+# app/algorithms/solution_cache.py
+import os
+import json
+import pickle
+import hashlib
+import threading
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Caché en disco de soluciones por problema
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+CACHE_DIR = os.path.join("app", "data", "solution_cache")
+
+
+def fingerprint(*parts):
+    """Hash estable de arreglos, listas, dicts y escalares."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            arr = np.ascontiguousarray(part, dtype = float)
+            h.update(repr(arr.shape).encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(json.dumps(part, sort_keys = True, default = _plain).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+def _plain(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+class SolutionCache:
+    """
+    Una entrada por (solver, problema). La llave del problema es el hash de
+    los nodos, la submatriz de distancias, demandas, vehículos, experiencia y
+    ventanas de tiempo; la entrada guarda además el hash de los parámetros
+    del solver, la mejor solución y el estado para arrancar en caliente
+    (feromonas de ACO o élite del GA).
+
+    `lookup` regresa ("hit", entrada) si también coinciden los parámetros,
+    ("warm", entrada) si sólo coincide el problema y ("miss", None) si no
+    hay nada. Se desalojan primero las entradas usadas hace más tiempo
+    (mtime del archivo) cuando se pasa de `max_entries` o `max_bytes`.
+    """
+
+    def __init__(self, path = CACHE_DIR, max_entries = 200, max_bytes = 256 * 1024 ** 2):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _file(self, kind, problem_key):
+        return os.path.join(self.path, f"{kind}-{problem_key}.pkl")
+
+    def lookup(self, kind, problem_key, params_key):
+        path = self._file(kind, problem_key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    entry = pickle.load(f)
+                os.utime(path)  # marca de uso reciente para el LRU
+            except (OSError, EOFError, pickle.UnpicklingError):
+                return "miss", None
+        return ("hit" if entry["params_key"] == params_key else "warm"), entry
+
+    def store(self, kind, problem_key, params_key, solution, **state):
+        entry = dict(state, kind = kind, params_key = params_key, solution = solution)
+        path = self._file(kind, problem_key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            os.makedirs(self.path, exist_ok = True)
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._evict()
+
+    def _evict(self):
+        files = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".pkl"):
+                continue
+            full = os.path.join(self.path, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, full))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        while files and (len(files) > self.max_entries or total > self.max_bytes):
+            _, size, full = files.pop(0)
+            try:
+                os.remove(full)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            if os.path.isdir(self.path):
+                for name in os.listdir(self.path):
+                    if name.endswith(".pkl"):
+                        os.remove(os.path.join(self.path, name))
+
+
+_cache = None
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = SolutionCache()
+    return _cache
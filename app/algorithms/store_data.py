@@ -0,0 +1,171 @@
+# app/algorithms/store_data.py
+import os
+import threading
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#        Datos de las tiendas (data.xlsx)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+# pandas se importa dentro de las funciones: importar el módulo no lo carga,
+# sólo la primera lectura de tiendas (o la precarga de create_app)
+
+DATA_XLSX = os.path.join("app", "data", "data.xlsx")
+
+ZONE_ALIASES = {
+    "amarillo": "zona amarillo",
+    "amarilla": "zona amarillo",
+    "café": "zona cafe",
+    "cafe": "zona cafe",
+    "gris": "zona gris",
+    "rojo": "zona roja",
+    "roja": "zona roja",
+    "rosa": "zona rosa",
+    "verde": "zona verde",
+    "azul": "zona azul",
+    "origen": "zona origen",
+}
+
+ZONE_COLORS = {
+    "zona amarillo": "yellow",
+    "zona cafe": "brown",
+    "zona gris": "gray",
+    "zona roja": "red",
+    "zona rosa": "pink",
+    "zona verde": "green",
+    "zona azul": "blue",
+    "zona origen": "black",
+}
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _to_hours(values):
+    """Convierte horas de Excel (time, texto 'HH:MM:SS' o número) a horas decimales."""
+    import pandas as pd
+
+    def convert(v):
+        if pd.isna(v):
+            return np.nan
+        if isinstance(v, (int, float, np.number)):
+            return float(v)
+        if hasattr(v, "hour"):
+            return v.hour + v.minute / 60 + v.second / 3600
+        parts = [float(p) for p in str(v).split(":")]
+        return sum(p / 60 ** k for k, p in enumerate(parts))
+    return values.map(convert).astype(float)
+
+def normalize_stores(df):
+    """
+    Columnas en minúsculas y sin espacios, zona normalizada y columnas
+    estándar `lat`, `lon`, `nombre_key`, `hora_apertura` y `hora_cierre`.
+    """
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+
+    lat_col = next((c for c in df.columns if "lat" in c), None)
+    lon_col = next((c for c in df.columns if "lon" in c), None)
+    df["lat"] = df[lat_col].astype(float)
+    df["lon"] = df[lon_col].astype(float)
+
+    df["zona"] = df["zona"].astype(str).str.strip().str.lower()
+    if "nombre" not in df.columns:
+        name_col = next((c for c in df.columns if "direccion" in c or "address" in c), None)
+        df["nombre"] = df[name_col] if name_col else [f"Punto {i}" for i in range(len(df))]
+    df["nombre"] = df["nombre"].astype(str).str.strip()
+    df["nombre_key"] = df["nombre"].str.lower()
+
+    if "horaapertura" in df.columns:
+        df["hora_apertura"] = _to_hours(df["horaapertura"])
+    if "horacierre" in df.columns:
+        df["hora_cierre"] = _to_hours(df["horacierre"])
+
+    return df
+
+def _snapshot_path(path):
+    base, _ = os.path.splitext(path)
+    return base + ".snapshot.pkl"
+
+def _read_snapshot(path, snapshot_path):
+    if not os.path.exists(snapshot_path):
+        return None
+    if os.path.getmtime(snapshot_path) < os.path.getmtime(path):
+        return None
+    try:
+        import pandas as pd
+        return pd.read_pickle(snapshot_path)
+    except Exception:
+        return None
+
+def _write_snapshot(df, snapshot_path):
+    try:
+        tmp_path = snapshot_path + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:
+        print("⚠️ No se pudo guardar el snapshot de tiendas:", e)
+
+def load_stores(path = DATA_XLSX, snapshot = True):
+    """
+    Regresa el DataFrame normalizado de tiendas. Se parsea una sola vez por
+    proceso y se vuelve a leer cuando cambia el mtime del archivo. Con
+    `snapshot` se guarda una copia binaria para arranques en frío rápidos.
+
+    El DataFrame es compartido: no modificarlo en el sitio.
+    """
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        snapshot_path = _snapshot_path(path)
+        df = _read_snapshot(path, snapshot_path) if snapshot else None
+        if df is None:
+            import pandas as pd
+            df = normalize_stores(pd.read_excel(path))
+            if snapshot:
+                _write_snapshot(df, snapshot_path)
+
+        _cache[path] = (mtime, df)
+        return df
+
+def resolve_zones(zones):
+    """Nombres de zona de la interfaz ('rojo', 'café', ...) a su valor en `zona`."""
+    return [ZONE_ALIASES.get(z.strip().lower(), z.strip().lower()) for z in zones]
+
+def select_indices(zones = (), stores = (), df = None):
+    """
+    Índices globales (filas de data.xlsx = filas de total_distances.csv) de
+    las tiendas de `zones` más las nombradas en `stores`, con el depósito
+    ("zona origen") primero. Lista vacía si no hay ningún punto.
+    """
+    import pandas as pd
+
+    df = load_stores() if df is None else df
+    stores_norm = [s.strip().lower() for s in stores]
+
+    filtered_df = df[df["zona"].isin(resolve_zones(zones))]
+    if stores_norm:
+        filtered_df = pd.concat(
+            [filtered_df, df[df["nombre_key"].isin(stores_norm)]]
+        ).drop_duplicates()
+
+    origin_row = df[df["zona"].str.contains("origen", case = False)]
+    if not origin_row.empty:
+        filtered_df = pd.concat([origin_row, filtered_df]).drop_duplicates()
+
+    if filtered_df.empty:
+        return []
+
+    origin_idx = origin_row.index.tolist()
+    return origin_idx + [i for i in filtered_df.index if i not in origin_idx]
+
+def problem_demands(kind, selected_idx):
+    """Demandas del problema: las de data.xlsx para el GA, uniformes (10) para ACO."""
+    if kind == "ga":
+        return load_stores().loc[selected_idx, "demanda"].to_numpy()
+    return [10] * len(selected_idx)
@@ -0,0 +1,151 @@
+# app/algorithms/telemetry.py
+import time
+import threading
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Observadores de progreso de los solvers
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+class SolverObserver:
+    """
+    Interfaz para recibir métricas de un solver. Todas las llamadas son
+    opcionales; basta con sobrescribir las que se necesiten.
+
+    `on_iteration` recibe un dict con, al menos: `solver`, `iteration`,
+    `iterations`, `best_cost`, `iteration_best`, `mean_cost`, `diversity`,
+    `phases` (segundos por fase en la iteración) y `elapsed`. Los solvers
+    que la tienen agregan `best_solution` (la mejor solución hasta ahora).
+    """
+
+    def on_start(self, info):
+        pass
+
+    def on_iteration(self, metrics):
+        pass
+
+    def on_finish(self, summary):
+        pass
+
+
+class PrintObserver(SolverObserver):
+    """Imprime el progreso en stdout, como lo hacían antes los solvers."""
+
+    def __init__(self, verbose = False, every = 1):
+        self.verbose = verbose
+        self.every = max(1, int(every))
+
+    def on_iteration(self, metrics):
+        if metrics["iteration"] % self.every and metrics["iteration"] != metrics["iterations"]:
+            return
+        print(f"[{metrics['solver']}] iter {metrics['iteration']}/{metrics['iterations']} "
+              f"→ mejor: {metrics['best_cost']:.2f} | iter: {metrics['iteration_best']:.2f} "
+              f"| media: {metrics['mean_cost']:.2f} | diversidad: {metrics['diversity']:.2f} "
+              f"| {metrics['elapsed']:.3f}s")
+        if self.verbose and "solutions" in metrics:
+            for idx, routes in enumerate(metrics["solutions"], 1):
+                for car_name, route in routes.items():
+                    print(f"          #{idx} {car_name}: {[int(c) for c in route]}")
+
+    def on_finish(self, summary):
+        print(f"\n=== {summary['solver']} terminado en {summary['elapsed']:.3f}s ===")
+        print(f"Mejor costo: {summary['best_cost']:.2f}")
+        print(f"Mejor solución: {summary['best_solution']}")
+
+
+class CallbackObserver(SolverObserver):
+    """Adapta una función `fn(metrics)` a la interfaz de observador."""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def on_iteration(self, metrics):
+        self.fn(metrics)
+
+
+class MetricsRecorder(SolverObserver):
+    """Guarda las métricas de cada iteración (sin las soluciones)."""
+
+    def __init__(self):
+        self.info = None
+        self.history = []
+        self.summary = None
+
+    def on_start(self, info):
+        self.info = dict(info)
+
+    def on_iteration(self, metrics):
+        self.history.append({k: v for k, v in metrics.items()
+                             if k not in ("solutions", "best_solution")})
+
+    def on_finish(self, summary):
+        self.summary = {k: v for k, v in summary.items() if k != "best_solution"}
+
+
+class BestSoFar(SolverObserver):
+    """
+    Mejor solución vista hasta el momento, legible desde otro hilo mientras
+    el solver corre (p. ej. para contestar con lo que haya al vencer un
+    plazo). Las soluciones no se modifican después de construirse, así que
+    se guarda la referencia sin copiar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cost = float("inf")
+        self.solution = None
+        self.iteration = 0
+        self.elapsed = 0.0
+
+    def on_iteration(self, metrics):
+        cost = metrics.get("best_cost")
+        with self._lock:
+            self.iteration = metrics.get("iteration", self.iteration)
+            self.elapsed = metrics.get("elapsed", self.elapsed)
+            if cost is not None and cost <= self.cost:
+                self.cost = cost
+                self.solution = metrics.get("best_solution", self.solution)
+
+    def snapshot(self):
+        with self._lock:
+            return {"best_cost": self.cost, "best_solution": self.solution,
+                    "iteration": self.iteration, "elapsed": self.elapsed}
+
+
+class Telemetry:
+    """
+    Reparte los eventos a los observadores. Cuando no hay ninguno `active`
+    es False y los solvers se saltan el cálculo de métricas por completo.
+    """
+
+    def __init__(self, solver, observers = None):
+        self.solver = solver
+        self.observers = list(observers or [])
+        self.active = bool(self.observers)
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    def start(self, **info):
+        self.started = time.perf_counter()
+        if self.active:
+            info["solver"] = self.solver
+            for obs in self.observers:
+                obs.on_start(info)
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def iteration(self, **metrics):
+        metrics["solver"] = self.solver
+        metrics["phases"] = self.phases
+        metrics["elapsed"] = time.perf_counter() - self.started
+        self.phases = {}
+        for obs in self.observers:
+            obs.on_iteration(metrics)
+
+    def finish(self, **summary):
+        if self.active:
+            summary["solver"] = self.solver
+            summary["elapsed"] = time.perf_counter() - self.started
+            for obs in self.observers:
+                obs.on_finish(summary)
@@ -0,0 +1,103 @@
+# app/algorithms/termination.py
+import math
+import time
+from collections import deque
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Criterios de paro (ACO y GA)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+STOP_REASONS = ("iterations", "time_limit", "stagnation", "gap", "target")
+
+
+class Termination:
+    """
+    Criterios de paro además del número de iteraciones, revisados al final
+    de cada iteración con el mejor costo hasta el momento:
+
+    - `time_limit`: milisegundos de reloj. Se para antes de empezar una
+      iteración que, al ritmo de la última, ya no terminaría a tiempo.
+    - `patience`: iteraciones seguidas sin mejorar el mejor costo.
+    - `epsilon`: mejora relativa mínima en las últimas `window` iteraciones
+      (por defecto `patience` o 10).
+    - `target`: costo con el que ya es suficiente.
+
+    Guarda en `reason` por qué se paró ("iterations" si se completaron).
+    """
+
+    def __init__(self, time_limit = None, patience = None, epsilon = None,
+                 target = None, window = None):
+        self.time_limit = float(time_limit) if time_limit else None
+        self.patience = int(patience) if patience else None
+        self.epsilon = float(epsilon) if epsilon else None
+        self.target = float(target) if target is not None else None
+        self.window = int(window or self.patience or 10)
+        self.start()
+
+    @classmethod
+    def coerce(cls, value):
+        """None, una Termination o un dict con sus argumentos."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(**value)
+
+    @property
+    def active(self):
+        return any(x is not None for x in (self.time_limit, self.patience,
+                                           self.epsilon, self.target))
+
+    def start(self, iterations = None):
+        """Reinicia el reloj; `iterations` es el máximo del solver (si se conoce)."""
+        self.max_iterations = iterations
+        self.started = time.perf_counter()
+        self.last_tick = self.started
+        self.iterations = 0
+        self.best = math.inf
+        self.stale = 0
+        self.history = deque(maxlen = self.window + 1)
+        self.reason = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def remaining(self):
+        """Segundos que quedan de `time_limit` (None si no hay límite)."""
+        if self.time_limit is None:
+            return None
+        return max(0.0, self.time_limit / 1000 - self.elapsed())
+
+    def should_stop(self, best_cost, steps = 1):
+        """
+        Registra `steps` iteraciones terminadas (más de una cuando el solver
+        avanza por bloques, como GA_islands); True si hay que parar.
+        """
+        now = time.perf_counter()
+        step, self.last_tick = now - self.last_tick, now
+        self.iterations += steps
+
+        best_cost = float(best_cost)
+        if best_cost < self.best - 1e-12:
+            self.best, self.stale = best_cost, 0
+        else:
+            self.stale += steps
+        self.history.extend([best_cost] * min(steps, self.window + 1))
+
+        if self.target is not None and best_cost <= self.target:
+            self.reason = "target"
+        elif self.patience and self.stale >= self.patience:
+            self.reason = "stagnation"
+        elif self.epsilon is not None and len(self.history) > self.window:
+            old = self.history[0]
+            if math.isfinite(old) and old > 0 and (old - best_cost) / old < self.epsilon:
+                self.reason = "gap"
+        # La predicción sólo importa si aún quedan iteraciones por correr
+        remaining = self.max_iterations is None or self.iterations < self.max_iterations
+        if self.reason is None and self.time_limit is not None and remaining:
+            if (now - self.started + step) * 1000 > self.time_limit:
+                self.reason = "time_limit"
+        return self.reason is not None
+
+    def summary(self):
+        return {"reason": self.reason or "iterations", "iterations": self.iterations,
+                "elapsed": self.elapsed()}
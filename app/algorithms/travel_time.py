@@ -0,0 +1,125 @@
+# app/algorithms/travel_time.py
+from bisect import bisect_right
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Tiempos de viaje dependientes de la hora
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+# Franjas (hora inicio, hora fin, km/h); fuera de ellas se usa DEFAULT_SPEED
+SPEED_BANDS = ((7, 9, 20), (9, 14, 30), (14, 19, 15))
+DEFAULT_SPEED = 40
+
+
+# Velocidades estimadas por cada hora
+def average_speed(hour):
+    for start, end, speed in SPEED_BANDS:
+        if start <= hour < end:
+            return speed
+    return DEFAULT_SPEED
+
+
+class TravelTimeModel:
+    """
+    Precalcula una matriz de tiempos de viaje (horas) por cada velocidad de
+    franja y responde llegadas para uno o muchos arcos a la vez.
+
+    Con `fifo=True` (por defecto) el vehículo cambia de velocidad al cruzar
+    el límite de una franja (modelo de Ichoua-Gendreau-Potvin), así que salir
+    más tarde nunca significa llegar antes. Con `fifo=False` se usa la
+    velocidad de la hora de salida para todo el arco, como antes.
+    """
+
+    def __init__(self, distance_matrix, bands = SPEED_BANDS,
+                 default_speed = DEFAULT_SPEED, fifo = True):
+        self.distance_matrix = np.asarray(distance_matrix, dtype = float)
+        self.fifo = fifo
+
+        # Índice de franja = searchsorted(limites, hora, 'right'); los huecos
+        # entre franjas (y antes/después) usan la velocidad por defecto.
+        limits = sorted({h for start, end, _ in bands for h in (start, end)})
+        speeds = [default_speed]
+        for a in limits[:-1]:
+            speeds.append(next((v for start, end, v in bands if start <= a < end), default_speed))
+        speeds.append(default_speed)
+
+        self.limits = np.asarray(limits, dtype = float)
+        self._limits = [float(h) for h in limits]
+        self.speeds = np.asarray(speeds, dtype = float)
+        self.next_limit = np.append(self.limits, np.inf)
+
+        # Una matriz por velocidad distinta (las franjas "otras" comparten la suya)
+        unique = sorted(set(speeds))
+        self._by_speed = np.stack([self.distance_matrix / v for v in unique])
+        self._matrix_of_band = np.asarray([unique.index(v) for v in speeds])
+
+    def band(self, hour):
+        return np.searchsorted(self.limits, hour, side = "right")
+
+    def band_matrix(self, hour):
+        """Matriz de tiempos de viaje para salidas a la hora dada."""
+        return self._by_speed[self._matrix_of_band[self.band(hour)]]
+
+    def _walk(self, dist, t, b, arrival):
+        """Cruza límites de franja para los arcos que no terminan en su franja."""
+        over = arrival > self.next_limit[b]
+        if not self.fifo or not over.any():
+            return arrival
+        idx = np.flatnonzero(over)
+        rem = dist[idx] - self.speeds[b[idx]] * (self.next_limit[b[idx]] - t[idx])
+        t_cur = self.next_limit[b[idx]]
+        b_cur = b[idx] + 1
+        while True:
+            step = rem / self.speeds[b_cur]
+            done = t_cur + step <= self.next_limit[b_cur]
+            arrival[idx[done]] = t_cur[done] + step[done]
+            if done.all():
+                return arrival
+            keep = ~done
+            idx, rem, t_cur, b_cur = idx[keep], rem[keep], t_cur[keep], b_cur[keep]
+            rem = rem - self.speeds[b_cur] * (self.next_limit[b_cur] - t_cur)
+            t_cur = self.next_limit[b_cur]
+            b_cur = b_cur + 1
+
+    def arrivals(self, origins, destinations, departures):
+        """Horas de llegada para arreglos (difundibles) de orígenes, destinos y salidas."""
+        origins, destinations, departures = np.broadcast_arrays(
+            np.asarray(origins, dtype = int), np.asarray(destinations, dtype = int),
+            np.asarray(departures, dtype = float))
+        b = self.band(departures)
+        travel = self._by_speed[self._matrix_of_band[b], origins, destinations]
+        arrival = departures + travel
+        if not self.fifo:
+            return arrival
+        dist = self.distance_matrix[origins, destinations]
+        return self._walk(dist.ravel(), departures.ravel(), b.ravel(),
+                          arrival.ravel()).reshape(arrival.shape)
+
+    def arrival(self, origin, destination, departure):
+        """Versión escalar de `arrivals` (sin pasar por arreglos en el caso común)."""
+        b = bisect_right(self._limits, departure)
+        arrival = departure + self._by_speed[self._matrix_of_band[b], origin, destination]
+        if not self.fifo or arrival <= self.next_limit[b]:
+            return float(arrival)
+        dist = np.array([self.distance_matrix[origin, destination]])
+        return float(self._walk(dist, np.array([departure], dtype = float),
+                                np.array([b]), np.array([arrival]))[0])
+
+
+def arrival_time(distance, departure, fifo = True):
+    """Llegada para una distancia cruda (sin matriz), con las franjas por defecto."""
+    model = _DEFAULT_MODEL if fifo else _DEFAULT_MODEL_NON_FIFO
+    d = np.asarray(distance, dtype = float)
+    t = np.asarray(departure, dtype = float)
+    d, t = np.broadcast_arrays(d, t)
+    b = model.band(t)
+    arrival = t + d / model.speeds[b]
+    if not fifo:
+        return arrival
+    return model._walk(d.ravel(), t.ravel(), b.ravel(), arrival.ravel()).reshape(arrival.shape)
+
+
+_DEFAULT_MODEL = TravelTimeModel(np.zeros((1, 1)))
+_DEFAULT_MODEL_NON_FIFO = TravelTimeModel(np.zeros((1, 1)), fifo = False)
@@ -0,0 +1,101 @@
+# app/algorithms/warm_start.py
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#    Arranque en caliente tras agregar o quitar paradas
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+def apply_delta(selection, add = (), remove = ()):
+    """
+    Nueva selección (índices globales) tras quitar `remove` y agregar `add`.
+    El depósito (primera posición) nunca se quita y no se duplican nodos.
+    """
+    removed = {int(i) for i in remove} - {int(selection[0])}
+    nodes = [int(i) for i in selection if int(i) not in removed]
+    present = set(nodes)
+    for i in add:
+        if int(i) not in present:
+            nodes.append(int(i))
+            present.add(int(i))
+    return nodes
+
+def remap_routes(routes, old_selection, new_selection):
+    """
+    Pasa rutas con índices locales de `old_selection` a índices locales de
+    `new_selection`; los nodos que ya no están se quitan.
+    """
+    position = {int(g): k for k, g in enumerate(new_selection)}
+    remapped = {}
+    for vehicle, route in routes.items():
+        nodes = (int(old_selection[int(i)]) for i in route)
+        remapped[vehicle] = [position[g] for g in nodes if g in position]
+    return remapped
+
+def cheapest_insertion(routes, nodes, distance_matrix, demands = None,
+                       capacities = None, depot = 0):
+    """
+    Inserta cada nodo de `nodes` en la posición (de cualquier ruta) que menos
+    distancia agrega sin exceder la capacidad. Regresa (rutas, sin_lugar).
+    """
+    d = np.asarray(distance_matrix, dtype = float)
+    routes = {v: list(r) for v, r in routes.items()}
+    if demands is not None:
+        demands = np.asarray(demands, dtype = float)
+        loads = {v: float(demands[r].sum()) if r else 0.0 for v, r in routes.items()}
+    unplaced = []
+
+    for node in nodes:
+        node = int(node)
+        best = None
+        for vehicle, route in routes.items():
+            if demands is not None and capacities is not None:
+                if loads[vehicle] + demands[node] > capacities[vehicle] + 1e-9:
+                    continue
+            path = np.asarray([depot] + route + [depot], dtype = int)
+            a, b = path[:-1], path[1:]
+            # Sin arista depósito → depósito en rutas vacías
+            base = d[a, b] if route else np.zeros(1)
+            delta = d[a, node] + d[node, b] - base
+            delta = np.where(np.isfinite(delta), delta, np.inf)
+            pos = int(np.argmin(delta))
+            if best is None or delta[pos] < best[0]:
+                best = (delta[pos], vehicle, pos)
+
+        if best is None:
+            unplaced.append(node)
+            continue
+        _, vehicle, pos = best
+        routes[vehicle].insert(pos, node)
+        if demands is not None:
+            loads[vehicle] += demands[node]
+
+    return routes, unplaced
+
+def routes_to_chromosome(routes, n, unplaced = ()):
+    """
+    Cromosoma del GA (permutación de 1..n-1): rutas concatenadas en orden de
+    vehículo, luego los nodos sin lugar y al final cualquiera que falte.
+    """
+    chromosome = [int(c) for r in routes.values() for c in r]
+    chromosome += [int(c) for c in unplaced]
+    seen = set(chromosome)
+    chromosome += [c for c in range(1, n) if c not in seen]
+    return chromosome
+
+def resize_pheromone(feromone_matrix, old_selection, new_selection, fill = None):
+    """
+    Lleva la matriz de feromonas a la nueva selección: se conservan las
+    aristas entre nodos que siguen y las nuevas arrancan en `fill` (por
+    defecto, la media de la matriz anterior).
+    """
+    old = np.asarray(feromone_matrix, dtype = float)
+    if fill is None:
+        fill = float(old.mean()) if old.size else 1.0
+    position = {int(g): k for k, g in enumerate(old_selection)}
+    keep_new = [k for k, g in enumerate(new_selection) if int(g) in position]
+    keep_old = [position[int(new_selection[k])] for k in keep_new]
+
+    resized = np.full((len(new_selection), len(new_selection)), fill)
+    resized[np.ix_(keep_new, keep_new)] = old[np.ix_(keep_old, keep_old)]
+    return resized
@@ -1,13 +1,56 @@
-from flask import Flask, render_template, request, jsonify, send_file
-import pandas as pd
-import geopandas as gpd, folium
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
 import os
-import io
-from algorithms.aco_algorithm import aco_algorithm
+import sys
+import threading
+from algorithms.aco_algorithm import aco_algorithm, VARIANTS as ACO_VARIANTS, EXECUTORS as ACO_EXECUTORS
 from algorithms.genetic_algorithm import GA_multi_vehicle
+from algorithms.island_ga import GA_islands, check_island_params
+from algorithms.decomposition import decompose_and_solve
+from functools import lru_cache
+from algorithms.distance_store import get_store, load_selection
+from algorithms.store_data import load_stores, select_indices, problem_demands, ZONE_COLORS
+from algorithms.solution_cache import get_cache, fingerprint
+from algorithms.route_solution import RouteSolution, json_default
+from algorithms.warm_start import (apply_delta, remap_routes, cheapest_insertion,
+                                   routes_to_chromosome, resize_pheromone)
+from jobs import JobManager, DONE, FINISHED_STATES
+from solutions import SolutionStore
+from selections import SelectionStore
+from maps import (route_geometry, route_summary, map_center, to_geojson, render_map,
+                  render_selection_map)
+from scenarios import run_batch, to_ndjson
+
+# Ni folium ni pandas se importan aquí: folium al renderizar un mapa (ver maps.py),
+# pandas al leer las tiendas (ver algorithms/store_data.py)
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+
+
+class InvalidRequest(ValueError):
+    """Parámetros inválidos en la petición: se contestan con 400."""
+
+
+class SolverJSONProvider(DefaultJSONProvider):
+    """jsonify que entiende RouteSolution y tipos de NumPy sin convertirlos antes."""
+
+    @staticmethod
+    def default(obj):
+        try:
+            return json_default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
+
 
 app = Flask(__name__)
+app.json = SolverJSONProvider(app)
+job_manager = JobManager()
+solution_store = SolutionStore()
+selection_store = SelectionStore()
 
 @app.route('/')
 def index():
@@ -32,130 +75,122 @@ def save_selection():
         selected_zones = data.get("zones", [])
         selected_stores = data.get("stores", [])
 
-        coords_path = os.path.join("app", "data", "data.xlsx")
-        df = pd.read_excel(coords_path)
-        df.columns = df.columns.str.strip()
-
-        df["Zona"] = df["Zona"].astype(str).str.strip().str.lower()
-        df["Nombre"] = df["Nombre"].astype(str).str.strip().str.lower()
-        selected_zones_norm = [z.lower() for z in selected_zones]
-        selected_stores_norm = [s.lower() for s in selected_stores]
-
-        zone_map = {
-            "amarillo": "zona amarilla",
-            "café": "zona cafe",
-            "cafe": "zona cafe",
-            "gris": "zona gris",
-            "rojo": "zona roja",
-            "rosa": "zona rosa",
-            "verde": "zona verde",
-            "azul": "zona azul",
-        }
-        mapped_zones = [zone_map.get(z, z) for z in selected_zones_norm]
-
-        filtered_df = df[df["Zona"].isin(mapped_zones)]
-        if selected_stores_norm:
-            filtered_df = pd.concat(
-                [filtered_df, df[df["Nombre"].isin(selected_stores_norm)]]
-            ).drop_duplicates()
-
-        origin_row = df[df["Zona"].str.contains("origen", case=False)]
-        if not origin_row.empty:
-            filtered_df = pd.concat([origin_row, filtered_df]).drop_duplicates()
-
-        if filtered_df.empty:
+        df = load_stores()
+        selected_indices = select_indices(selected_zones, selected_stores, df)
+        if not selected_indices:
             return jsonify({"error": f"No se encontraron puntos válidos para {selected_zones}."})
 
-        dist_path = os.path.join("app", "data", "total_distances.csv")
-        dist_df = pd.read_csv(dist_path, index_col=0)
-        dist_df.index = dist_df.index.astype(str)
-        dist_df.columns = dist_df.columns.astype(str)
-
-        origin_idx = origin_row.index.tolist()
-        other_idx = [i for i in filtered_df.index if i not in origin_idx]
-        selected_indices = origin_idx + other_idx
-
-        filtered_matrix = dist_df.iloc[selected_indices, selected_indices]
+        # Las filas de data.xlsx y de total_distances.csv van en el mismo orden
+        get_store().submatrix(selected_indices, diagonal=np.inf)
         filtered_df = df.loc[selected_indices]
+        selection_id = selection_store.put(selected_indices,
+                                           demands=filtered_df["demanda"].to_numpy())
 
-        out_path = os.path.join("app", "data", "distances.csv")
-        filtered_matrix.reset_index(drop=True).to_csv(out_path, index=True)
-
-        coords_df = filtered_df.copy()
-        coords_df.columns = coords_df.columns.str.lower()
-        lat_col = next((c for c in coords_df.columns if "lat" in c), None)
-        lon_col = next((c for c in coords_df.columns if "lon" in c), None)
-
-        gdf = gpd.GeoDataFrame(
-            coords_df,
-            geometry=gpd.points_from_xy(coords_df[lon_col], coords_df[lat_col]),
-        )
-
-        start = gdf.iloc[0].geometry
-        m = folium.Map(location=[start.y, start.x], zoom_start=12)
-
-        color_map = {
-            "zona amarilla": "yellow",
-            "zona cafe": "brown",
-            "zona gris": "gray",
-            "zona roja": "red",
-            "zona rosa": "pink",
-            "zona verde": "green",
-            "zona azul": "blue",
-            "zona origen": "black",
-        }
-
-        for _, row in gdf.iterrows():
-            folium.CircleMarker(
-                location=[row.geometry.y, row.geometry.x],
-                radius=6,
-                color=color_map.get(row["zona"], "black"),
-                fill=True,
-                fill_color=color_map.get(row["zona"], "black"),
-                fill_opacity=0.8,
-                tooltip=row.get("nombre", row["zona"]),
-            ).add_to(m)
-
-        map_html = m._repr_html_()
-
+        # El mapa (folium) se renderiza aparte, cuando el cliente lo pide
         return jsonify({
             "message": "Selección guardada correctamente.",
+            "selection_id": selection_id,
             "count": len(filtered_df),
-            "map_html": map_html
+            "map_url": f"/selections/{selection_id}/map"
         })
 
     except Exception as e:
         return jsonify({"error": str(e)})
 
 
-@app.route('/run_ga', methods=['POST'])
-def run_ga():
+@app.route("/selections/<selection_id>/map", methods=["GET"])
+def selection_map(selection_id):
+    record = selection_store.get(selection_id)
+    if record is None:
+        return jsonify({'error': "Selección no encontrada."}), 404
+    points = load_stores().loc[record['indices']]
+    map_html = render_selection_map(points, ZONE_COLORS)
+    return map_html, 200, {'Content-Type': 'text/html; charset=utf-8'}
+
+
+@lru_cache(maxsize=1)
+def default_selection():
+    """Selección de arranque (la de distances.csv), para peticiones sin `selection_id`."""
+    return tuple(load_selection())
+
+
+def request_selection(data):
+    """
+    (índices, demandas) de la sesión `selection_id` de la petición, sin
+    leer archivos; sin id se usa la selección por defecto. Regresa None si
+    el id no existe (o ya se descartó).
+    """
+    selection_id = data.get('selection_id')
+    if not selection_id:
+        return list(default_selection()), None
+    record = selection_store.get(selection_id)
+    if record is None:
+        return None
+    return record['indices'].tolist(), record['demands']
+
+
+# Criterios de paro de /run_ga y /run_aco: `time_limit` en milisegundos
+TERMINATION_KEYS = ('time_limit', 'patience', 'epsilon', 'target')
+
+def request_termination(data):
+    """Argumentos de `Termination` que vienen en la petición (None si no hay)."""
+    args = {k: data[k] for k in TERMINATION_KEYS if data.get(k) not in (None, '')}
+    return args or None
+
+
+def solve_ga(data, selected_idx, observers=None, demands=None, **warm):
+    pop_size = int(data.get('pop_size', 80))
+    generations = int(data.get('generations', 300))
+    prob_crossover = float(data.get('prob_crossover', 0.9))
+    prob_mutation = float(data.get('prob_mutation', 0.2))
+    local_search = bool(data.get('local_search', False))
+    use_cache = bool(data.get('use_cache', True))
+    islands = int(data.get('islands', 1))
+    migration_interval = int(data.get('migration_interval', 20))
+    migrants = int(data.get('migrants', 2))
+    topology = data.get('topology', 'ring')
+    termination = request_termination(data)
     try:
-        data = request.get_json()
-
-        pop_size = int(data.get('pop_size', 80))
-        generations = int(data.get('generations', 300))
-        prob_crossover = float(data.get('prob_crossover', 0.9))
-        prob_mutation = float(data.get('prob_mutation', 0.2))
-        vehicles_info = data.get('vehicles', [])
-
-        vehicles = {v['name']: {'capacity': float(v['capacity'])} for v in vehicles_info}
-
-        dist_path = os.path.join('app', 'data', 'distances.csv')
-        dist_df = pd.read_csv(dist_path, index_col=0)
-        distance_matrix = dist_df.to_numpy(dtype=float)
-        np.fill_diagonal(distance_matrix, np.inf)
-
-        selected_idx = dist_df.index.astype(int).tolist()
-
-        data_path = os.path.join('app', 'data', 'data.xlsx')
-        df_all = pd.read_excel(data_path)
-        
-        df_aligned = df_all.loc[selected_idx].reset_index(drop=True)
-
-        demands = df_aligned['Demanda'].to_numpy()
-
-        best_solution = GA_multi_vehicle(
+        island_params = check_island_params(data.get('island_params'))
+    except ValueError as e:
+        raise InvalidRequest(str(e)) from None
+    operators = dict(crossover_op=data.get('crossover', 'ox'),
+                     mutation_op=data.get('mutation', 'swap'),
+                     selection=data.get('selection', 'elite'))
+    vehicles_info = data.get('vehicles', [])
+
+    vehicles = {v['name']: {'capacity': float(v['capacity'])} for v in vehicles_info}
+
+    distance_matrix = get_store().submatrix(selected_idx, diagonal=np.inf)
+
+    df_aligned = load_stores().loc[selected_idx].reset_index(drop=True)
+
+    if demands is None:
+        demands = problem_demands('ga', selected_idx)
+
+    # Mismo problema y parámetros → resultado guardado; sólo mismo problema → élite previa
+    cache = get_cache()
+    problem_key = fingerprint(selected_idx, distance_matrix, demands, vehicles)
+    params_key = fingerprint(pop_size, generations, prob_crossover, prob_mutation, local_search,
+                             islands, migration_interval, migrants, topology, operators,
+                             termination)
+    cache_status, entry = 'miss', None
+    if use_cache and not warm:
+        cache_status, entry = cache.lookup('ga', problem_key, params_key)
+
+    if cache_status == 'hit':
+        best_solution = dict(entry['solution'])
+    else:
+        if cache_status == 'warm':
+            warm = {'seeds': entry['elite']}
+        solver, island_args = GA_multi_vehicle, {}
+        if islands > 1:
+            # Varias poblaciones en procesos, con migración cada `migration_interval`
+            solver = GA_islands
+            island_args = dict(islands=islands, migration_interval=migration_interval,
+                               migrants=migrants, topology=topology,
+                               island_params=island_params)
+        best_solution = solver(
             distance_matrix=distance_matrix,
             demands=demands,
             vehicles=vehicles,
@@ -163,82 +198,113 @@ def run_ga():
             generations=generations,
             prob_crossover=prob_crossover,
             prob_mutation=prob_mutation,
-            penalty=10000
+            penalty=10000,
+            local_search=local_search,
+            observers=observers,
+            termination=termination,
+            **operators,
+            **island_args,
+            **warm
         )
+    best_solution['Routes'] = RouteSolution.from_routes(best_solution['Routes'], vehicles)
+    if cache_status != 'hit' and use_cache:
+        cache.store('ga', problem_key, params_key,
+                    {k: best_solution[k] for k in ('Cost', 'Routes', 'Time')},
+                    elite=best_solution['Elite'])
+    # Sólo geometría: el HTML de Folium se genera en /solutions/<id>/map
+    geometry = route_geometry(best_solution["Routes"], df_aligned, 'ga')
+    solution_id = solution_store.put('ga', selected_idx, vehicles,
+                                     best_solution["Routes"], params=dict(data),
+                                     geometry=geometry, center=map_center(df_aligned))
+
+    return {
+        "best_cost": round(best_solution["Cost"], 2),
+        "best_time": round(best_solution["Time"], 2),
+        "routes": route_summary(geometry),
+        "geometry": geometry,
+        "solution_id": solution_id,
+        **solution_urls(solution_id),
+        "cache": cache_status,
+        "islands": best_solution.get("Islands"),
+        "termination": best_solution.get("Termination")
+    }
 
-        coords_df = df_aligned.copy()
-        coords_df.columns = coords_df.columns.str.lower().str.strip()
-        lat_col = next((c for c in coords_df.columns if "lat" in c), None)
-        lon_col = next((c for c in coords_df.columns if "lon" in c), None)
 
-        gdf = gpd.GeoDataFrame(
-            coords_df,
-            geometry=gpd.points_from_xy(coords_df[lon_col], coords_df[lat_col])
-        )
-
-        start_point = gdf.iloc[0].geometry
-        m = folium.Map(location=[start_point.y, start_point.x], zoom_start=13)
-        colors = ["purple", "orange", "teal", "blue", "red"]
-
-        route_summary = []
-        for i, (car, route) in enumerate(best_solution["Routes"].items()):
-            if not route:
-                continue
-            color = colors[i % len(colors)]
-            coords = [
-                (gdf.iloc[int(r)].geometry.y, gdf.iloc[int(r)].geometry.x)
-                for r in route if int(r) < len(gdf)
-            ]
-            folium.PolyLine(coords, color=color, weight=5, tooltip=car).add_to(m)
-            order_text = []
-            for j, r in enumerate(route):
-                if int(r) >= len(gdf): continue
-                name = gdf.iloc[int(r)].get("nombre", f"Punto {r}")
-                folium.CircleMarker(
-                    location=[gdf.iloc[int(r)].geometry.y, gdf.iloc[int(r)].geometry.x],
-                    radius=5, color=color, fill=True,
-                    tooltip=f"{car}: {name}"
-                ).add_to(m)
-                order_text.append(f"{j+1}. {name}")
-            route_summary.append({"vehicle": car, "order": "\n".join(order_text)})
-
-        map_html = m._repr_html_()
-
-        return jsonify({
-            "best_cost": round(best_solution["Cost"], 2),
-            "best_time": round(best_solution["Time"], 2),
-            "routes": route_summary,
-            "map_html": map_html
-        })
-
-    except Exception as e:
-        return jsonify({'error': str(e)})
-
-@app.route('/run_aco', methods=['POST'])
-def run_aco():
+@app.route('/run_ga', methods=['POST'])
+def run_ga():
     try:
         data = request.get_json()
+        selection = request_selection(data)
+        if selection is None:
+            return jsonify({'error': "Selección no encontrada."}), 404
+        selected_idx, demands = selection
+        return jsonify(solve_ga(data, selected_idx, demands=demands))
+
+    except InvalidRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)})
 
-        alpha = float(data.get('alpha', 1))
-        beta = float(data.get('beta', 2))
-        rho = float(data.get('rho', 0.5))
-        iterations = int(data.get('iterations', 5))
-
-        vehicles_info = data.get('vehicles', [])
-        vehicles = {}
-        vehicle_experience = {}
-
-        for v in vehicles_info:
-            name = v['name']
-            vehicles[name] = {'capacity': float(v['capacity'])}
-            vehicle_experience[name] = float(v['experience'])
-
-        dist_path = os.path.join('app', 'data', 'distances.csv')
-        dist_df = pd.read_csv(dist_path, index_col=0)
-        distance_matrix = dist_df.to_numpy(dtype=float)
-        np.fill_diagonal(distance_matrix, np.inf)
-        demands = [10] * len(distance_matrix)
 
+def check_aco_request(data):
+    """Revisa `variant` y `executor` antes de correr ACO (InvalidRequest → 400)."""
+    variant = data.get('variant', 'as')
+    if variant not in ACO_VARIANTS:
+        raise InvalidRequest(f"variant debe ser uno de {ACO_VARIANTS}, no {variant!r}")
+    executor = data.get('executor', 'serial')
+    if executor not in ACO_EXECUTORS:
+        raise InvalidRequest(f"executor debe ser uno de {ACO_EXECUTORS}, no {executor!r}")
+
+
+def solve_aco(data, selected_idx, observers=None, demands=None, **warm):
+    # ACO usa demanda uniforme; `demands` se acepta para tener la firma de solve_ga
+    check_aco_request(data)
+    alpha = float(data.get('alpha', 1))
+    beta = float(data.get('beta', 2))
+    rho = float(data.get('rho', 0.5))
+    iterations = int(data.get('iterations', 5))
+    num_ants = int(data.get('num_ants', 3))
+    executor = data.get('executor', 'serial')
+    workers = data.get('workers')
+    workers = int(workers) if workers else None
+    seed = data.get('seed')
+    seed = int(seed) if seed not in (None, '') else None
+    candidate_k = data.get('candidate_k')
+    candidate_k = int(candidate_k) if candidate_k else None
+    local_search = bool(data.get('local_search', False))
+    variant = data.get('variant', 'as')
+    q0 = float(data.get('q0', 0.9))
+    termination = request_termination(data)
+    use_cache = bool(data.get('use_cache', True))
+
+    vehicles_info = data.get('vehicles', [])
+    vehicles = {}
+    vehicle_experience = {}
+
+    for v in vehicles_info:
+        name = v['name']
+        vehicles[name] = {'capacity': float(v['capacity'])}
+        vehicle_experience[name] = float(v['experience'])
+
+    distance_matrix = get_store().submatrix(selected_idx, diagonal=np.inf)
+    demands = problem_demands('aco', selected_idx)
+
+    # Mismo problema y parámetros → resultado guardado; sólo mismo problema → feromonas previas
+    cache = get_cache()
+    problem_key = fingerprint(selected_idx, distance_matrix, demands, vehicles,
+                              vehicle_experience)
+    params_key = fingerprint(alpha, beta, rho, iterations, num_ants, seed,
+                             candidate_k, local_search, variant, q0, termination)
+    cache_status, entry = 'miss', None
+    if use_cache and not warm:
+        cache_status, entry = cache.lookup('aco', problem_key, params_key)
+
+    if cache_status == 'hit':
+        best_solution = dict(entry['solution'], Pheromone=entry['pheromone'])
+    else:
+        if cache_status == 'warm':
+            warm = {'initial_pheromone': entry['pheromone'],
+                    'initial_routes': entry['solution']['Route']}
         best_solution = aco_algorithm(
             distance_matrix=distance_matrix,
             vehicles=vehicles,
@@ -248,91 +314,397 @@ def run_aco():
             alpha=alpha,
             beta=beta,
             rho=rho,
-            num_ants=3
+            num_ants=num_ants,
+            executor=executor,
+            workers=workers,
+            seed=seed,
+            candidate_k=candidate_k,
+            local_search=local_search,
+            variant=variant,
+            q0=q0,
+            observers=observers,
+            termination=termination,
+            **warm
         )
+    best_solution['Route'] = RouteSolution.from_routes(best_solution['Route'], vehicles)
+    if cache_status != 'hit' and use_cache:
+        cache.store('aco', problem_key, params_key,
+                    {k: best_solution[k] for k in ('Distance', 'Route')},
+                    pheromone=best_solution['Pheromone'])
+    coords_df = load_stores().loc[selected_idx].reset_index(drop=True)
+
+    # Sólo geometría: el HTML de Folium se genera en /solutions/<id>/map
+    geometry = route_geometry(best_solution['Route'], coords_df, 'aco')
+    solution_id = solution_store.put('aco', selected_idx, vehicles, best_solution['Route'],
+                                     pheromone=best_solution['Pheromone'], params=dict(data),
+                                     geometry=geometry, center=map_center(coords_df))
+
+    routes = route_summary(geometry)
+    for summary, g in zip(routes, geometry):
+        summary['route'] = g['nodes']
+
+    # El depósito (índice 0) no es un sitio por atender
+    missing_sites = np.setdiff1d(np.arange(1, len(distance_matrix)), best_solution['Route'].nodes)
+    names = coords_df['nombre'].to_numpy()
+    missing_sites_list = names[missing_sites[missing_sites < len(names)]].tolist()
+
+    return {
+        'best_distance': round(float(best_solution['Distance']), 2),
+        'routes': routes,
+        'geometry': geometry,
+        'missing_sites': missing_sites_list,
+        'solution_id': solution_id,
+        **solution_urls(solution_id),
+        'cache': cache_status,
+        'termination': best_solution.get('Termination')
+    }
 
-        coords_path = os.path.join('app', 'data', 'data.xlsx')
-        coords_df = pd.read_excel(coords_path)
-        coords_df.columns = coords_df.columns.str.lower().str.strip()
-        lat_col = next((c for c in coords_df.columns if "lat" in c), None)
-        lon_col = next((c for c in coords_df.columns if "lon" in c), None)
 
-        gdf = gpd.GeoDataFrame(
-            coords_df,
-            geometry=gpd.points_from_xy(coords_df[lon_col], coords_df[lat_col])
-        )
+@app.route('/run_aco', methods=['POST'])
+def run_aco():
+    try:
+        data = request.get_json()
+        selection = request_selection(data)
+        if selection is None:
+            return jsonify({'error': "Selección no encontrada."}), 404
+        return jsonify(solve_aco(data, selection[0]))
+
+    except InvalidRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+
+def solve_clustered(data, selected_idx, observers=None, demands=None, **warm):
+    """
+    Primero agrupa (por zona, k-means con capacidad o barrido angular
+    alrededor del depósito), resuelve cada grupo con el GA o ACO en
+    procesos separados y repara la frontera entre grupos vecinos.
+    """
+    kind = data.get('solver', 'ga')
+    method = data.get('method', 'zone')
+    clusters = data.get('clusters')
+    clusters = int(clusters) if clusters else None
+    workers = data.get('workers')
+    workers = int(workers) if workers else None
+    seed = data.get('seed')
+    seed = int(seed) if seed not in (None, '') else None
+
+    vehicles_info = data.get('vehicles', [])
+    vehicles = {v['name']: {'capacity': float(v['capacity'])} for v in vehicles_info}
+    vehicle_experience = {v['name']: float(v.get('experience', 0.8)) for v in vehicles_info}
+
+    distance_matrix = get_store().submatrix(selected_idx, diagonal=np.inf)
+    if demands is None or kind != 'ga':
+        demands = problem_demands(kind, selected_idx)
+    points = load_stores().loc[selected_idx].reset_index(drop=True)
+
+    best_solution = decompose_and_solve(
+        distance_matrix, demands, vehicles,
+        coords=points[['lat', 'lon']].to_numpy(dtype=float),
+        method=method,
+        solver=kind,
+        zones=points['zona'].to_numpy(),
+        clusters=clusters,
+        vehicle_experience=vehicle_experience,
+        solver_params=data.get('params') or {},
+        executor=data.get('executor', 'processes'),
+        workers=workers,
+        seed=seed,
+        repair=bool(data.get('repair', True)),
+        observers=observers
+    )
+
+    geometry = route_geometry(best_solution['Routes'], points, kind)
+    solution_id = solution_store.put('clustered', selected_idx, vehicles,
+                                     best_solution['Routes'], params=dict(data),
+                                     geometry=geometry, center=map_center(points))
+    names = points['nombre'].to_numpy()
+
+    return {
+        'best_distance': round(float(best_solution['Distance']), 2),
+        'best_time': round(best_solution['Time'], 2),
+        'routes': route_summary(geometry),
+        'geometry': geometry,
+        'clusters': best_solution['Clusters'],
+        'missing_sites': names[best_solution['Unserved']].tolist(),
+        'repair_gain': round(best_solution['Repair'], 2),
+        'solution_id': solution_id,
+        **solution_urls(solution_id)
+    }
+
+
+@app.route('/run_clustered', methods=['POST'])
+def run_clustered():
+    try:
+        data = request.get_json()
+        selection = request_selection(data)
+        if selection is None:
+            return jsonify({'error': "Selección no encontrada."}), 404
+        selected_idx, demands = selection
+        return jsonify(solve_clustered(data, selected_idx, demands=demands))
+
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
 
-        start_point = gdf.iloc[0].geometry
-        m = folium.Map(location=[start_point.y, start_point.x], zoom_start=13)
-        colors = ['red', 'blue', 'green', 'purple', 'orange']
-
-        route_summary = []
-        for i, (car, route) in enumerate(best_solution['Route'].items()):
-            if not route:
-                continue
-            points = [gdf.iloc[int(r)].geometry for r in route if int(r) < len(gdf)]
-            coords = [(p.y, p.x) for p in points]
-
-            folium.PolyLine(coords, color=colors[i % len(colors)], weight=4, tooltip=car).add_to(m)
-
-            order_text = []
-            for j, r in enumerate(route):
-                if int(r) >= len(gdf): continue
-                row = gdf.iloc[int(r)]
-                name = row.get('nombre', f"Punto {r}")
-                folium.CircleMarker(location=[row.geometry.y, row.geometry.x],
-                                    radius=5, color=colors[i % len(colors)],
-                                    fill=True, tooltip=f"{car}: {name}").add_to(m)
-                order_text.append(f"{j+1}. {name}")
-            route_summary.append({
-                'vehicle': car,
-                'route': route,
-                'order': "\n".join(order_text)
-            })
-
-        map_html = m._repr_html_()
-
-        def convert_to_serializable(obj):
-            if isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(x) for x in obj]
-            elif isinstance(obj, np.integer):
-                return int(obj)
-            else:
-                return obj
-
-        best_solution_serializable = convert_to_serializable(best_solution)
-        route_summary_serializable = convert_to_serializable(route_summary)
-        visited_indices = set()
-        for r in best_solution_serializable['Route'].values():
-            visited_indices.update(int(i) for i in r if isinstance(i, (int, np.integer)))
-        
-        all_indices = set(range(len(dist_df)))
-        missing_sites = all_indices - visited_indices
-        if 'nombre' in coords_df.columns:
-            missing_sites_list = [
-                coords_df.iloc[i]['nombre'] for i in missing_sites if i < len(coords_df)
-                ]
+SOLVERS = {'ga': solve_ga, 'aco': solve_aco, 'clustered': solve_clustered}
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Mapas bajo demanda ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def solution_urls(solution_id):
+    return {'map_url': f"/solutions/{solution_id}/map",
+            'geojson_url': f"/solutions/{solution_id}/geojson"}
+
+@app.route('/solutions/<solution_id>/map', methods=['GET'])
+def solution_map(solution_id):
+    record = solution_store.get(solution_id)
+    if record is None:
+        return jsonify({'error': "Solución no encontrada."}), 404
+    # Se renderiza la primera vez que se pide y se guarda con la solución
+    map_html = record.get('map_html')
+    if map_html is None:
+        map_html = render_map(record['geometry'], record['center'])
+        solution_store.update(solution_id, map_html=map_html)
+    return map_html, 200, {'Content-Type': 'text/html; charset=utf-8'}
+
+@app.route('/solutions/<solution_id>/geojson', methods=['GET'])
+def solution_geojson(solution_id):
+    record = solution_store.get(solution_id)
+    if record is None:
+        return jsonify({'error': "Solución no encontrada."}), 404
+    return jsonify(to_geojson(record['geometry']))
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Reoptimización incremental ✦ ୨୧‿︵‿︵‿︵ ˚₊
+# Presupuesto corto por defecto al partir de una solución previa
+REOPTIMIZE_BUDGET = {'ga': ('generations', 40), 'aco': ('iterations', 3)}
+
+def stop_indices(stops):
+    """Paradas por nombre o por índice global (fila de data.xlsx)."""
+    df = load_stores()
+    by_name = dict(zip(df['nombre_key'], df.index))
+    indices = []
+    for stop in stops:
+        if isinstance(stop, int) or str(stop).isdigit():
+            if int(stop) not in df.index:
+                raise ValueError(f"Parada desconocida: {stop}")
+            indices.append(int(stop))
         else:
-            name_col = next((c for c in coords_df.columns if 'direccion' in c or 'address' in c), None)
-            if name_col:
-                missing_sites_list = [
-                    coords_df.iloc[i][name_col] for i in missing_sites if i < len(coords_df)
-                ]
-            else:
-                missing_sites_list = [f"Punto {i}" for i in missing_sites]
+            key = str(stop).strip().lower()
+            if key not in by_name:
+                raise ValueError(f"Parada desconocida: {stop}")
+            indices.append(int(by_name[key]))
+    return indices
+
+
+def reoptimize(kind, data, observers=None):
+    """
+    Parte de la solución `data['solution_id']`, aplica `add`/`remove` a su
+    selección y corre el solver con pocas iteraciones: el GA arranca con las
+    rutas previas (inserción más barata de las paradas nuevas) y ACO con la
+    matriz de feromonas ajustada a los nodos nuevos.
+    """
+    previous = solution_store.get(data.get('solution_id'))
+    if previous is None:
+        raise ValueError("Solución no encontrada.")
+    if previous['kind'] != kind:
+        raise ValueError(f"La solución es de {previous['kind']}, no de {kind}.")
+
+    add = stop_indices(data.get('add', []))
+    remove = stop_indices(data.get('remove', []))
+    selection = apply_delta(previous['selection'], add, remove)
+
+    params = dict(previous['params'])
+    params.update({k: v for k, v in data.items() if k not in ('solution_id', 'add', 'remove')})
+    key, budget = REOPTIMIZE_BUDGET[kind]
+    params[key] = data.get(key, budget)
+
+    distance_matrix = get_store().submatrix(selection, diagonal=np.inf)
+    capacities = {v['name']: float(v['capacity']) for v in params.get('vehicles', [])}
+    routes = remap_routes(previous['routes'], previous['selection'], selection)
+    routes = {v: routes.get(v, []) for v in capacities}
+    known = set(previous['selection'])
+    new_nodes = [k for k, g in enumerate(selection) if g not in known]
+    routes, unplaced = cheapest_insertion(routes, new_nodes, distance_matrix,
+                                          problem_demands(kind, selection), capacities)
+
+    if kind == 'aco':
+        warm = {'initial_routes': routes,
+                'initial_pheromone': resize_pheromone(previous['pheromone'],
+                                                      previous['selection'], selection)}
+    else:
+        warm = {'seeds': [routes_to_chromosome(routes, len(selection), unplaced)]}
+
+    result = SOLVERS[kind](params, selection, observers=observers, **warm)
+    result['previous_solution_id'] = data.get('solution_id')
+    return result
+
+
+@app.route('/reoptimize/<kind>', methods=['POST'])
+def run_reoptimize(kind):
+    if kind not in REOPTIMIZE_BUDGET:
+        return jsonify({'error': f"Algoritmo desconocido: {kind}"}), 404
+    try:
+        data = request.get_json()
+        if solution_store.get(data.get('solution_id')) is None:
+            return jsonify({'error': "Solución no encontrada."}), 404
+        return jsonify(reoptimize(kind, data))
 
-        return jsonify({
-            'best_distance': round(best_solution_serializable['Distance'], 2),
-            'map_html': map_html,
-            'routes': route_summary_serializable,
-            'missing_sites': missing_sites_list
-        })
+    except InvalidRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Escenarios por lotes ✦ ୨୧‿︵‿︵‿︵ ˚₊
 
+@app.route('/scenarios', methods=['POST'])
+def run_scenarios():
+    """
+    Resuelve una lista de escenarios (ver scenarios.py) en un pool de
+    procesos y manda cada resultado como una línea de NDJSON en cuanto
+    termina; la última línea es el resumen {"done": true, ...}.
+    """
+    try:
+        data = request.get_json() or {}
+        scenarios = data.get('scenarios')
+        workers = data.get('workers')
+        results = run_batch(scenarios, workers=int(workers) if workers else None,
+                            executor=data.get('executor', 'processes'))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    lines = (to_ndjson(result) for result in results)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Trabajos en segundo plano ✦ ୨୧‿︵‿︵‿︵ ˚₊
+
+@app.route('/jobs/<kind>', methods=['POST'])
+def submit_job(kind):
+    if kind not in SOLVERS:
+        return jsonify({'error': f"Algoritmo desconocido: {kind}"}), 404
+    try:
+        data = request.get_json()
+        selection = request_selection(data)
+        if selection is None:
+            return jsonify({'error': "Selección no encontrada."}), 404
+        selected_idx, demands = selection
+        if kind == 'ga':
+            # Se valida antes de encolar para contestar 400 y no un trabajo fallido
+            try:
+                check_island_params(data.get('island_params'))
+            except ValueError as e:
+                raise InvalidRequest(str(e)) from None
+        elif kind == 'aco':
+            check_aco_request(data)
+        job = job_manager.submit(kind, SOLVERS[kind], data, selected_idx, demands=demands)
+        return jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f"/jobs/{job.id}",
+            'result_url': f"/jobs/{job.id}/result"
+        }), 202
+
+    except InvalidRequest as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Trabajo no encontrado."}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Trabajo no encontrado."}), 404
+    if job.status not in FINISHED_STATES:
+        return jsonify(job.to_dict()), 202
+    if job.status != DONE:
+        return jsonify(job.to_dict()), 409
+    return jsonify(job.result)
+
+@app.route('/jobs/<job_id>/best', methods=['GET'])
+def job_best(job_id):
+    """Mejor solución hasta ahora de un trabajo que sigue corriendo (rutas locales)."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Trabajo no encontrado."}), 404
+    snapshot = job.best.snapshot()
+    if not np.isfinite(snapshot['best_cost']):
+        snapshot['best_cost'] = None
+    return jsonify(dict(snapshot, status=job.status))
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': "Trabajo no encontrado."}), 404
+    return jsonify(job.to_dict())
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Arranque y diagnóstico ✦ ୨୧‿︵‿︵‿︵ ˚₊
+HEAVY_MODULES = ('pandas', 'folium')
+STARTUP = {'import_seconds': round(IMPORT_SECONDS, 4), 'started_at': time.time(),
+           'warm_up': None, 'warm_up_errors': {}}
+_warm_lock = threading.Lock()
+
+
+def warm_up():
+    """
+    Carga antes de atender peticiones lo que pagaría la primera: la matriz
+    de distancias (memmap), las tiendas y la submatriz de la selección por
+    defecto. Corre una vez por proceso; regresa los segundos de cada fase.
+    """
+    with _warm_lock:
+        if STARTUP['warm_up'] is not None:
+            return STARTUP['warm_up']
+        phases = {
+            'distance_matrix': get_store().load,
+            'stores': load_stores,
+            'default_selection': lambda: get_store().submatrix(default_selection(),
+                                                               diagonal=np.inf),
+        }
+        timings = {}
+        for name, load in phases.items():
+            t0 = time.perf_counter()
+            try:
+                load()
+            except Exception as e:
+                # Sin precarga la petición la hará después; no se impide el arranque
+                STARTUP['warm_up_errors'][name] = str(e)
+            timings[name] = round(time.perf_counter() - t0, 4)
+        STARTUP['warm_up'] = timings
+        STARTUP['ready_at'] = time.time()
+        return timings
+
+
+def create_app(warm=None):
+    """
+    Fábrica para el servidor: regresa la app después de precargar los
+    datos (con WARM_UP=0 no se precarga). Un solo worker, porque las
+    sesiones viven en memoria:
+    `gunicorn -w 1 --threads 8 --pythonpath app 'app:create_app()'`.
+    """
+    if warm is None:
+        warm = os.environ.get('WARM_UP', '1') != '0'
+    if warm:
+        warm_up()
+    return app
+
+
+@app.route('/diagnostics/startup', methods=['GET'])
+def startup_diagnostics():
+    return jsonify(dict(STARTUP,
+                        uptime=time.time() - STARTUP['started_at'],
+                        modules={m: m in sys.modules for m in HEAVY_MODULES}))
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
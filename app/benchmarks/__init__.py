@@ -0,0 +1,8 @@
+# app/benchmarks/__init__.py
+"""
+Benchmarks reproducibles de los solvers. Se corren desde la raíz del repo:
+
+    python app/benchmarks --compare
+    python app/benchmarks --save-baseline   # costos con semilla fija (versionado)
+    python app/benchmarks --save-local      # tiempos y memoria de esta máquina
+"""
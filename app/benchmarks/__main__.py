@@ -0,0 +1,10 @@
+# app/benchmarks/__main__.py
+import os
+import sys
+
+# Igual que app.py: los módulos se importan con `app/` en el path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.runner import main
+
+sys.exit(main())
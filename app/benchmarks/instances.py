@@ -0,0 +1,89 @@
+# app/benchmarks/instances.py
+import math
+
+import numpy as np
+
+from algorithms.distance_store import get_store
+from algorithms.store_data import load_stores
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#         Instancias de prueba
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+VEHICLE_CAPACITY = 500
+
+
+class Instance:
+    """
+    Problema listo para los solvers: el depósito es el nodo 0, la diagonal
+    de la matriz es inf y `vehicles` tiene capacidad suficiente para toda la
+    demanda (mínimo dos unidades, como la flota de la distribuidora).
+    """
+
+    def __init__(self, name, distance_matrix, demands, vehicles = None):
+        self.name = name
+        self.distance_matrix = distance_matrix
+        self.demands = np.asarray(demands, dtype = float)
+        if vehicles is None:
+            needed = math.ceil(self.demands.sum() / (0.9 * VEHICLE_CAPACITY))
+            vehicles = {f"Car_{k + 1}": {"capacity": VEHICLE_CAPACITY}
+                        for k in range(max(2, needed))}
+        self.vehicles = vehicles
+
+    @property
+    def nodes(self):
+        return len(self.distance_matrix)
+
+
+def _from_selection(name, indices):
+    stores = load_stores()
+    matrix = get_store().submatrix(indices, diagonal = np.inf)
+    demands = np.array(stores.loc[indices, "demanda"], dtype = float)
+    demands[0] = 0
+    return Instance(name, matrix, demands)
+
+def _depot_index(stores):
+    return int(stores.index[stores["zona"].str.contains("origen")][0])
+
+def shipped_instance():
+    """Las 107 filas de `total_distances.csv`, con el depósito primero."""
+    stores = load_stores()
+    depot = _depot_index(stores)
+    return _from_selection("shipped", [depot] + [i for i in stores.index if i != depot])
+
+def zone_instances():
+    """Una instancia por zona: depósito + tiendas de la zona."""
+    stores = load_stores()
+    depot = _depot_index(stores)
+    instances = []
+    for zone in sorted(stores["zona"].unique()):
+        if "origen" in zone:
+            continue
+        indices = [depot] + [int(i) for i in stores.index[stores["zona"] == zone]]
+        instances.append(_from_selection(zone.replace(" ", "_"), indices))
+    return instances
+
+def synthetic_instance(n, seed = 0, radius_km = 15.0, detour_factor = 1.3):
+    """
+    `n` nodos al azar en un disco de `radius_km` alrededor del depósito,
+    distancias euclidianas por un factor de rodeo y demandas de 5 a 40.
+    """
+    rng = np.random.default_rng(seed)
+    r = radius_km * np.sqrt(rng.random(n))
+    theta = 2 * np.pi * rng.random(n)
+    xy = np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+    xy[0] = 0
+    diff = xy[:, None, :] - xy[None, :, :]
+    matrix = detour_factor * np.sqrt((diff ** 2).sum(axis = 2))
+    np.fill_diagonal(matrix, np.inf)
+    demands = rng.integers(5, 41, size = n).astype(float)
+    demands[0] = 0
+    return Instance(f"synthetic_{n}", matrix, demands)
+
+def default_instances(sizes = (200, 500, 1000), zones = True):
+    instances = [shipped_instance()]
+    if zones:
+        instances += zone_instances()
+    instances += [synthetic_instance(n, seed = n) for n in sizes]
+    return instances
@@ -0,0 +1,281 @@
+# app/benchmarks/runner.py
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from functools import partial
+
+import numpy as np
+
+from algorithms.aco_algorithm import aco_algorithm
+from algorithms.genetic_algorithm import GA, GA_multi_vehicle
+from algorithms.telemetry import MetricsRecorder
+from benchmarks.instances import VEHICLE_CAPACITY, default_instances
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#       Corrida de benchmarks y comparación
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Tiempos y memoria dependen de la máquina: se guardan aparte, sin versionar
+LOCAL_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "baseline.local.json")
+
+BUDGETS = {
+    "aco": {"iterations": 10, "num_ants": 5},
+    "aco_mmas": {"iterations": 10, "num_ants": 5},
+    "aco_acs": {"iterations": 10, "num_ants": 5},
+    "ga": {"pop_size": 40, "generations": 50},
+    "ga_multi_vehicle": {"pop_size": 40, "generations": 50},
+}
+
+# Tolerancias relativas antes de marcar una regresión
+TOLERANCES = {"wall_time": 0.25, "peak_memory": 0.25, "cost": 0.01}
+MACHINE_METRICS = ("wall_time", "peak_memory")
+# Campos que sólo dependen de la semilla: los únicos de la línea base versionada
+DETERMINISTIC_FIELDS = ("instance", "nodes", "vehicles", "solver", "seed", "budget",
+                        "cost", "served", "iterations")
+
+
+def _seed_globals(seed):
+    # El GA usa el `random` global; ACO recibe la semilla directamente
+    random.seed(seed)
+    np.random.seed(seed)
+
+def run_aco(instance, seed, budget, observers, variant = "as"):
+    result = aco_algorithm(instance.distance_matrix, instance.vehicles, instance.demands,
+                           seed = seed, observers = observers, variant = variant, **budget)
+    return result["Distance"], sum(len(r) for r in result["Route"].values())
+
+def run_ga(instance, seed, budget, observers):
+    _seed_globals(seed)
+    result = GA(instance.distance_matrix, instance.demands, capacity = VEHICLE_CAPACITY,
+                observers = observers, **budget)
+    return result["Cost"], len(result["Route"])
+
+def run_ga_multi_vehicle(instance, seed, budget, observers):
+    _seed_globals(seed)
+    result = GA_multi_vehicle(instance.distance_matrix, instance.demands, instance.vehicles,
+                              observers = observers, **budget)
+    return result["Cost"], sum(len(r) for r in result["Routes"].values())
+
+SOLVERS = {
+    "aco": run_aco,
+    "aco_mmas": partial(run_aco, variant = "mmas"),
+    "aco_acs": partial(run_aco, variant = "acs"),
+    "ga": run_ga,
+    "ga_multi_vehicle": run_ga_multi_vehicle,
+}
+
+
+def _finite(x):
+    return float(x) if x is not None and math.isfinite(x) else None
+
+def run_case(instance, solver, seed, budget = None, memory = True):
+    """
+    Corre un solver sobre una instancia. El tiempo se mide sin tracemalloc;
+    con `memory` se repite la corrida (misma semilla) para medir el pico.
+    """
+    budget = dict(BUDGETS[solver], **(budget or {}))
+    recorder = MetricsRecorder()
+    t0 = time.perf_counter()
+    cost, served = SOLVERS[solver](instance, seed, budget, [recorder])
+    wall = time.perf_counter() - t0
+
+    elapsed = [h["elapsed"] for h in recorder.history]
+    per_iteration = np.diff([0.0] + elapsed)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            SOLVERS[solver](instance, seed, budget, None)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "instance": instance.name,
+        "nodes": instance.nodes,
+        "vehicles": len(instance.vehicles),
+        "solver": solver,
+        "seed": seed,
+        "budget": budget,
+        "cost": _finite(cost),
+        "served": int(served),
+        "wall_time": wall,
+        "iterations": len(elapsed),
+        "time_per_iteration": float(per_iteration.mean()) if len(elapsed) else None,
+        "time_per_iteration_max": float(per_iteration.max()) if len(elapsed) else None,
+        "peak_memory": peak,
+        "curve": [[round(h["elapsed"], 6), _finite(h["best_cost"])] for h in recorder.history],
+    }
+
+def run_suite(instances, solvers = tuple(SOLVERS), seeds = (0,), budgets = None,
+              memory = True, log = None):
+    results = []
+    for instance in instances:
+        for solver in solvers:
+            for seed in seeds:
+                result = run_case(instance, solver, seed, (budgets or {}).get(solver), memory)
+                results.append(result)
+                if log is not None:
+                    log(result)
+    return {"meta": environment(), "results": results}
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "host": platform.node(),
+    }
+
+def host_fingerprint(meta):
+    """Lo que identifica a la máquina: sólo con el mismo se comparan tiempos y memoria."""
+    return tuple(meta.get(k) for k in ("host", "platform", "processor", "cpu_count",
+                                       "python", "numpy"))
+
+def deterministic(report):
+    """
+    El reporte sin tiempos ni memoria: costo, atendidos y la curva de
+    convergencia (mejor costo por iteración), que con semillas fijas son
+    iguales en cualquier máquina.
+    """
+    results = []
+    for r in report["results"]:
+        row = {k: r[k] for k in DETERMINISTIC_FIELDS}
+        row["convergence"] = [cost for _, cost in r["curve"]]
+        results.append(row)
+    meta = {k: report["meta"][k] for k in ("python", "numpy")}
+    return {"meta": meta, "results": results}
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Comparación con la línea base ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def compare(report, baseline, tolerances = TOLERANCES):
+    """
+    Compara cada caso (instancia, solver, semilla) contra la línea base.
+    Regresa la lista de regresiones: métricas que empeoraron más que su
+    tolerancia relativa. Los casos sin línea base se ignoran, y tiempos y
+    memoria sólo se comparan si la línea base es de la misma máquina.
+    """
+    if host_fingerprint(report["meta"]) != host_fingerprint(baseline["meta"]):
+        tolerances = {k: v for k, v in tolerances.items() if k not in MACHINE_METRICS}
+    base = {(r["instance"], r["solver"], r["seed"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        ref = base.get((result["instance"], result["solver"], result["seed"]))
+        if ref is None:
+            continue
+        for metric, tolerance in tolerances.items():
+            current, previous = result.get(metric), ref.get(metric)
+            if current is None or previous is None:
+                continue
+            if current > previous * (1 + tolerance) + 1e-9:
+                regressions.append({
+                    "instance": result["instance"],
+                    "solver": result["solver"],
+                    "seed": result["seed"],
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "ratio": current / previous if previous else float("inf"),
+                })
+    return regressions
+
+
+def _print_result(r):
+    memory = f"{r['peak_memory'] / 1024 ** 2:8.1f} MB" if r["peak_memory"] is not None else "       -   "
+    cost = f"{r['cost']:10.2f}" if r["cost"] is not None else "       inf"
+    print(f"{r['instance']:>16} {r['nodes']:5d} {r['solver']:>16} seed={r['seed']:<3d} "
+          f"costo={cost} atendidos={r['served']:5d} {r['wall_time']:8.3f}s "
+          f"{1000 * (r['time_per_iteration'] or 0):8.2f} ms/iter {memory}", flush = True)
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python app/benchmarks",
+                                     description = "Benchmarks de ACO y GA")
+    parser.add_argument("--solvers", nargs = "+", choices = list(SOLVERS), default = list(SOLVERS))
+    parser.add_argument("--instances", nargs = "+", help = "filtra instancias por nombre")
+    parser.add_argument("--sizes", nargs = "*", type = int, default = [200, 500, 1000],
+                        help = "tamaños de las instancias sintéticas")
+    parser.add_argument("--no-zones", action = "store_true", help = "omite las instancias por zona")
+    parser.add_argument("--seeds", nargs = "+", type = int, default = [0])
+    parser.add_argument("--iterations", type = int, help = "iteraciones de ACO")
+    parser.add_argument("--num-ants", type = int)
+    parser.add_argument("--generations", type = int, help = "generaciones del GA")
+    parser.add_argument("--pop-size", type = int)
+    parser.add_argument("--no-memory", action = "store_true", help = "no mide el pico de memoria")
+    parser.add_argument("--output", default = "benchmark_results.json")
+    parser.add_argument("--baseline", default = BASELINE_PATH)
+    parser.add_argument("--local-baseline", default = LOCAL_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action = "store_true",
+                        help = "guarda costos y convergencia como línea base versionada")
+    parser.add_argument("--save-local", action = "store_true",
+                        help = "guarda el reporte completo (tiempos y memoria) de esta máquina")
+    parser.add_argument("--compare", action = "store_true",
+                        help = "compara contra las líneas base; sale con 1 si hay regresiones")
+    args = parser.parse_args(argv)
+
+    aco_budget = {k: v for k, v in (("iterations", args.iterations),
+                                    ("num_ants", args.num_ants)) if v}
+    ga_budget = {k: v for k, v in (("generations", args.generations),
+                                   ("pop_size", args.pop_size)) if v}
+    budgets = {"aco": aco_budget, "aco_mmas": aco_budget, "aco_acs": aco_budget,
+               "ga": ga_budget, "ga_multi_vehicle": ga_budget}
+
+    instances = default_instances(args.sizes, zones = not args.no_zones)
+    if args.instances:
+        instances = [i for i in instances if i.name in args.instances]
+
+    report = run_suite(instances, args.solvers, args.seeds, budgets,
+                       memory = not args.no_memory, log = _print_result)
+
+    with open(args.output, "w", encoding = "utf-8") as f:
+        json.dump(report, f, indent = 2)
+    print(f"\nResultados en {args.output}")
+
+    if args.save_baseline:
+        baseline = deterministic(report)
+        with open(args.baseline, "w", encoding = "utf-8") as f:
+            # Un caso por línea: los cambios de la línea base se leen en el diff
+            f.write('{"meta": ' + json.dumps(baseline["meta"]) + ',\n "results": [\n  ')
+            f.write(",\n  ".join(json.dumps(r) for r in baseline["results"]))
+            f.write("\n]}\n")
+        print(f"Línea base guardada en {args.baseline}")
+    if args.save_local:
+        with open(args.local_baseline, "w", encoding = "utf-8") as f:
+            json.dump(report, f, indent = 2)
+        print(f"Línea base local guardada en {args.local_baseline}")
+
+    if args.compare:
+        # Costos contra la línea base versionada; tiempos y memoria contra la local
+        machine = {k: TOLERANCES[k] for k in MACHINE_METRICS}
+        checks = [(p, t) for p, t in ((args.baseline, TOLERANCES), (args.local_baseline, machine))
+                  if os.path.exists(p)]
+        if not checks:
+            print(f"No existe la línea base {args.baseline}", file = sys.stderr)
+            return 2
+        regressions = []
+        for path, tolerances in checks:
+            with open(path, encoding = "utf-8") as f:
+                baseline = json.load(f)
+            if (tolerances is machine and
+                    host_fingerprint(baseline["meta"]) != host_fingerprint(report["meta"])):
+                print(f"{path} es de otra máquina: no se comparan tiempos ni memoria")
+            regressions += compare(report, baseline, tolerances)
+        for r in regressions:
+            print(f"⚠️ {r['instance']} {r['solver']} seed={r['seed']}: {r['metric']} "
+                  f"{r['baseline']:.4g} → {r['current']:.4g} (×{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("Sin regresiones respecto a la línea base.")
+    return 0
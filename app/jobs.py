@@ -0,0 +1,138 @@
+# app/jobs.py
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from algorithms.telemetry import SolverObserver, BestSoFar
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Cola de trabajos de optimización
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+PROGRESS_KEYS = ("iteration", "iterations", "best_cost", "iteration_best",
+                 "mean_cost", "diversity", "elapsed")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job(SolverObserver):
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.best = BestSoFar()
+        self._lock = threading.Lock()
+
+    def on_iteration(self, metrics):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+        self.best.on_iteration(metrics)
+        progress = {k: metrics[k] for k in PROGRESS_KEYS if k in metrics}
+        with self._lock:
+            self.progress = progress
+
+    def to_dict(self):
+        with self._lock:
+            info = {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": dict(self.progress),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+        if self.error is not None:
+            info["error"] = self.error
+        return info
+
+
+class JobManager:
+    """
+    Ejecuta los solvers fuera del hilo de la petición. Cada trabajo se pasa al
+    solver como observador; cancelar marca un evento que el observador revisa
+    en la siguiente iteración. Sólo se conservan los últimos `max_finished`
+    trabajos terminados.
+    """
+
+    def __init__(self, max_workers = None, max_finished = 200):
+        if max_workers is None:
+            max_workers = int(os.environ.get("JOB_WORKERS", 2))
+        self.pool = ThreadPoolExecutor(max_workers = max_workers,
+                                       thread_name_prefix = "solver")
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """Encola `fn(*args, observers=[job], **kwargs)` y regresa el trabajo."""
+        job = Job(kind)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        job.future = self.pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        with job._lock:
+            if job.cancel_event.is_set():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            result = fn(*args, observers = [job], **kwargs)
+        except JobCancelled:
+            status, result, error = CANCELLED, None, None
+        except Exception as e:
+            status, result, error = FAILED, None, str(e)
+        else:
+            status, error = DONE, None
+
+        with job._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [jid for jid, j in self.jobs.items() if j.status in FINISHED_STATES]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[jid]
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            with job._lock:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        return job
@@ -0,0 +1,95 @@
+# app/maps.py
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Geometría de rutas y mapas bajo demanda
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+# Colores y grosor de línea de cada solver (los mismos que usaban los mapas)
+ROUTE_STYLES = {
+    'ga': (["purple", "orange", "teal", "blue", "red"], 5),
+    'aco': (['red', 'blue', 'green', 'purple', 'orange'], 4),
+}
+
+
+def route_geometry(routes, points, kind):
+    """
+    Geometría de cada ruta no vacía: nodos locales, coordenadas [lat, lon]
+    en orden de visita y nombres de las paradas. `points` es el DataFrame
+    de la selección en orden local (columnas lat, lon y nombre).
+    """
+    colors, weight = ROUTE_STYLES[kind]
+    lat = points['lat'].to_numpy(dtype=float)
+    lon = points['lon'].to_numpy(dtype=float)
+    names = points['nombre'].astype(str).to_numpy()
+
+    geometry = []
+    for i, (vehicle, route) in enumerate(routes.items()):
+        route = np.asarray(route, dtype=int)
+        route = route[route < len(lat)]
+        if not len(route):
+            continue
+        geometry.append({
+            'vehicle': vehicle,
+            'color': colors[i % len(colors)],
+            'weight': weight,
+            'nodes': route.tolist(),
+            'coords': np.column_stack((lat[route], lon[route])).tolist(),
+            'stops': names[route].tolist(),
+        })
+    return geometry
+
+
+def map_center(points):
+    """El depósito (primer punto de la selección)."""
+    return [float(points['lat'].iloc[0]), float(points['lon'].iloc[0])]
+
+
+def route_summary(geometry):
+    return [{'vehicle': g['vehicle'],
+             'order': "\n".join(f"{j + 1}. {name}" for j, name in enumerate(g['stops']))}
+            for g in geometry]
+
+
+def to_geojson(geometry):
+    """FeatureCollection con una LineString por ruta y un Point por parada."""
+    features = []
+    for g in geometry:
+        lonlat = [[lon, lat] for lat, lon in g['coords']]
+        props = {'vehicle': g['vehicle'], 'color': g['color']}
+        features.append({'type': 'Feature', 'properties': dict(props, weight=g['weight']),
+                         'geometry': {'type': 'LineString', 'coordinates': lonlat}})
+        for j, (point, name) in enumerate(zip(lonlat, g['stops'])):
+            features.append({'type': 'Feature',
+                             'properties': dict(props, order=j + 1, name=name),
+                             'geometry': {'type': 'Point', 'coordinates': point}})
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def render_selection_map(points, colors, zoom_start=12):
+    """HTML de Folium con los puntos de una selección, coloreados por zona."""
+    import folium
+
+    m = folium.Map(location=map_center(points), zoom_start=zoom_start)
+    labels = points['nombre'] if 'nombre' in points else points['zona']
+    for lat, lon, zone, label in zip(points['lat'], points['lon'], points['zona'], labels):
+        color = colors.get(zone, "black")
+        folium.CircleMarker(location=[float(lat), float(lon)], radius=6, color=color,
+                            fill=True, fill_color=color, fill_opacity=0.8,
+                            tooltip=label).add_to(m)
+    return m._repr_html_()
+
+
+def render_map(geometry, center, zoom_start=13):
+    """HTML de Folium; sólo se llama cuando alguien pide el mapa."""
+    import folium
+
+    m = folium.Map(location=center, zoom_start=zoom_start)
+    for g in geometry:
+        folium.PolyLine(g['coords'], color=g['color'], weight=g['weight'],
+                        tooltip=g['vehicle']).add_to(m)
+        for (lat, lon), name in zip(g['coords'], g['stops']):
+            folium.CircleMarker(location=[lat, lon], radius=5, color=g['color'],
+                                fill=True, tooltip=f"{g['vehicle']}: {name}").add_to(m)
+    return m._repr_html_()
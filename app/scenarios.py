@@ -0,0 +1,187 @@
+# app/scenarios.py
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from algorithms.aco_algorithm import aco_algorithm
+from algorithms.genetic_algorithm import GA_multi_vehicle
+from algorithms.island_ga import GA_islands
+from algorithms.distance_store import get_store
+from algorithms.store_data import load_stores, select_indices, problem_demands
+from algorithms.route_solution import json_default
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#     Escenarios por lotes (zonas × flotillas)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#
+# Un escenario es un dict:
+#   {"name": "norte 2×500", "zones": ["rojo", "azul"], "stores": [],
+#    "vehicles": [{"name": "Unidad 1", "capacity": 500, "experience": 0.8}, ...],
+#    "solver": "ga" | "aco", "params": {"generations": 200, "seed": 0, ...}}
+# `params` se pasa tal cual a GA_multi_vehicle / GA_islands / aco_algorithm.
+
+EXECUTORS = ("serial", "processes")
+SCENARIO_SOLVERS = ("ga", "aco")
+
+
+def preload():
+    """
+    Carga total_distances.csv (memmap) y data.xlsx una sola vez. Se llama en
+    el proceso padre antes de crear el pool: con fork los workers heredan
+    ambos; con spawn cada worker los carga una vez al arrancar.
+    """
+    get_store().load()
+    load_stores()
+
+def check_scenarios(scenarios):
+    """Validación rápida antes de repartir: lanza ValueError con el escenario culpable."""
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("Se requiere una lista de escenarios no vacía.")
+    for i, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict):
+            raise ValueError(f"El escenario {i} no es un objeto.")
+        solver = scenario.get("solver", "ga")
+        if solver not in SCENARIO_SOLVERS:
+            raise ValueError(f"Escenario {i}: solver debe ser uno de {SCENARIO_SOLVERS}, "
+                             f"no {solver!r}")
+        if not scenario.get("vehicles"):
+            raise ValueError(f"Escenario {i}: faltan los vehículos.")
+        if not (scenario.get("zones") or scenario.get("stores")):
+            raise ValueError(f"Escenario {i}: se requieren zonas o tiendas.")
+
+
+def solve_scenario(index, scenario):
+    """
+    Resuelve un escenario sobre la matriz compartida. Regresa un dict listo
+    para JSON; los errores se reportan en "error" en lugar de lanzarse, para
+    no tumbar el resto del lote.
+    """
+    t0 = time.perf_counter()
+    kind = scenario.get("solver", "ga")
+    result = {"index": index, "name": scenario.get("name", f"escenario {index}"),
+              "solver": kind}
+    try:
+        selected_idx = select_indices(scenario.get("zones", []), scenario.get("stores", []))
+        if len(selected_idx) < 2:
+            raise ValueError("No se encontraron tiendas para el escenario.")
+
+        vehicles_info = scenario["vehicles"]
+        vehicles = {v["name"]: {"capacity": float(v["capacity"])} for v in vehicles_info}
+        distance_matrix = get_store().submatrix(selected_idx, diagonal = np.inf)
+        demands = problem_demands(kind, selected_idx)
+        params = dict(scenario.get("params") or {})
+
+        if kind == "ga":
+            solver = GA_multi_vehicle
+            if int(params.get("islands", 1)) > 1:
+                # Ya estamos dentro de un worker: las islas corren en serie salvo que se pida
+                solver = GA_islands
+                params.setdefault("executor", "serial")
+            else:
+                params.pop("islands", None)
+            best = solver(distance_matrix = distance_matrix, demands = demands,
+                          vehicles = vehicles, **params)
+            routes, cost = best["Routes"], best["Cost"]
+            result["time"] = round(float(best["Time"]), 2)
+        else:
+            experience = {v["name"]: float(v.get("experience", 0.8)) for v in vehicles_info}
+            best = aco_algorithm(distance_matrix, vehicles, demands,
+                                 vehicle_experience = experience, **params)
+            routes, cost = best["Route"], best["Distance"]
+
+        names = load_stores().loc[selected_idx, "nombre"].astype(str).to_numpy()
+        served = np.concatenate([np.asarray(r, dtype = int) for r in routes.values()] or [[]])
+        missing = np.setdiff1d(np.arange(1, len(selected_idx)), served)
+        global_idx = np.asarray(selected_idx)
+
+        result.update({
+            "nodes": len(selected_idx),
+            "cost": round(float(cost), 2),
+            "routes": {v: names[np.asarray(r, dtype = int)].tolist() for v, r in routes.items()},
+            "stops": {v: global_idx[np.asarray(r, dtype = int)].tolist()
+                      for v, r in routes.items()},
+            "missing": names[missing].tolist(),
+        })
+    except Exception as e:
+        result["error"] = str(e)
+    result["elapsed"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+def run_batch(scenarios, workers = None, executor = "processes"):
+    """
+    Valida el lote, carga los datos y regresa un iterador con cada
+    resultado en cuanto termina (no en el orden de entrada; "index" dice
+    cuál es). El último elemento es un resumen {"done": True, ...}.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor debe ser uno de {EXECUTORS}, no {executor!r}")
+    check_scenarios(scenarios)
+    preload()
+    return _stream(scenarios, workers, executor)
+
+def _stream(scenarios, workers, executor):
+    t0 = time.perf_counter()
+    failed = 0
+    if executor == "serial":
+        for i, scenario in enumerate(scenarios):
+            result = solve_scenario(i, scenario)
+            failed += "error" in result
+            yield result
+    else:
+        workers = workers or min(len(scenarios), os.cpu_count() or 1)
+        pool = ProcessPoolExecutor(max_workers = workers, initializer = preload)
+        try:
+            futures = [pool.submit(solve_scenario, i, s) for i, s in enumerate(scenarios)]
+            for future in as_completed(futures):
+                result = future.result()
+                failed += "error" in result
+                yield result
+        finally:
+            # Si el cliente se desconecta no se siguen resolviendo escenarios pendientes
+            pool.shutdown(wait = True, cancel_futures = True)
+
+    yield {"done": True, "scenarios": len(scenarios), "failed": failed,
+           "elapsed": round(time.perf_counter() - t0, 3)}
+
+
+def to_ndjson(result):
+    return json.dumps(result, default = json_default, ensure_ascii = False) + "\n"
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ ✦ Línea de comandos ✦ ୨୧‿︵‿︵‿︵ ˚₊
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python app/scenarios.py",
+                                     description = "Resuelve un lote de escenarios (NDJSON)")
+    parser.add_argument("scenarios", help = "archivo JSON: lista de escenarios o {\"scenarios\": [...]}")
+    parser.add_argument("--workers", type = int, help = "procesos (por defecto, uno por CPU)")
+    parser.add_argument("--executor", choices = EXECUTORS, default = "processes")
+    parser.add_argument("--output", help = "archivo .ndjson (por defecto, la salida estándar)")
+    args = parser.parse_args(argv)
+
+    with open(args.scenarios, encoding = "utf-8") as f:
+        scenarios = json.load(f)
+    if isinstance(scenarios, dict):
+        scenarios = scenarios.get("scenarios")
+
+    out = open(args.output, "w", encoding = "utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        for result in run_batch(scenarios, args.workers, args.executor):
+            out.write(to_ndjson(result))
+            out.flush()
+            failed = result.get("failed", failed)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# app/selections.py
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Sesiones de selección (en memoria)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+class SelectionStore:
+    """
+    Selecciones guardadas por `/save_selection`, cada una con su id: índices
+    globales (el depósito primero) y demandas alineadas. Reemplaza al
+    archivo compartido, así que varios usuarios pueden trabajar a la vez sin
+    pisarse. Sólo se conservan las últimas `max_items`.
+
+    Vive en la memoria del proceso: con varios workers un id sólo existe
+    en el que lo creó, así que el servidor debe correr con un solo worker.
+    """
+
+    def __init__(self, max_items = 500):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, indices, demands = None):
+        indices = np.asarray(indices, dtype = int)
+        indices.setflags(write = False)
+        if demands is not None:
+            demands = np.asarray(demands, dtype = float)
+            demands.setflags(write = False)
+        record = {'indices': indices, 'demands': demands, 'created_at': time.time()}
+        selection_id = uuid.uuid4().hex
+        with self._lock:
+            self.items[selection_id] = record
+            while len(self.items) > self.max_items:
+                self.items.popitem(last = False)
+        return selection_id
+
+    def get(self, selection_id):
+        with self._lock:
+            record = self.items.get(selection_id)
+            if record is not None:
+                self.items.move_to_end(selection_id)
+            return record
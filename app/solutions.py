@@ -0,0 +1,52 @@
+# app/solutions.py
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+#      Soluciones recientes (para reoptimizar)
+# ₊˚ ‿︵‿︵‿︵୨୧ · · ♡ · · ୨୧‿︵‿︵‿︵ ˚₊
+
+class SolutionStore:
+    """
+    Guarda en memoria las últimas `max_items` soluciones: tipo de solver,
+    selección (índices globales), vehículos, rutas en índices locales, la
+    geometría para el mapa y, en ACO, la matriz de feromonas final. Las más
+    viejas se descartan primero.
+
+    Igual que las selecciones, vive en la memoria del proceso (un solo
+    worker).
+    """
+
+    def __init__(self, max_items = 100):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, kind, selection, vehicles, routes, pheromone = None, **extra):
+        record = dict(extra, kind = kind, selection = list(selection),
+                      vehicles = vehicles, routes = routes,
+                      pheromone = pheromone, created_at = time.time())
+        solution_id = uuid.uuid4().hex
+        with self._lock:
+            self.items[solution_id] = record
+            while len(self.items) > self.max_items:
+                self.items.popitem(last = False)
+        return solution_id
+
+    def update(self, solution_id, **fields):
+        """Agrega campos a una solución guardada (p. ej. el mapa ya renderizado)."""
+        with self._lock:
+            record = self.items.get(solution_id)
+            if record is not None:
+                record.update(fields)
+            return record
+
+    def get(self, solution_id):
+        with self._lock:
+            record = self.items.get(solution_id)
+            if record is not None:
+                self.items.move_to_end(solution_id)
+            return record
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Los módulos se importan como en la app: `from algorithms... import ...`
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,54 @@
+# tests/test_genetic_fitness.py
+import numpy as np
+import pytest
+
+from algorithms.genetic_algorithm import (fitness_multi_vehicle,
+                                          fitness_population_multi_vehicle,
+                                          routes_from_labels)
+
+
+def _instance(seed, oversized):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(4, 15))
+    points = rng.random((n, 2)) * 10
+    distance_matrix = np.linalg.norm(points[:, None] - points[None], axis = 2)
+    demands = rng.integers(1, 30, n).astype(float)
+    demands[0] = 0
+    vehicles = {f"Unidad {k}": {"capacity": float(rng.integers(10, 60))}
+                for k in range(int(rng.integers(1, 4)))}
+    if oversized:
+        # Al menos un cliente que no cabe en ningún vehículo
+        demands[int(rng.integers(1, n))] = 100.0
+    population = np.array([rng.permutation(np.arange(1, n)) for _ in range(8)])
+    return population, distance_matrix, demands, vehicles
+
+
+@pytest.mark.parametrize("oversized", [False, True])
+@pytest.mark.parametrize("seed", range(25))
+def test_batch_matches_scalar_fitness(seed, oversized):
+    population, distance_matrix, demands, vehicles = _instance(seed, oversized)
+    cost, time, labels = fitness_population_multi_vehicle(
+        population, distance_matrix, demands, vehicles, penalty = 1000)
+
+    for k, individuo in enumerate(population):
+        expected_cost, expected_time, routes = fitness_multi_vehicle(
+            individuo, distance_matrix, demands, vehicles, penalty = 1000)
+        assert cost[k] == pytest.approx(expected_cost)
+        assert time[k] == pytest.approx(expected_time)
+        assert routes_from_labels(individuo, labels[k], vehicles).to_dict() == routes.to_dict()
+
+
+def test_oversized_first_client_is_penalized():
+    distance_matrix = np.array([[0, 1, 2], [1, 0, 1], [2, 1, 0]], dtype = float)
+    demands = np.array([0, 50, 5], dtype = float)
+    vehicles = {"Unidad 1": {"capacity": 10.0}}
+    population = np.array([[1, 2]])
+
+    cost, _, labels = fitness_population_multi_vehicle(
+        population, distance_matrix, demands, vehicles, penalty = 1000)
+    expected_cost, _, _ = fitness_multi_vehicle(
+        population[0], distance_matrix, demands, vehicles, penalty = 1000)
+
+    assert (labels[0] < 0).all()
+    assert cost[0] == pytest.approx(expected_cost)
+    assert cost[0] >= 1000 * 100